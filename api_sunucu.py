@@ -0,0 +1,376 @@
+"""
+Rezervasyon sistemini web sitesi ve kanal yöneticisi için HTTP/JSON olarak sunar.
+
+asyncio ile yazılmış küçük bir HTTP/1.1 sunucusudur (yalnızca standart kütüphane, keep-alive
+destekli). Bağlantılar olay döngüsünde karşılanır; veritabanı işleri sabit boyutlu bir thread
+havuzunda çalışır. veritabani.py her thread için tek bir kalıcı bağlantı tuttuğundan havuz aynı
+zamanda ISCI_SAYISI bağlantılık bir bağlantı havuzudur. Havuzda çalışan ve bekleyen iş sayısı
+KUYRUK_SINIRI'na ulaşırsa yeni istek beklemeden 503 ile reddedilir. Uç nokta başına istek/hata
+sayıları ve süre yüzdelikleri GET /metrikler'den okunur; her yanıtta Server-Timing başlığı vardır.
+
+Uç noktalar:
+  GET    /saglik
+  GET    /metrikler
+  GET    /odalar
+  GET    /oda-durumu?tarih=YYYY-MM-DD                    (tarih verilmezse bugün)
+  GET    /musaitlik?giris=YYYY-MM-DD&cikis=YYYY-MM-DD
+  GET    /fiyat?oda_tipi=...&giris=YYYY-MM-DD&cikis=YYYY-MM-DD
+  GET    /rezervasyonlar?limit=200[&giris=YYYY-MM-DD&id=N]  (giris/id: önceki sayfanın son kaydı)
+  GET    /rezervasyonlar/ara?q=...[&arsiv=1]             (arsiv=1: arşivdeki eşleşmeler de)
+  GET    /rezervasyonlar/<id>
+  POST   /rezervasyonlar           {"musteri_adi", "oda_tipi", "giris_tarihi", "cikis_tarihi", "odeme_durumu"?}
+                                   (201: kaydın "id"si ve atanan "oda_no" ile)
+  DELETE /rezervasyonlar/<id>
+  POST   /rezervasyonlar/<id>/check-out
+  POST   /check-out                {"idler": [id, ...]}            (tek işlemde toplu check-out)
+  GET    /cikislar?tarih=YYYY-MM-DD                      (tarih verilmezse bugün)
+  POST   /cikislar/check-out?tarih=YYYY-MM-DD            (o günün tüm çıkışları)
+  POST   /odalar/durum             {"odalar": [oda_no, ...], "oda_durumu"}
+
+Kullanım:  python api_sunucu.py [--host 127.0.0.1] [--port 8080] [--isci 4] [--veritabani otel.db]
+"""
+import argparse
+import asyncio
+import json
+import math
+import re
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+import veritabani
+from fiyatlandirma import konaklama_fiyati
+
+ISCI_SAYISI = 4 # Aynı anda çalışan veritabanı işi (ve bağlantı) sayısı
+KUYRUK_SINIRI = 64 # Havuzda çalışan + bekleyen en fazla iş; fazlası 503 alır
+ISTEK_ZAMAN_ASIMI = 15 # saniye; veritabanı işi bu sürede bitmezse 504
+BAGLANTI_ZAMAN_ASIMI = 30 # saniye; bu kadar istek gelmeyen bağlantı kapatılır
+EN_BUYUK_GOVDE = 1 << 20 # bayt
+METRIK_PENCERESI = 2000 # Yüzdelikler için uç nokta başına saklanan son süre sayısı
+ODEME_DURUMLARI = ('Ödenmedi', 'Kapora Alındı', 'Tamamı Ödendi')
+ODA_DURUMU_ALANLARI = ("oda_no", "oda_tipi", "oda_durumu", "musteri_adi", "cikis_tarihi")
+CIKIS_ALANLARI = ("id", "musteri_adi", "oda_no", "oda_tipi", "odeme_durumu", "oda_durumu")
+FIZIKSEL_DURUMLAR = ('Temiz', 'Kirli', 'Tadilatta')
+
+class ApiHatasi(Exception):
+    """İstemciye verilen HTTP durum kodu ve mesajıyla biten hata."""
+    def __init__(self, durum, mesaj):
+        super().__init__(mesaj)
+        self.durum = durum
+
+# --- PARAMETRE DOĞRULAMA ---
+
+def _tarih(parametreler, ad):
+    """Yardımcı: Zorunlu 'YYYY-MM-DD' parametresini doğrular."""
+    try: return date.fromisoformat(parametreler.get(ad)).isoformat()
+    except (TypeError, ValueError): raise ApiHatasi(400, f"'{ad}' YYYY-MM-DD formatında olmalı.")
+
+def _tarih_araligi(parametreler, giris_adi='giris', cikis_adi='cikis'):
+    """Yardımcı: Giriş/çıkış tarihlerini doğrular ve (giris, cikis) döndürür."""
+    giris, cikis = _tarih(parametreler, giris_adi), _tarih(parametreler, cikis_adi)
+    if giris >= cikis: raise ApiHatasi(400, "Çıkış tarihi, giriş tarihinden sonra olmalı.")
+    return giris, cikis
+
+def _tamsayi(parametreler, ad, varsayilan, en_az, en_cok):
+    """Yardımcı: Tamsayı parametresini okur ve sınırlar içinde olduğunu doğrular."""
+    try: deger = int(parametreler.get(ad, varsayilan))
+    except (TypeError, ValueError): raise ApiHatasi(400, f"'{ad}' bir tamsayı olmalı.")
+    if not en_az <= deger <= en_cok: raise ApiHatasi(400, f"'{ad}' {en_az} ile {en_cok} arasında olmalı.")
+    return deger
+
+def _rezervasyon_json(kayit):
+    return kayit.sozluk() # kayitlar.Rezervasyon
+
+def _rezervasyonu_bul(rez_id):
+    """Yardımcı: Rezervasyonu getirir, yoksa 404."""
+    kayit = veritabani.rezervasyon_getir(int(rez_id))
+    if kayit is None: raise ApiHatasi(404, f"Rezervasyon {rez_id} bulunamadı.")
+    return kayit
+
+# --- UÇ NOKTALAR (veritabanı havuzundaki thread'lerde çalışır) ---
+# İmza: isleyici(parametreler, govde, *yol_gruplari) -> (durum, JSON'a çevrilecek nesne)
+
+def _odalar(parametreler, govde):
+    return 200, [oda.sozluk() for oda in veritabani.odalari_cek()]
+
+def _oda_durumu(parametreler, govde):
+    tarih = _tarih(parametreler, 'tarih') if 'tarih' in parametreler else date.today().isoformat()
+    return 200, [dict(zip(ODA_DURUMU_ALANLARI, durum)) for durum in veritabani.get_anlik_oda_durumu(tarih)]
+
+def _musaitlik(parametreler, govde):
+    giris, cikis = _tarih_araligi(parametreler)
+    return 200, [{"oda_tipi": tip, "toplam_oda": toplam, "bos_oda": len(bos_odalar), "bos_odalar": bos_odalar, "en_dusuk_fiyat": fiyat}
+                 for tip, toplam, bos_odalar, fiyat in veritabani.musaitlik_ozeti(giris, cikis)]
+
+def _fiyat(parametreler, govde):
+    giris, cikis = _tarih_araligi(parametreler)
+    oda_tipi = parametreler.get('oda_tipi')
+    if not oda_tipi: raise ApiHatasi(400, "'oda_tipi' zorunlu.")
+    return 200, {"oda_tipi": oda_tipi, "giris_tarihi": giris, "cikis_tarihi": cikis, "toplam_fiyat": konaklama_fiyati(oda_tipi, giris, cikis)}
+
+def _rezervasyon_listesi(parametreler, govde):
+    limit = _tamsayi(parametreler, 'limit', 200, 1, 1000)
+    anahtar = None
+    if 'giris' in parametreler or 'id' in parametreler:
+        anahtar = (_tarih(parametreler, 'giris'), _tamsayi(parametreler, 'id', None, 0, 2**63 - 1))
+    return 200, [_rezervasyon_json(kayit) for kayit in veritabani.rezervasyon_sayfasi_cek(anahtar, limit)]
+
+def _rezervasyon_ara(parametreler, govde):
+    arama_metni = parametreler.get('q', '').strip()
+    if not arama_metni: raise ApiHatasi(400, "'q' zorunlu.")
+    arsiv_dahil = bool(_tamsayi(parametreler, 'arsiv', 0, 0, 1))
+    return 200, [_rezervasyon_json(kayit) for kayit in veritabani.rezervasyon_ara(arama_metni, arsiv_dahil)]
+
+def _rezervasyon(parametreler, govde, rez_id):
+    return 200, _rezervasyon_json(_rezervasyonu_bul(rez_id))
+
+def _rezervasyon_yap(parametreler, govde):
+    if not isinstance(govde, dict): raise ApiHatasi(400, "İstek gövdesi bir JSON nesnesi olmalı.")
+    ad, oda_tipi = str(govde.get('musteri_adi') or '').strip(), govde.get('oda_tipi')
+    odeme_durumu = govde.get('odeme_durumu', ODEME_DURUMLARI[0])
+    if not ad or not oda_tipi: raise ApiHatasi(400, "'musteri_adi' ve 'oda_tipi' zorunlu.")
+    if odeme_durumu not in ODEME_DURUMLARI: raise ApiHatasi(400, f"'odeme_durumu' şunlardan biri olmalı: {', '.join(ODEME_DURUMLARI)}")
+    giris, cikis = _tarih_araligi(govde, 'giris_tarihi', 'cikis_tarihi')
+    if not veritabani.konaklama_tarihleri_gecerli_mi(giris, cikis): raise ApiHatasi(400, veritabani.TARIH_ARALIGI_HATASI)
+    toplam_fiyat = konaklama_fiyati(oda_tipi, giris, cikis)
+    if not toplam_fiyat or toplam_fiyat <= 0: raise ApiHatasi(400, f"'{oda_tipi}' için fiyat bilgisi yok.")
+    sonuc = veritabani.rezervasyon_yap_atomik(oda_tipi, giris, cikis, ad, toplam_fiyat, odeme_durumu)
+    if sonuc is None: raise ApiHatasi(409, f"'{oda_tipi}' tipinde bu tarihlerde boş ve temiz oda yok.")
+    rez_id, oda_no = sonuc
+    return 201, {"id": rez_id, "musteri_adi": ad, "oda_tipi": oda_tipi, "oda_no": oda_no, "giris_tarihi": giris, "cikis_tarihi": cikis,
+                 "toplam_fiyat": toplam_fiyat, "odeme_durumu": odeme_durumu}
+
+def _rezervasyon_sil(parametreler, govde, rez_id):
+    _rezervasyonu_bul(rez_id)
+    veritabani.rezervasyon_sil(int(rez_id))
+    return 200, {"silinen_id": int(rez_id)}
+
+def _check_out(parametreler, govde, rez_id):
+    kayit = _rezervasyonu_bul(rez_id)
+    veritabani.check_out_yap(kayit.id, kayit.oda_no)
+    return 200, _rezervasyon_json(_rezervasyonu_bul(rez_id))
+
+def _toplu_check_out(parametreler, govde):
+    idler = govde.get('idler') if isinstance(govde, dict) else None
+    if not isinstance(idler, list) or not idler or not all(isinstance(rez_id, int) and not isinstance(rez_id, bool) for rez_id in idler):
+        raise ApiHatasi(400, "'idler' boş olmayan bir tamsayı listesi olmalı.")
+    return 200, {"kirli_odalar": veritabani.toplu_check_out(idler)}
+
+def _cikislar(parametreler, govde):
+    tarih = _tarih(parametreler, 'tarih') if 'tarih' in parametreler else date.today().isoformat()
+    return 200, [dict(zip(CIKIS_ALANLARI, cikis)) for cikis in veritabani.gunun_cikislari(tarih)]
+
+def _cikislari_yap(parametreler, govde):
+    return 200, {"kirli_odalar": veritabani.gunun_cikislarini_yap(_tarih(parametreler, 'tarih'))}
+
+def _oda_durumlari(parametreler, govde):
+    if not isinstance(govde, dict): raise ApiHatasi(400, "İstek gövdesi bir JSON nesnesi olmalı.")
+    odalar, durum = govde.get('odalar'), govde.get('oda_durumu')
+    if not isinstance(odalar, list) or not odalar: raise ApiHatasi(400, "'odalar' boş olmayan bir liste olmalı.")
+    if durum not in FIZIKSEL_DURUMLAR: raise ApiHatasi(400, f"'oda_durumu' şunlardan biri olmalı: {', '.join(FIZIKSEL_DURUMLAR)}")
+    return 200, {"guncellenen": veritabani.oda_durumlarini_guncelle(odalar, durum)}
+
+# (yöntem, yol deseni, işleyici); işleyici None ise olay döngüsünde cevaplanır
+YOLLAR = [(yontem, re.compile(desen), isleyici) for yontem, desen, isleyici in [
+    ('GET', r'/saglik', None),
+    ('GET', r'/metrikler', None),
+    ('GET', r'/odalar', _odalar),
+    ('GET', r'/oda-durumu', _oda_durumu),
+    ('GET', r'/musaitlik', _musaitlik),
+    ('GET', r'/fiyat', _fiyat),
+    ('GET', r'/rezervasyonlar', _rezervasyon_listesi),
+    ('POST', r'/rezervasyonlar', _rezervasyon_yap),
+    ('GET', r'/rezervasyonlar/ara', _rezervasyon_ara),
+    ('GET', r'/rezervasyonlar/(\d+)', _rezervasyon),
+    ('DELETE', r'/rezervasyonlar/(\d+)', _rezervasyon_sil),
+    ('POST', r'/rezervasyonlar/(\d+)/check-out', _check_out),
+    ('POST', r'/check-out', _toplu_check_out),
+    ('GET', r'/cikislar', _cikislar),
+    ('POST', r'/cikislar/check-out', _cikislari_yap),
+    ('POST', r'/odalar/durum', _oda_durumlari),
+]]
+
+# --- METRİKLER ---
+
+class UcNoktaMetrigi:
+    """Bir uç noktanın istek sayıları ve son METRIK_PENCERESI isteğin süreleri."""
+    def __init__(self):
+        self.sayi = self.istemci_hatasi = self.sunucu_hatasi = 0
+        self.toplam_ms = 0.0
+        self.sureler = deque(maxlen=METRIK_PENCERESI)
+
+    def kaydet(self, durum, sure_ms):
+        self.sayi += 1; self.toplam_ms += sure_ms; self.sureler.append(sure_ms)
+        if 400 <= durum < 500: self.istemci_hatasi += 1
+        elif durum >= 500: self.sunucu_hatasi += 1
+
+    def ozet(self):
+        sirali = sorted(self.sureler)
+        yuzdelik = lambda oran: round(sirali[math.ceil(oran * len(sirali)) - 1], 3) if sirali else None # En yakın sıra yöntemi
+        return {"istek": self.sayi, "istemci_hatasi": self.istemci_hatasi, "sunucu_hatasi": self.sunucu_hatasi,
+                "ortalama_ms": round(self.toplam_ms / self.sayi, 3) if self.sayi else None,
+                "p50_ms": yuzdelik(0.50), "p95_ms": yuzdelik(0.95), "p99_ms": yuzdelik(0.99),
+                "en_yuksek_ms": round(sirali[-1], 3) if sirali else None}
+
+# --- HTTP ---
+
+async def _istek_oku(okuyucu):
+    """Yardımcı: Bir HTTP isteği okur; (yontem, yol, parametreler, govde, acik_kalsin) ya da bağlantı kapandıysa None."""
+    satir = await okuyucu.readline()
+    if not satir.strip(): return None
+    try: yontem, hedef, surum = satir.decode('latin-1').split()
+    except ValueError: raise ApiHatasi(400, "Geçersiz istek satırı.")
+    basliklar = {}
+    while True:
+        satir = await okuyucu.readline()
+        if satir in (b'\r\n', b'\n', b''): break
+        if len(basliklar) >= 100: raise ApiHatasi(431, "Çok fazla başlık.")
+        ad, _, deger = satir.decode('latin-1').partition(':')
+        basliklar[ad.strip().lower()] = deger.strip()
+    try: uzunluk = int(basliklar.get('content-length') or 0)
+    except ValueError: raise ApiHatasi(400, "Geçersiz Content-Length.")
+    if not 0 <= uzunluk <= EN_BUYUK_GOVDE: raise ApiHatasi(413, "İstek gövdesi çok büyük.")
+    govde = await okuyucu.readexactly(uzunluk) if uzunluk else b''
+    baglanti_basligi = basliklar.get('connection', '').lower()
+    acik_kalsin = baglanti_basligi == 'keep-alive' or (surum == 'HTTP/1.1' and baglanti_basligi != 'close')
+    adres = urlsplit(hedef)
+    parametreler = {ad: degerler[-1] for ad, degerler in parse_qs(adres.query).items()}
+    return yontem.upper(), adres.path.rstrip('/') or '/', parametreler, govde, acik_kalsin
+
+def _yanit(durum, nesne, acik_kalsin, sure_ms):
+    """Yardımcı: JSON gövdeli HTTP yanıtının baytları."""
+    govde = json.dumps(nesne, ensure_ascii=False).encode('utf-8')
+    basliklar = [f"HTTP/1.1 {durum} {HTTPStatus(durum).phrase}",
+                 "Content-Type: application/json; charset=utf-8",
+                 f"Content-Length: {len(govde)}",
+                 f"Connection: {'keep-alive' if acik_kalsin else 'close'}",
+                 f"Server-Timing: app;dur={sure_ms:.3f}"]
+    return ("\r\n".join(basliklar) + "\r\n\r\n").encode('latin-1') + govde
+
+class ApiSunucusu:
+    """HTTP isteklerini uç noktalara yönlendirir, veritabanı işlerini sınırlı bir havuzda çalıştırır."""
+    def __init__(self, isci_sayisi=ISCI_SAYISI, kuyruk_siniri=KUYRUK_SINIRI):
+        self.havuz = ThreadPoolExecutor(max_workers=isci_sayisi, thread_name_prefix="api-veritabani")
+        self.isci_sayisi, self.kuyruk_siniri = isci_sayisi, kuyruk_siniri
+        self.bekleyen = 0 # Havuza verilmiş, bitmemiş iş sayısı (yalnızca olay döngüsünde değişir)
+        self.reddedilen = 0 # Kuyruk dolu olduğu için 503 alan istek sayısı
+        self.metrikler = {} # "YÖNTEM /desen" -> UcNoktaMetrigi
+        self.baslangic = time.monotonic()
+
+    def _yol_bul(self, yontem, yol):
+        """Yardımcı: (işleyici, yol grupları, metrik adı); yol yoksa 404, yöntem uymuyorsa 405."""
+        yol_var = False
+        for yol_yontemi, desen, isleyici in YOLLAR:
+            eslesme = desen.fullmatch(yol)
+            if eslesme is None: continue
+            if yol_yontemi == yontem: return isleyici, eslesme.groups(), yontem + " " + desen.pattern.replace(r'(\d+)', '<id>')
+            yol_var = True
+        if yol_var: raise ApiHatasi(405, f"{yontem} bu adreste desteklenmiyor.")
+        raise ApiHatasi(404, f"{yol} bulunamadı.")
+
+    async def _veritabaninda(self, fonksiyon, *argumanlar):
+        """Yardımcı: İşi havuzda çalıştırır; havuz doluysa 503, zaman aşımında 504."""
+        if self.bekleyen >= self.kuyruk_siniri:
+            self.reddedilen += 1
+            raise ApiHatasi(503, "Sunucu meşgul, lütfen tekrar deneyin.")
+        dongu = asyncio.get_running_loop()
+        is_ = self.havuz.submit(fonksiyon, *argumanlar)
+        self.bekleyen += 1
+        # Sayaç iş havuzda gerçekten bitince azalır: 504'ten sonra da iş çalışmaya devam eder
+        is_.add_done_callback(lambda _: self._is_bitti(dongu))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(is_), ISTEK_ZAMAN_ASIMI)
+        except asyncio.TimeoutError:
+            raise ApiHatasi(504, "Veritabanı işlemi zaman aşımına uğradı.")
+
+    def _is_bitti(self, dongu):
+        """Yardımcı: Havuz işi bittiğinde (işçi thread'inde) çağrılır; sayacı olay döngüsünde azaltır."""
+        try: dongu.call_soon_threadsafe(self._bekleyeni_azalt)
+        except RuntimeError: pass # Döngü kapanmış (sunucu durdu)
+
+    def _bekleyeni_azalt(self):
+        """Yardımcı: Biten bir havuz işini sayaçtan düşer (olay döngüsünde)."""
+        self.bekleyen -= 1
+
+    def metrik_raporu(self):
+        """GET /metrikler yanıtı."""
+        return {"calisma_suresi_sn": round(time.monotonic() - self.baslangic, 1),
+                "havuz": {"isci": self.isci_sayisi, "kuyruk_siniri": self.kuyruk_siniri, "bekleyen": self.bekleyen, "reddedilen": self.reddedilen},
+                "uc_noktalar": {ad: metrik.ozet() for ad, metrik in sorted(self.metrikler.items())}}
+
+    async def yanitla(self, yontem, yol, parametreler, govde):
+        """Bir isteği işler; (durum, nesne, metrik adı) döndürür. Hatalar uygun HTTP durumlarına çevrilir."""
+        metrik_adi = None
+        try:
+            isleyici, gruplar, metrik_adi = self._yol_bul(yontem, yol)
+            if isleyici is None:
+                return 200, (self.metrik_raporu() if yol == '/metrikler' else {"durum": "ok"}), metrik_adi
+            try: veri = json.loads(govde) if govde else None
+            except ValueError: raise ApiHatasi(400, "İstek gövdesi geçerli JSON değil.")
+            durum, nesne = await self._veritabaninda(isleyici, parametreler, veri, *gruplar)
+            return durum, nesne, metrik_adi
+        except ApiHatasi as e:
+            return e.durum, {"hata": str(e)}, metrik_adi
+        except ValueError as e: # Örn. oda_sil'in iş kuralı hataları
+            return 400, {"hata": str(e)}, metrik_adi
+        except sqlite3.IntegrityError as e:
+            return 409, {"hata": f"Kayıt kuralı ihlali: {e}"}, metrik_adi
+        except sqlite3.OperationalError as e:
+            if veritabani._mesgul_hatasi_mi(e): return 503, {"hata": "Veritabanı meşgul, lütfen tekrar deneyin."}, metrik_adi
+            return 500, {"hata": f"Veritabanı hatası: {e}"}, metrik_adi
+        except Exception as e:
+            print(f"API isteği işlenirken beklenmeyen hata ({yontem} {yol}): {e}")
+            return 500, {"hata": "Sunucu hatası."}, metrik_adi
+
+    async def baglanti_isle(self, okuyucu, yazici):
+        """Bir istemci bağlantısındaki istekleri (keep-alive ile) sırayla cevaplar."""
+        try:
+            while True:
+                try:
+                    istek = await asyncio.wait_for(_istek_oku(okuyucu), BAGLANTI_ZAMAN_ASIMI)
+                except ApiHatasi as e: # Bozuk istek: cevapla ve bağlantıyı kapat
+                    yazici.write(_yanit(e.durum, {"hata": str(e)}, False, 0.0)); await yazici.drain()
+                    break
+                if istek is None: break
+                yontem, yol, parametreler, govde, acik_kalsin = istek
+                baslangic = time.perf_counter()
+                durum, nesne, metrik_adi = await self.yanitla(yontem, yol, parametreler, govde)
+                sure_ms = (time.perf_counter() - baslangic) * 1000
+                self.metrikler.setdefault(metrik_adi or "diğer", UcNoktaMetrigi()).kaydet(durum, sure_ms)
+                yazici.write(_yanit(durum, nesne, acik_kalsin, sure_ms)); await yazici.drain()
+                if not acik_kalsin: break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass # Boşta kalan, yarıda kesilen veya satır sınırını aşan bağlantı
+        finally:
+            yazici.close()
+
+    def kapat(self):
+        """Havuzu (çalışan işlerin bitmesini bekleyerek) ve veritabanı bağlantılarını kapatır."""
+        self.havuz.shutdown(wait=True, cancel_futures=True)
+        veritabani.tum_baglantilari_kapat()
+
+async def sunucuyu_calistir(host, port, isci_sayisi=ISCI_SAYISI):
+    """Şemayı hazırlar ve durdurulana kadar istekleri dinler."""
+    veritabani.veritabani_baslat()
+    api = ApiSunucusu(isci_sayisi)
+    sunucu = await asyncio.start_server(api.baglanti_isle, host, port)
+    print(f"API http://{host}:{port} adresinde dinliyor ({isci_sayisi} veritabanı işçisi, veritabanı: {veritabani.DB_NAME})")
+    try:
+        async with sunucu: await sunucu.serve_forever()
+    finally:
+        api.kapat()
+
+if __name__ == "__main__":
+    ayristirici = argparse.ArgumentParser(description="Otel rezervasyon sistemi HTTP/JSON API sunucusu.")
+    ayristirici.add_argument("--host", default="127.0.0.1")
+    ayristirici.add_argument("--port", type=int, default=8080)
+    ayristirici.add_argument("--isci", type=int, default=ISCI_SAYISI, help="Veritabanı işçi (bağlantı) sayısı")
+    ayristirici.add_argument("--veritabani", default=veritabani.DB_NAME, help="Veritabanı dosyası")
+    argumanlar = ayristirici.parse_args()
+    veritabani.DB_NAME = argumanlar.veritabani
+    try: asyncio.run(sunucuyu_calistir(argumanlar.host, argumanlar.port, argumanlar.isci))
+    except KeyboardInterrupt: print("Sunucu kapatıldı.")
@@ -1,17 +1,26 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
-from datetime import datetime
+from datetime import date, datetime, timedelta
 import sqlite3 
 
 # Gerekli tüm fonksiyonları import et
 try:
-    from veritabani import (rezervasyon_ekle, rezervasyonlari_cek, rezervasyon_sil, 
+    from veritabani import (rezervasyon_ekle, rezervasyon_sayfasi_cek, rezervasyon_sil, 
                             rezervasyon_ara, rezervasyon_guncelle,
-                            oda_tiplerini_cek, fiyat_getir, 
-                            musait_oda_bul, oda_musait_mi,
-                            get_anlik_oda_durumu,
+                            oda_tiplerini_cek, 
+                            musait_oda_bul, oda_musait_mi, rezervasyon_yap_atomik, musaitlik_ozeti,
+                            get_anlik_oda_durumu, takvim_rezervasyonlari,
                             odalari_cek, oda_ekle, oda_guncelle, oda_sil,
-                            check_out_yap) 
+                            check_out_yap, toplu_check_out, gunun_cikislari, gunun_cikislarini_yap,
+                            oda_durumlarini_guncelle, veritabani_baslat, konaklama_tarihleri_gecerli_mi,
+                            ARAMA_SONUC_LIMITI, TARIH_ARALIGI_HATASI) 
+    from fiyatlandirma import konaklama_fiyati
+    from raporlama import aylik_rapor, yillik_rapor
+    from arkaplan import ArkaplanIscisi
+    from canli_arama import AramaOnbellegi
+    from doluluk import gun_no, gun_tarihi
+    from kayitlar import tarih_gosterimi
+    import izleme
 except ImportError:
     # Kullanıcıya veritabani.py'nin eksik olduğunu bildir
     root = tk.Tk(); root.withdraw() # Ana pencereyi gösterme
@@ -23,6 +32,12 @@ except Exception as e:
     messagebox.showerror("Veritabanı Başlatma Hatası", f"Veritabanı başlatılırken hata oluştu:\n{e}\n\nProgram kapatılacak.")
     exit()
 
+# Ana listede bir seferde çekilen satır sayısı ve Treeview'da aynı anda tutulan en fazla sayfa
+SAYFA_BOYUTU = 100
+PENCERE_SAYFA_SAYISI = 5
+# Yazarken aramada son tuştan sonra aramanın başlaması için beklenen süre (ms)
+CANLI_ARAMA_GECIKMESI = 250
+
 # --- YARDIMCI FONKSİYON ---
 def tarihi_cevir(tarih_str, gelen_format=None, hedef_format="%Y-%m-%d"):
     """
@@ -41,14 +56,73 @@ def tarihi_cevir(tarih_str, gelen_format=None, hedef_format="%Y-%m-%d"):
     except ValueError:
         return "" # Hata durumunda boş metin
 
+class TreeviewEsitleyici:
+    """
+    Treeview'da gösterilen satırların bir kopyasını (iid -> değerler, tag) tutar. Yeni liste
+    verildiğinde yalnızca eklenen, değişen ve silinen satırlar için Tk çağrısı yapılır;
+    seçim ve ekranın en üstündeki satır korunur.
+    """
+    def __init__(self, tree):
+        self.tree = tree
+        self.satirlar = {} # iid -> (degerler, tag)
+
+    def _ekle(self, konum, iid, degerler, tag):
+        """Yardımcı: Tek satırı Treeview'a ve kopyaya ekler."""
+        self.tree.insert("", konum, iid=iid, values=degerler, tags=(tag,) if tag else ())
+        self.satirlar[iid] = (degerler, tag)
+
+    def ekle(self, satirlar, konum=tk.END):
+        """(iid, degerler, tag) satırlarını sona (veya konum=0 ile başa, aynı sırayla) ekler."""
+        for sira, (iid, degerler, tag) in enumerate(satirlar):
+            self._ekle(sira if konum == 0 else tk.END, iid, degerler, tag)
+
+    def sil(self, iidler):
+        """Verilen iid'lere sahip satırları siler."""
+        if not iidler: return
+        self.tree.delete(*iidler)
+        for iid in iidler: self.satirlar.pop(iid, None)
+
+    def temizle(self):
+        """Tüm satırları siler."""
+        self.tree.delete(*self.tree.get_children())
+        self.satirlar.clear()
+
+    def esitle(self, satirlar):
+        """Treeview'ı verilen sıralı (iid, degerler, tag) listesine eşitler; değişmeyen satırlara dokunulmaz."""
+        cocuklar = self.tree.get_children()
+        ust_satir, ust_sira = None, 0
+        if cocuklar: # Ekranın en üstündeki satır
+            ust_sira = min(int(self.tree.yview()[0] * len(cocuklar)), len(cocuklar) - 1)
+            ust_satir = cocuklar[ust_sira]
+        yeni_sira = [satir[0] for satir in satirlar]
+        yeni_kume = set(yeni_sira)
+        self.sil([iid for iid in cocuklar if iid not in yeni_kume])
+        for sira, (iid, degerler, tag) in enumerate(satirlar):
+            eski = self.satirlar.get(iid)
+            if eski is None: self._ekle(sira, iid, degerler, tag)
+            elif eski != (degerler, tag):
+                self.tree.item(iid, values=degerler, tags=(tag,) if tag else ())
+                self.satirlar[iid] = (degerler, tag)
+        # Sıralaması değişen satır varsa (örn. tarihi güncellenen kayıt) yalnızca yeri tutmayanları taşı
+        mevcut = list(self.tree.get_children())
+        if mevcut != yeni_sira:
+            for sira, iid in enumerate(yeni_sira):
+                if mevcut[sira] != iid:
+                    mevcut.remove(iid); mevcut.insert(sira, iid)
+                    self.tree.move(iid, "", sira)
+        # Kullanıcının baktığı satır ekranda aynı yerde kalsın
+        if ust_satir is not None and ust_satir in self.satirlar:
+            yeni_ust_sira = self.tree.index(ust_satir)
+            if yeni_ust_sira != ust_sira: self.tree.yview_moveto(yeni_ust_sira / max(len(yeni_sira), 1))
+
 # --- ODA DURUM PANELİ SINIFI ---
 class OdaDurumPaneli(tk.Toplevel):
     """Anlık oda durumunu (rezervasyon ve fiziksel) gösteren pencere."""
-    def __init__(self, master):
+    def __init__(self, master, ana_uygulama):
         super().__init__(master)
         self.title("Anlık Oda Durum Paneli")
         self.geometry("800x550")
-        self.transient(master); self.grab_set() # Ana pencerenin üzerinde ve odaklı
+        self.transient(master); self.grab_set(); self.ana_uygulama = ana_uygulama # Ana pencerenin üzerinde ve odaklı
         
         self._arayuzu_olustur()
         # İlk veriyi yükle (başlangıçta bugünün tarihiyle)
@@ -74,6 +148,7 @@ class OdaDurumPaneli(tk.Toplevel):
         tree_frame = tk.Frame(self); tree_frame.pack(fill="both", expand=True, padx=10, pady=10)
         self.sutunlar = ("Oda No", "Oda Tipi", "Rezervasyon Durumu", "Fiziksel Durum", "Müşteri", "Çıkış Tarihi")
         self.tree = ttk.Treeview(tree_frame, columns=self.sutunlar, show="headings")
+        self.esitleyici = TreeviewEsitleyici(self.tree) # Yenilemede yalnızca değişen odalar güncellenir
         self._treeview_kolon_ayarla() # Kolonları ayarla
         self._treeview_renk_ayarla() # Renkleri ayarla
         
@@ -105,15 +180,19 @@ class OdaDurumPaneli(tk.Toplevel):
         self.verileri_yukle(tarih_sql, tarih_gosterim)
 
     def verileri_yukle(self, tarih_sql, tarih_gosterim):
-        """Belirtilen tarihe göre veritabanından verileri çeker ve listeyi günceller."""
-        self.baslik_label.config(text=f"Oda Durumu ({tarih_gosterim})")
-        self.tree.delete(*self.tree.get_children()) # Listeyi temizle
-        try: 
-            durum_listesi = get_anlik_oda_durumu(tarih_sql)
-        except Exception as e:
+        """Belirtilen tarihe göre verileri arka planda çeker; gelince listeyi günceller."""
+        def basarisiz(e):
+            if not self.winfo_exists(): return
+            self.esitleyici.temizle() # Eski tarihin durumları gösterilmesin
             messagebox.showerror("Veritabanı Hatası", f"Oda durumları çekilirken hata oluştu:\n{e}", parent=self)
-            return
-            
+        self.ana_uygulama.isci.calistir(get_anlik_oda_durumu, tarih_sql, anahtar='oda_durumu', hata=basarisiz,
+                                        basarili=lambda durum_listesi: self._verileri_goster(durum_listesi, tarih_gosterim))
+
+    def _verileri_goster(self, durum_listesi, tarih_gosterim):
+        """Çekilen oda durumlarını listeye yansıtır."""
+        if not self.winfo_exists(): return # Sonuç gelmeden panel kapatıldı
+        self.baslik_label.config(text=f"Oda Durumu ({tarih_gosterim})")
+        satirlar = []
         for oda in durum_listesi:
             # (oda_no, oda_tipi, fiziksel_durum, musteri_adi, cikis_tarihi)
             try:
@@ -123,12 +202,366 @@ class OdaDurumPaneli(tk.Toplevel):
                     tag = 'bos_temiz' if fiziksel_durum == "Temiz" else 'bos_diger'
                 else: # Rezervasyon var (DOLU)
                     rez_durumu, musteri_goster, tag = "DOLU", musteri, 'dolu'
-                    cikis_goster = tarihi_cevir(cikis_sql, hedef_format="%d.%m.%Y")
+                    cikis_goster = tarih_gosterimi(cikis_sql)
                 
                 degerler = (oda_no, tip, rez_durumu, fiziksel_durum, musteri_goster, cikis_goster)
-                self.tree.insert("", tk.END, values=degerler, tags=(tag,))
+                satirlar.append((str(oda_no), degerler, tag)) # iid = oda numarası
             except IndexError:
                  print(f"Hatalı oda durum verisi (IndexError): {oda}") # Hata ayıklama
+        self.esitleyici.esitle(satirlar)
+
+
+# --- ODA TAKVİMİ PANELİ SINIFI ---
+class TakvimPaneli(tk.Toplevel):
+    """
+    Odalar × günler takvimi. Rezervasyonlar PENCERE_GUN günlük pencereler halinde (pencere başına tek
+    sorgu) arka planda çekilir ve önbellekte tutulur; kaydırdıkça yalnızca eksik pencereler ve iki
+    yandaki birer sayfalık komşuları istenir. Canvas'a yalnızca görünen günler ve odalar çizilir
+    (hücre başına widget yok).
+    """
+    PENCERE_GUN = 14 # Veritabanından bir seferde çekilen gün sayısı (önbellek birimi)
+    ONBELLEK_PENCERE = 60 # Önbellekte tutulan en fazla pencere; fazlası görünen yerden en uzak olanlardan atılır
+    SURELER = {"2 Hafta": 14, "4 Hafta": 28, "8 Hafta": 56}
+    ETIKET_GENISLIGI, BASLIK_YUKSEKLIGI, SATIR_YUKSEKLIGI = 120, 40, 24
+    TUVAL_GENISLIGI, TUVAL_YUKSEKLIGI = 1100, 480
+    KAYDIRMA_GUN = 365 # Yatay kaydırma çubuğu bugünün bu kadar gün öncesi ile sonrasını kapsar
+    ODEME_RENKLERI = {'Ödenmedi': '#ef9a9a', 'Kapora Alındı': '#ffe082', 'Tamamı Ödendi': '#a5d6a7'}
+    DURUM_RENKLERI = {'Temiz': '#4caf50', 'Kirli': '#ff9800', 'Tadilatta': '#9e9e9e'}
+
+    def __init__(self, master, ana_uygulama):
+        super().__init__(master)
+        self.title("Oda Takvimi")
+        self.geometry("1150x600")
+        self.transient(master); self.grab_set(); self.ana_uygulama = ana_uygulama
+        self.bugun = gun_no(date.today().isoformat())
+        self.ilk_gun, self.ilk_satir = self.bugun - 2, 0 # Görünen alanın sol üst köşesi (gün no, oda sırası)
+        self.odalar = [] # (oda_no, oda_tipi, fiyat, durum)
+        self.pencereler = {} # pencere no -> [(oda_no, id, giris_gun, cikis_gun, musteri, odeme), ...]
+        self.istenen = set() # Yüklenmekte olan pencereler
+        self.cubuklar = {} # Canvas öğe kimliği -> çizilen rezervasyon (tıklanınca ayrıntı)
+
+        self._arayuzu_olustur()
+        self.yenile()
+
+    def _arayuzu_olustur(self):
+        """Panelin görsel bileşenlerini oluşturur."""
+        kontrol_frame = tk.Frame(self, pady=5); kontrol_frame.pack()
+        tk.Button(kontrol_frame, text="◀", command=lambda: self.git(self.ilk_gun - self.gun_sayisi() // 2), width=3).pack(side=tk.LEFT, padx=2)
+        tk.Button(kontrol_frame, text="Bugün", command=lambda: self.git(self.bugun - 2), font=('Arial', 9)).pack(side=tk.LEFT, padx=2)
+        tk.Button(kontrol_frame, text="▶", command=lambda: self.git(self.ilk_gun + self.gun_sayisi() // 2), width=3).pack(side=tk.LEFT, padx=2)
+        tk.Label(kontrol_frame, text="Başlangıç (GG/AA/YYYY):", font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        self.tarih_var = tk.StringVar(value=datetime.now().strftime("%d/%m/%Y"))
+        tk.Entry(kontrol_frame, textvariable=self.tarih_var, width=12, font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        tk.Button(kontrol_frame, text="Git", command=self.tarihe_git, font=('Arial', 9, 'bold'), bg="#007bff", fg="white").pack(side=tk.LEFT, padx=5)
+        self.sure_var = tk.StringVar(value="4 Hafta")
+        sure_combo = ttk.Combobox(kontrol_frame, textvariable=self.sure_var, values=list(self.SURELER), width=8, state="readonly", font=('Arial', 10))
+        sure_combo.pack(side=tk.LEFT, padx=5); sure_combo.bind('<<ComboboxSelected>>', lambda e: self.git(self.ilk_gun))
+        tk.Button(kontrol_frame, text="Yenile", command=self.yenile, font=('Arial', 9)).pack(side=tk.LEFT, padx=5)
+        self.bilgi_label = tk.Label(self, text="", fg="#607D8B", font=('Arial', 9, 'italic')); self.bilgi_label.pack()
+
+        tuval_frame = tk.Frame(self); tuval_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        self.yatay = ttk.Scrollbar(tuval_frame, orient="horizontal", command=self._yatay_kaydir); self.yatay.pack(side="bottom", fill="x")
+        self.dikey = ttk.Scrollbar(tuval_frame, orient="vertical", command=self._dikey_kaydir); self.dikey.pack(side="right", fill="y")
+        self.canvas = tk.Canvas(tuval_frame, width=self.TUVAL_GENISLIGI, height=self.TUVAL_YUKSEKLIGI, bg="white", highlightthickness=0)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.bind('<Configure>', lambda e: self.ciz())
+        self.canvas.bind('<Button-1>', self._cubuga_tiklandi)
+        for olay, yon in (('<MouseWheel>', None), ('<Button-4>', -1), ('<Button-5>', 1)):
+            self.canvas.bind(olay, lambda e, yon=yon: self._dikey_kaydir('scroll', yon or (-1 if e.delta > 0 else 1), 'units'))
+            self.canvas.bind('<Shift-' + olay[1:], lambda e, yon=yon: self.git(self.ilk_gun + (yon or (-1 if e.delta > 0 else 1))))
+
+    def gun_sayisi(self):
+        """Görünen gün sayısı (seçili süre)."""
+        return self.SURELER[self.sure_var.get()]
+
+    def _tuval_boyutu(self):
+        """Yardımcı: Canvas'ın gerçek boyutu (pencere henüz çizilmediyse istenen boyut)."""
+        genislik, yukseklik = self.canvas.winfo_width(), self.canvas.winfo_height()
+        if genislik <= 1: genislik, yukseklik = self.TUVAL_GENISLIGI, self.TUVAL_YUKSEKLIGI
+        return genislik, yukseklik
+
+    def _gorunen_satir_sayisi(self):
+        """Yardımcı: Canvas'a sığan oda satırı sayısı."""
+        return max(1, (self._tuval_boyutu()[1] - self.BASLIK_YUKSEKLIGI) // self.SATIR_YUKSEKLIGI)
+
+    def yenile(self):
+        """Önbelleği boşaltır; odaları ve görünen pencereleri yeniden çeker."""
+        self.pencereler.clear(); self.istenen.clear()
+        def basarisiz(e):
+            if not self.winfo_exists(): return
+            messagebox.showerror("Veritabanı Hatası", f"Odalar çekilirken hata oluştu:\n{e}", parent=self)
+        def geldi(odalar):
+            if not self.winfo_exists(): return
+            self.odalar = odalar
+            self.ilk_satir = min(self.ilk_satir, max(0, len(odalar) - self._gorunen_satir_sayisi()))
+            self.git(self.ilk_gun)
+        self.ana_uygulama.isci.calistir(odalari_cek, anahtar='takvim_odalar', basarili=geldi, hata=basarisiz)
+
+    def tarihe_git(self):
+        """Girilen tarihi görünen aralığın başına alır."""
+        tarih_sql = tarihi_cevir(self.tarih_var.get(), hedef_format="%Y-%m-%d")
+        if not tarih_sql:
+            messagebox.showerror("Hata", "Geçersiz tarih formatı.\nLütfen GG/AA/YYYY formatında giriniz.", parent=self)
+            return
+        self.git(gun_no(tarih_sql))
+
+    def git(self, ilk_gun):
+        """Görünen aralığı ilk_gun'den başlatır, eksik pencereleri ister ve yeniden çizer."""
+        self.ilk_gun = ilk_gun
+        self._pencereleri_iste()
+        kaydirma_basi = self.bugun - self.KAYDIRMA_GUN
+        self.yatay.set((ilk_gun - kaydirma_basi) / (2 * self.KAYDIRMA_GUN), (ilk_gun + self.gun_sayisi() - kaydirma_basi) / (2 * self.KAYDIRMA_GUN))
+        self.ciz()
+
+    def _pencereleri_iste(self):
+        """Yardımcı: Görünen pencereleri ve iki yanda birer sayfalık pencereyi (kaydırmaya hazırlık) yükletir."""
+        ilk, son = self.ilk_gun // self.PENCERE_GUN, (self.ilk_gun + self.gun_sayisi() - 1) // self.PENCERE_GUN
+        komsu = -(-self.gun_sayisi() // self.PENCERE_GUN) # Bir sayfanın kapladığı pencere sayısı
+        for pencere in range(ilk - komsu, son + komsu + 1):
+            if pencere in self.pencereler or pencere in self.istenen: continue
+            self.istenen.add(pencere)
+            baslangic = pencere * self.PENCERE_GUN
+            self.ana_uygulama.isci.calistir(takvim_rezervasyonlari, gun_tarihi(baslangic), gun_tarihi(baslangic + self.PENCERE_GUN),
+                                            anahtar=('takvim', pencere), basarili=lambda satirlar, p=pencere: self._pencere_geldi(p, satirlar),
+                                            hata=lambda e, p=pencere: self._pencere_gelmedi(p, e))
+        # Önbellek büyüdüyse görünen yerden en uzak pencereleri at
+        fazla = len(self.pencereler) - self.ONBELLEK_PENCERE
+        if fazla > 0:
+            for pencere in sorted(self.pencereler, key=lambda p: abs(p - ilk), reverse=True)[:fazla]: del self.pencereler[pencere]
+
+    def _pencere_geldi(self, pencere, satirlar):
+        """Çekilen pencereyi gün numaralarına çevirip önbelleğe koyar; görünüyorsa yeniden çizer."""
+        if not self.winfo_exists() or pencere not in self.istenen: return # Bu arada Yenile'ye basıldı
+        self.istenen.discard(pencere)
+        self.pencereler[pencere] = [(oda_no, rez_id, gun_no(giris), gun_no(cikis), musteri, odeme)
+                                    for oda_no, rez_id, giris, cikis, musteri, odeme in satirlar]
+        ilk, son = self.ilk_gun // self.PENCERE_GUN, (self.ilk_gun + self.gun_sayisi() - 1) // self.PENCERE_GUN
+        if ilk <= pencere <= son: self.ciz() # Görünmeyen (önden yüklenen) pencere için çizime gerek yok
+
+    def _pencere_gelmedi(self, pencere, e):
+        """Pencere çekilemezse önbelleğe konmaz; bir sonraki kaydırmada tekrar istenir."""
+        if not self.winfo_exists(): return
+        self.istenen.discard(pencere)
+        self.bilgi_label.config(text=f"Takvim verisi çekilemedi: {e}")
+
+    def _yatay_kaydir(self, islem, miktar, birim=None):
+        """Yatay kaydırma çubuğu: sürükleme (moveto) veya ok/sayfa adımları (scroll)."""
+        if islem == 'moveto': self.git(self.bugun - self.KAYDIRMA_GUN + round(float(miktar) * 2 * self.KAYDIRMA_GUN))
+        else: self.git(self.ilk_gun + int(miktar) * (self.gun_sayisi() if birim == 'pages' else 1))
+
+    def _dikey_kaydir(self, islem, miktar, birim=None):
+        """Dikey kaydırma çubuğu: oda satırları arasında gezinir."""
+        gorunen = self._gorunen_satir_sayisi()
+        if islem == 'moveto': satir = round(float(miktar) * len(self.odalar))
+        else: satir = self.ilk_satir + int(miktar) * (gorunen if birim == 'pages' else 1)
+        self.ilk_satir = max(0, min(satir, len(self.odalar) - gorunen))
+        self.ciz()
+
+    def ciz(self):
+        """Görünen günleri ve odaları Canvas'a çizer: ızgara çizgi başına, rezervasyon çubuk başına tek öğe."""
+        if not self.winfo_exists(): return
+        c = self.canvas; c.delete('all'); self.cubuklar = {}
+        genislik, yukseklik = self._tuval_boyutu()
+        gun_sayisi, gorunen = self.gun_sayisi(), self._gorunen_satir_sayisi()
+        hucre = (genislik - self.ETIKET_GENISLIGI) / gun_sayisi
+        x = lambda gun: self.ETIKET_GENISLIGI + (gun - self.ilk_gun) * hucre
+        odalar = self.odalar[self.ilk_satir:self.ilk_satir + gorunen]
+        alt = self.BASLIK_YUKSEKLIGI + len(odalar) * self.SATIR_YUKSEKLIGI
+        baslangic = date.fromisoformat(gun_tarihi(self.ilk_gun))
+
+        # Gün başlıkları, hafta sonu ve bugün sütunları
+        for i in range(gun_sayisi):
+            tarih, sol = baslangic + timedelta(days=i), x(self.ilk_gun + i)
+            if tarih.weekday() >= 5: c.create_rectangle(sol, 0, sol + hucre, alt, fill='#f5f5f5', width=0)
+            if self.ilk_gun + i == self.bugun: c.create_rectangle(sol, 0, sol + hucre, alt, fill='#e3f2fd', width=0)
+            if i == 0 or tarih.day == 1: c.create_text(sol + 2, 2, text=tarih.strftime("%m/%Y"), anchor='nw', font=('Arial', 8, 'bold'))
+            if hucre >= 14 or tarih.weekday() == 0: c.create_text(sol + hucre / 2, 26, text=str(tarih.day), font=('Arial', 8))
+            c.create_line(sol, self.BASLIK_YUKSEKLIGI - 4, sol, alt, fill='#e0e0e0')
+        for sira, (oda_no, tip, _, durum) in enumerate(odalar):
+            ust = self.BASLIK_YUKSEKLIGI + sira * self.SATIR_YUKSEKLIGI
+            c.create_line(0, ust, genislik, ust, fill='#e0e0e0')
+            c.create_rectangle(4, ust + 7, 14, ust + 17, fill=self.DURUM_RENKLERI.get(durum, 'white'), width=0)
+            c.create_text(18, ust + self.SATIR_YUKSEKLIGI / 2, text=f"{oda_no}  {tip}", anchor='w', font=('Arial', 9))
+
+        # Rezervasyon çubukları (birden fazla pencereye düşen rezervasyon bir kez çizilir)
+        satir_no = {oda[0]: sira for sira, oda in enumerate(odalar)}
+        son_gun, cizilen, eksik = self.ilk_gun + gun_sayisi, set(), 0
+        for pencere in range(self.ilk_gun // self.PENCERE_GUN, (son_gun - 1) // self.PENCERE_GUN + 1):
+            if pencere not in self.pencereler: eksik += 1; continue
+            for rez in self.pencereler[pencere]:
+                oda_no, rez_id, giris, cikis, musteri, odeme = rez
+                if rez_id in cizilen or oda_no not in satir_no or cikis <= self.ilk_gun or giris >= son_gun: continue
+                cizilen.add(rez_id)
+                ust = self.BASLIK_YUKSEKLIGI + satir_no[oda_no] * self.SATIR_YUKSEKLIGI
+                sol, sag = x(max(giris, self.ilk_gun)), x(min(cikis, son_gun))
+                oge = c.create_rectangle(sol + 1, ust + 3, sag - 1, ust + self.SATIR_YUKSEKLIGI - 3,
+                                         fill=self.ODEME_RENKLERI.get(odeme, '#bbdefb'), outline='#757575')
+                self.cubuklar[oge] = rez
+                if sag - sol > 30: # Ad çubuğa sığdığı kadar yazılır
+                    yazi = c.create_text(sol + 4, ust + self.SATIR_YUKSEKLIGI / 2, text=musteri[:int((sag - sol - 8) / 7)], anchor='w', font=('Arial', 8))
+                    self.cubuklar[yazi] = rez
+        bitis = baslangic + timedelta(days=gun_sayisi - 1)
+        self.bilgi_label.config(text=f"{baslangic.strftime('%d.%m.%Y')} - {bitis.strftime('%d.%m.%Y')}  |  {len(self.odalar)} oda, {len(cizilen)} rezervasyon"
+                                     + ("  |  yükleniyor..." if eksik else ""))
+        if self.odalar: self.dikey.set(self.ilk_satir / len(self.odalar), (self.ilk_satir + len(odalar)) / len(self.odalar))
+
+    def _cubuga_tiklandi(self, event):
+        """Tıklanan rezervasyonun ayrıntılarını gösterir."""
+        rez = self.cubuklar.get(next(iter(self.canvas.find_withtag('current')), None))
+        if rez is None: return
+        oda_no, rez_id, giris, cikis, musteri, odeme = rez
+        messagebox.showinfo("Rezervasyon", f"#{rez_id} - {musteri}\nOda: {oda_no}\n"
+                            f"{tarih_gosterimi(gun_tarihi(giris))} - {tarih_gosterimi(gun_tarihi(cikis))} ({cikis - giris} gece)\n"
+                            f"Ödeme: {odeme}", parent=self)
+
+
+# --- RAPOR PANELİ SINIFI ---
+class RaporPaneli(tk.Toplevel):
+    """Aylık (oda tipi bazında) veya yıllık (ay bazında) doluluk, ADR ve RevPAR raporu penceresi."""
+    AYLAR = ["Tüm Yıl", "Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran", "Temmuz",
+             "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"]
+
+    def __init__(self, master, ana_uygulama):
+        super().__init__(master)
+        self.title("Doluluk ve Gelir Raporu")
+        self.geometry("800x450")
+        self.transient(master); self.grab_set(); self.ana_uygulama = ana_uygulama
+
+        self._arayuzu_olustur()
+        self.raporla()
+
+    def _arayuzu_olustur(self):
+        """Panelin görsel bileşenlerini oluşturur."""
+        kontrol_frame = tk.Frame(self, pady=5); kontrol_frame.pack()
+        tk.Label(kontrol_frame, text="Yıl:", font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        self.yil_var = tk.StringVar(value=str(datetime.now().year))
+        tk.Entry(kontrol_frame, textvariable=self.yil_var, width=6, font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        tk.Label(kontrol_frame, text="Ay:", font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        self.ay_var = tk.StringVar(value=self.AYLAR[datetime.now().month])
+        ttk.Combobox(kontrol_frame, textvariable=self.ay_var, values=self.AYLAR, width=10, state="readonly", font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        self.arsiv_var = tk.BooleanVar(value=False) # Arşive taşınmış eski rezervasyonlar da sayılsın mı?
+        tk.Checkbutton(kontrol_frame, text="Arşiv dahil", variable=self.arsiv_var, font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        tk.Button(kontrol_frame, text="Raporla", command=self.raporla, font=('Arial', 9, 'bold'), bg="#007bff", fg="white").pack(side=tk.LEFT, padx=5)
+
+        self.baslik_label = tk.Label(self, text="Rapor", font=('Arial', 14, 'bold')); self.baslik_label.pack(pady=5)
+
+        tree_frame = tk.Frame(self); tree_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        self.sutunlar = ("Dönem / Tip", "Oda Sayısı", "Satılan Gece", "Doluluk", "Gelir", "ADR", "RevPAR")
+        self.tree = ttk.Treeview(tree_frame, columns=self.sutunlar, show="headings")
+        self.esitleyici = TreeviewEsitleyici(self.tree)
+        for col in self.sutunlar:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=130 if col == "Dönem / Tip" else 100, anchor=tk.W if col == "Dönem / Tip" else tk.E)
+        self.tree.tag_configure('toplam', font=('Arial', 10, 'bold'), background='#e0e0e0')
+        vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview); vsb.pack(side='right', fill='y')
+        self.tree.configure(yscrollcommand=vsb.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+
+    def raporla(self):
+        """Seçili yıl/ay için raporu arka planda hazırlar."""
+        try:
+            yil = int(self.yil_var.get())
+            if not 2000 <= yil <= 2099: raise ValueError
+        except ValueError:
+            messagebox.showerror("Hata", "Lütfen 2000-2099 arasında geçerli bir yıl giriniz.", parent=self)
+            return
+        ay = self.AYLAR.index(self.ay_var.get())
+        baslik = f"{yil} Yılı (Ay Bazında)" if ay == 0 else f"{self.AYLAR[ay]} {yil} (Oda Tipi Bazında)"
+        def basarisiz(e):
+            if not self.winfo_exists(): return
+            messagebox.showerror("Veritabanı Hatası", f"Rapor hazırlanırken hata oluştu:\n{e}", parent=self)
+        self.ana_uygulama.isci.calistir(yillik_rapor if ay == 0 else aylik_rapor, *((yil,) if ay == 0 else (yil, ay)), self.arsiv_var.get(),
+                                        anahtar='rapor', hata=basarisiz, basarili=lambda rapor: self._raporu_goster(rapor, baslik))
+
+    def _raporu_goster(self, rapor, baslik):
+        """Hazırlanan rapor satırlarını listeye yansıtır."""
+        if not self.winfo_exists(): return
+        self.baslik_label.config(text=baslik)
+        satirlar = []
+        for donem, oda_sayisi, satilan, gelir, doluluk, adr, revpar in rapor:
+            etiket = self.AYLAR[donem] if isinstance(donem, int) else donem
+            degerler = (etiket, oda_sayisi, satilan, f"%{doluluk * 100:.1f}", f"{gelir:,.2f} TL", f"{adr:,.2f} TL", f"{revpar:,.2f} TL")
+            satirlar.append((str(donem), degerler, 'toplam' if donem == 'Toplam' else ''))
+        self.esitleyici.esitle(satirlar)
+
+
+class TanilamaPaneli(tk.Toplevel):
+    """Veri katmanı ölçümlerini (izleme.py) açıp kapatan ve son çağrıların en yavaşlarını listeleyen pencere."""
+    YENILEME_MS = 2000
+
+    def __init__(self, master):
+        super().__init__(master)
+        self.title("Tanılama: Yavaş Çağrılar")
+        self.geometry("900x550")
+        self.kayitlar = {} # iid -> izleme kaydı
+        self.zamanlayici = None # Bekleyen otomatik yenileme (after) kimliği
+
+        self._arayuzu_olustur()
+        self.yenile()
+
+    def _arayuzu_olustur(self):
+        """Panelin görsel bileşenlerini oluşturur."""
+        kontrol_frame = tk.Frame(self, pady=5); kontrol_frame.pack(fill="x", padx=10)
+        self.aktif_var = tk.BooleanVar(value=izleme.AKTIF)
+        tk.Checkbutton(kontrol_frame, text="Ölçüm açık", variable=self.aktif_var, command=self._izlemeyi_degistir, font=('Arial', 10, 'bold')).pack(side=tk.LEFT)
+        tk.Button(kontrol_frame, text="Yenile", command=self.yenile, font=('Arial', 9)).pack(side=tk.LEFT, padx=5)
+        tk.Button(kontrol_frame, text="Temizle", command=self.temizle, font=('Arial', 9)).pack(side=tk.LEFT, padx=5)
+        self.bilgi_label = tk.Label(kontrol_frame, text="", fg="#607D8B", font=('Arial', 9, 'italic')); self.bilgi_label.pack(side=tk.RIGHT)
+
+        tree_frame = tk.Frame(self); tree_frame.pack(fill="both", expand=True, padx=10)
+        self.sutunlar = ("Zaman", "Fonksiyon", "Süre (ms)", "Bekleme (ms)", "Satır", "Sorgu", "Adım")
+        self.tree = ttk.Treeview(tree_frame, columns=self.sutunlar, show="headings", height=12)
+        self.esitleyici = TreeviewEsitleyici(self.tree)
+        for col in self.sutunlar:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=260 if col == "Fonksiyon" else 100 if col == "Zaman" else 80, anchor=tk.W if col in ("Zaman", "Fonksiyon") else tk.E)
+        self.tree.tag_configure('yavas', background='#FFCDD2')
+        self.tree.tag_configure('hata', foreground='#D32F2F')
+        vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview); vsb.pack(side='right', fill='y')
+        self.tree.configure(yscrollcommand=vsb.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.tree.bind('<<TreeviewSelect>>', self._ayrintiyi_goster)
+
+        self.ayrinti = tk.Text(self, height=10, font=('Courier', 9), wrap="none", state="disabled"); self.ayrinti.pack(fill="both", padx=10, pady=10)
+
+    def _izlemeyi_degistir(self):
+        """Onay kutusuna göre ölçümü açar veya kapatır."""
+        if self.aktif_var.get(): izleme.ac()
+        else: izleme.kapat()
+        self.yenile()
+
+    def temizle(self):
+        """Bellekteki ölçüm kayıtlarını siler."""
+        izleme.kayitlari_temizle(); self.yenile()
+
+    def yenile(self):
+        """En yavaş kayıtları listeler; ölçüm açıksa kendini YENILEME_MS sonra tekrar çağırır."""
+        if not self.winfo_exists(): return
+        if self.zamanlayici is not None: self.after_cancel(self.zamanlayici); self.zamanlayici = None
+        kayitlar = izleme.en_yavas_kayitlar(100)
+        self.kayitlar = {str(id(kayit)): kayit for kayit in kayitlar}
+        satirlar = []
+        for iid, kayit in self.kayitlar.items():
+            satir = kayit['satir'] if kayit['satir'] is not None else kayit['degisen']
+            degerler = (kayit['zaman'][11:], kayit['fonksiyon'], f"{kayit['sure_ms']:.2f}", f"{kayit['bekleme_ms']:.2f}", satir, kayit['sorgu_sayisi'], kayit['adim'])
+            satirlar.append((iid, degerler, 'hata' if kayit['hata'] else 'yavas' if kayit['sure_ms'] >= izleme.YAVAS_ESIGI_MS else ''))
+        self.esitleyici.esitle(satirlar)
+        self.bilgi_label.config(text=f"Son {len(izleme.son_kayitlar())} çağrının en yavaşları" if izleme.AKTIF else "Ölçüm kapalı")
+        if izleme.AKTIF: self.zamanlayici = self.after(self.YENILEME_MS, self.yenile)
+
+    def _ayrintiyi_goster(self, event=None):
+        """Seçili çağrının SQL metinlerini ve (alındıysa) sorgu planlarını gösterir."""
+        secili = self.tree.selection()
+        kayit = self.kayitlar.get(secili[0]) if secili else None
+        if kayit is None: return
+        satirlar = [f"{kayit['fonksiyon']}  {kayit['sure_ms']:.2f} ms  (thread: {kayit['thread']})"]
+        if kayit['hata']: satirlar.append(f"HATA: {kayit['hata']}")
+        satirlar += [f"+{ofset:8.2f} ms  {sql}" for ofset, sql in kayit['sorgular']]
+        if kayit['sorgu_sayisi'] > len(kayit['sorgular']): satirlar.append(f"... (+{kayit['sorgu_sayisi'] - len(kayit['sorgular'])} sorgu)")
+        for sql, plan in kayit['planlar'].items():
+            satirlar += ["", f"PLAN: {sql[:120]}"] + [f"    {adim}" for adim in plan]
+        self.ayrinti.config(state="normal"); self.ayrinti.delete("1.0", tk.END)
+        self.ayrinti.insert("1.0", "\n".join(satirlar)); self.ayrinti.config(state="disabled")
 
 
 # --- ODA YÖNETİM PANELİ SINIFI ---
@@ -170,6 +603,7 @@ class OdaYonetimPaneli(tk.Toplevel):
         tk.Label(list_cerceve, text="Mevcut Odalar", font=('Arial', 14, 'bold')).pack(pady=10)
         self.sutunlar = ("Oda Numarası", "Oda Tipi", "Günlük Fiyat", "Oda Durumu")
         self.tree = ttk.Treeview(list_cerceve, columns=self.sutunlar, show="headings")
+        self.esitleyici = TreeviewEsitleyici(self.tree) # Yenilemede yalnızca değişen odalar güncellenir
         self._treeview_kolon_ayarla() # Kolonları ayarla
         vsb = ttk.Scrollbar(list_cerceve, orient="vertical", command=self.tree.yview); vsb.pack(side='right', fill='y')
         self.tree.configure(yscrollcommand=vsb.set); self.tree.pack(fill=tk.BOTH, expand=True)
@@ -182,18 +616,23 @@ class OdaYonetimPaneli(tk.Toplevel):
             self.tree.column(col, width=110, anchor=tk.CENTER)
 
     def odalari_listele(self):
-        """Veritabanından odaları çeker ve listeyi günceller."""
-        self.tree.delete(*self.tree.get_children())
-        try:
-            for oda in odalari_cek(): 
-                # (oda_no, tip, fiyat, durum)
-                try:
-                    fiyat_gosterim = f"{oda[2]:,.2f} TL"
-                    self.tree.insert("", tk.END, values=(oda[0], oda[1], fiyat_gosterim, oda[3]))
-                except IndexError:
-                    print(f"Hatalı oda verisi (IndexError): {oda}")
-        except Exception as e:
-            messagebox.showerror("Hata", f"Odalar listelenirken hata oluştu:\n{e}", parent=self)
+        """Odaları arka planda çeker; gelince listeyi günceller."""
+        def tamamlandi(odalar):
+            if not self.winfo_exists(): return # Sonuç gelmeden panel kapatıldı
+            satirlar = []
+            for oda in odalar: # kayitlar.Oda
+                satirlar.append((str(oda.oda_numarasi), (oda.oda_numarasi, oda.oda_tipi, f"{oda.gunluk_fiyat:,.2f} TL", oda.oda_durumu), None)) # iid = oda numarası
+            self.esitleyici.esitle(satirlar)
+        def basarisiz(e):
+            if self.winfo_exists(): messagebox.showerror("Hata", f"Odalar listelenirken hata oluştu:\n{e}", parent=self)
+        self.ana_uygulama.isci.calistir(odalari_cek, anahtar='odalar', basarili=tamamlandi, hata=basarisiz)
+
+    def _islem_bitti(self, mesaj):
+        """Yardımcı: Başarılı bir oda işleminden sonra mesaj verir, listeyi ve ana formdaki tipleri yeniler."""
+        if self.winfo_exists():
+            messagebox.showinfo("Başarılı", mesaj, parent=self)
+            self.odalari_listele(); self.formu_temizle()
+        self.ana_uygulama.refresh_oda_tipleri_combobox() # Ana formdaki listeyi yenile
             
     def formu_temizle(self):
         """Oda yönetim formunu temizler."""
@@ -235,18 +674,16 @@ class OdaYonetimPaneli(tk.Toplevel):
 
     def oda_ekle(self):
         """Formdaki verilerle yeni oda ekler."""
-        try:
-            oda_no, oda_tipi, fiyat, durum = self._formdan_veri_al()
-            oda_ekle(oda_no, oda_tipi, fiyat, durum)
-            messagebox.showinfo("Başarılı", f"Oda {oda_no} başarıyla eklendi.", parent=self)
-            self.odalari_listele(); self.formu_temizle()
-            self.ana_uygulama.refresh_oda_tipleri_combobox() # Ana formdaki listeyi yenile
-        except sqlite3.IntegrityError:
-            messagebox.showerror("Hata", f"Oda numarası '{oda_no}' zaten mevcut. Farklı bir numara girin.", parent=self)
+        try: oda_no, oda_tipi, fiyat, durum = self._formdan_veri_al()
         except ValueError as e: # Formdan_veri_al'dan gelen hata
-            messagebox.showerror("Hata", str(e), parent=self)
-        except Exception as e:
-            messagebox.showerror("Hata", f"Oda eklenirken beklenmedik bir hata oluştu:\n{e}", parent=self)
+            messagebox.showerror("Hata", str(e), parent=self); return
+        def basarisiz(e):
+            if not self.winfo_exists(): return
+            if isinstance(e, sqlite3.IntegrityError):
+                messagebox.showerror("Hata", f"Oda numarası '{oda_no}' zaten mevcut. Farklı bir numara girin.", parent=self)
+            else: messagebox.showerror("Hata", f"Oda eklenirken beklenmedik bir hata oluştu:\n{e}", parent=self)
+        self.ana_uygulama.isci.calistir(oda_ekle, oda_no, oda_tipi, fiyat, durum, hata=basarisiz,
+                                        basarili=lambda _: self._islem_bitti(f"Oda {oda_no} başarıyla eklendi."))
 
     def oda_guncelle(self):
         """Formdaki verilerle seçili odayı günceller."""
@@ -257,15 +694,12 @@ class OdaYonetimPaneli(tk.Toplevel):
         try:
             # Oda No hariç diğer verileri al ve doğrula (Oda No güncellenemez)
             _, oda_tipi, fiyat, durum = self._formdan_veri_al() 
-            
-            oda_guncelle(oda_no_form, oda_tipi, fiyat, durum)
-            messagebox.showinfo("Başarılı", f"Oda {oda_no_form} başarıyla güncellendi.", parent=self)
-            self.odalari_listele(); self.formu_temizle()
-            self.ana_uygulama.refresh_oda_tipleri_combobox() # Ana formdaki listeyi yenile
         except ValueError as e: # Formdan_veri_al'dan gelen hata
-            messagebox.showerror("Hata", str(e), parent=self)
-        except Exception as e:
-            messagebox.showerror("Hata", f"Oda güncellenirken beklenmedik bir hata oluştu:\n{e}", parent=self)
+            messagebox.showerror("Hata", str(e), parent=self); return
+        def basarisiz(e):
+            if self.winfo_exists(): messagebox.showerror("Hata", f"Oda güncellenirken beklenmedik bir hata oluştu:\n{e}", parent=self)
+        self.ana_uygulama.isci.calistir(oda_guncelle, oda_no_form, oda_tipi, fiyat, durum, hata=basarisiz,
+                                        basarili=lambda _: self._islem_bitti(f"Oda {oda_no_form} başarıyla güncellendi."))
 
     def oda_sil(self):
         """Listeden seçili odayı siler."""
@@ -275,15 +709,150 @@ class OdaYonetimPaneli(tk.Toplevel):
             return
         if not messagebox.askyesno("Onay", f"Oda {oda_no}'ı silmek istediğinizden emin misiniz?\nBu işlem geri alınamaz.", parent=self):
             return
-        try:
-            oda_sil(oda_no) # Rezervasyon varsa ValueError fırlatır
-            messagebox.showinfo("Başarılı", f"Oda {oda_no} başarıyla silindi.", parent=self)
-            self.odalari_listele(); self.formu_temizle()
-            self.ana_uygulama.refresh_oda_tipleri_combobox() # Ana formdaki listeyi yenile
-        except ValueError as e: # Veritabanından gelen "rezervasyon var" hatası
-            messagebox.showerror("Silinemedi", str(e), parent=self)
-        except Exception as e:
-            messagebox.showerror("Hata", f"Oda silinirken beklenmedik bir hata oluştu:\n{e}", parent=self)
+        def basarisiz(e):
+            if not self.winfo_exists(): return
+            if isinstance(e, ValueError): # Veritabanından gelen "rezervasyon var" hatası
+                messagebox.showerror("Silinemedi", str(e), parent=self)
+            else: messagebox.showerror("Hata", f"Oda silinirken beklenmedik bir hata oluştu:\n{e}", parent=self)
+        # Rezervasyon varsa oda_sil ValueError fırlatır
+        self.ana_uygulama.isci.calistir(oda_sil, oda_no, hata=basarisiz,
+                                        basarili=lambda _: self._islem_bitti(f"Oda {oda_no} başarıyla silindi."))
+
+# --- KAT HİZMETLERİ PANELİ SINIFI ---
+class KatHizmetleriPaneli(tk.Toplevel):
+    """
+    Kat hizmetleri kuyruğu: odaların fiziksel durumu ve seçilen günün çıkışları. Listelerde birden
+    fazla satır seçilip tek işlemde durum değiştirilir veya check-out yapılır; listeler işlem başına bir kez yenilenir.
+    """
+    FILTRELER = ["Tümü", "Kirli", "Temiz", "Tadilatta"]
+
+    def __init__(self, master, ana_uygulama):
+        super().__init__(master)
+        self.title("Kat Hizmetleri")
+        self.geometry("1000x550")
+        self.transient(master); self.grab_set(); self.ana_uygulama = ana_uygulama
+        self.odalar = [] # Son yüklenen (oda_no, tip, fiziksel_durum, musteri, cikis); filtre değişince yeniden çekilmez
+        self.tarih_sql = datetime.now().strftime("%Y-%m-%d")
+
+        self._arayuzu_olustur()
+        self.yenile()
+
+    def _arayuzu_olustur(self):
+        """Panelin görsel bileşenlerini oluşturur."""
+        kontrol_frame = tk.Frame(self, pady=5); kontrol_frame.pack()
+        tk.Label(kontrol_frame, text="Tarih (GG/AA/YYYY):", font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        self.tarih_var = tk.StringVar(value=datetime.now().strftime("%d/%m/%Y"))
+        tk.Entry(kontrol_frame, textvariable=self.tarih_var, width=12, font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        tk.Button(kontrol_frame, text="Yükle", command=self.tarihi_guncelle, font=('Arial', 9, 'bold'), bg="#007bff", fg="white").pack(side=tk.LEFT, padx=5)
+        tk.Label(kontrol_frame, text="Göster:", font=('Arial', 10)).pack(side=tk.LEFT, padx=(20, 5))
+        self.filtre_var = tk.StringVar(value="Tümü")
+        filtre = ttk.Combobox(kontrol_frame, textvariable=self.filtre_var, values=self.FILTRELER, width=10, state="readonly", font=('Arial', 10))
+        filtre.pack(side=tk.LEFT, padx=5); filtre.bind("<<ComboboxSelected>>", lambda e: self._odalari_goster())
+        self.sonuc_label = tk.Label(kontrol_frame, text="", font=('Arial', 9, 'italic'), fg="#2E7D32"); self.sonuc_label.pack(side=tk.LEFT, padx=10) # Son toplu işlemin sonucu
+
+        # --- Sol: Oda kuyruğu ---
+        oda_cerceve = tk.Frame(self); oda_cerceve.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.oda_baslik = tk.Label(oda_cerceve, text="Odalar", font=('Arial', 12, 'bold')); self.oda_baslik.pack(pady=5)
+        buton_cerceve = tk.Frame(oda_cerceve); buton_cerceve.pack(side=tk.BOTTOM, pady=5)
+        tk.Button(buton_cerceve, text="Tümünü Seç", command=lambda: self.oda_tree.selection_set(self.oda_tree.get_children())).pack(side=tk.LEFT, padx=3)
+        for durum, renk in (("Temiz", "#4CAF50"), ("Kirli", "#FF9800"), ("Tadilatta", "#607D8B")):
+            tk.Button(buton_cerceve, text=f"Seçilenler: {durum}", command=lambda d=durum: self.durum_ayarla(d), bg=renk, fg="white").pack(side=tk.LEFT, padx=3)
+        self.oda_sutunlari = ("Oda No", "Oda Tipi", "Fiziksel Durum", "Konaklama")
+        self.oda_tree = ttk.Treeview(oda_cerceve, columns=self.oda_sutunlari, show="headings", selectmode="extended")
+        self.oda_esitleyici = TreeviewEsitleyici(self.oda_tree) # iid = oda numarası; yenilemede seçim korunur
+        for col in self.oda_sutunlari:
+            self.oda_tree.heading(col, text=col); self.oda_tree.column(col, width=150 if col == "Konaklama" else 90, anchor=tk.CENTER)
+        self.oda_tree.tag_configure('Temiz', background='#c8e6c9'); self.oda_tree.tag_configure('Kirli', background='#fff9c4')
+        self.oda_tree.tag_configure('Tadilatta', background='#e0e0e0')
+        vsb = ttk.Scrollbar(oda_cerceve, orient="vertical", command=self.oda_tree.yview); vsb.pack(side='right', fill='y')
+        self.oda_tree.configure(yscrollcommand=vsb.set); self.oda_tree.pack(fill=tk.BOTH, expand=True)
+
+        # --- Sağ: Günün çıkışları ---
+        cikis_cerceve = tk.Frame(self); cikis_cerceve.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.cikis_baslik = tk.Label(cikis_cerceve, text="Çıkışlar", font=('Arial', 12, 'bold')); self.cikis_baslik.pack(pady=5)
+        buton_cerceve = tk.Frame(cikis_cerceve); buton_cerceve.pack(side=tk.BOTTOM, pady=5)
+        tk.Button(buton_cerceve, text="Seçilenleri Check-Out Yap", command=self.secilenleri_check_out, bg="#FF9800", fg="white").pack(side=tk.LEFT, padx=3)
+        tk.Button(buton_cerceve, text="Tüm Çıkışları Check-Out Yap", command=self.tumunu_check_out, bg="#D32F2F", fg="white").pack(side=tk.LEFT, padx=3)
+        self.cikis_sutunlari = ("ID", "Müşteri", "Oda No", "Ödeme Durumu", "Oda Durumu")
+        self.cikis_tree = ttk.Treeview(cikis_cerceve, columns=self.cikis_sutunlari, show="headings", selectmode="extended")
+        self.cikis_esitleyici = TreeviewEsitleyici(self.cikis_tree) # iid = rezervasyon ID
+        for col in self.cikis_sutunlari:
+            self.cikis_tree.heading(col, text=col); self.cikis_tree.column(col, width=150 if col == "Müşteri" else 80, anchor=tk.W if col == "Müşteri" else tk.CENTER)
+        self.cikis_tree.tag_configure('odendi', background='#c8e6c9'); self.cikis_tree.tag_configure('bekliyor', background='#ffcdd2')
+        vsb = ttk.Scrollbar(cikis_cerceve, orient="vertical", command=self.cikis_tree.yview); vsb.pack(side='right', fill='y')
+        self.cikis_tree.configure(yscrollcommand=vsb.set); self.cikis_tree.pack(fill=tk.BOTH, expand=True)
+
+    def tarihi_guncelle(self):
+        """Girilen tarihin oda durumlarını ve çıkışlarını yükler."""
+        tarih_sql = tarihi_cevir(self.tarih_var.get(), hedef_format="%Y-%m-%d")
+        if not tarih_sql:
+            messagebox.showerror("Hata", "Geçersiz tarih formatı.\nLütfen GG/AA/YYYY formatında giriniz.", parent=self)
+            return
+        self.tarih_sql = tarih_sql; self.yenile()
+
+    def yenile(self):
+        """Oda durumlarını ve günün çıkışlarını tek arka plan işinde çeker."""
+        tarih_sql = self.tarih_sql
+        def basarisiz(e):
+            if self.winfo_exists(): messagebox.showerror("Veritabanı Hatası", f"Kat hizmetleri listesi çekilirken hata oluştu:\n{e}", parent=self)
+        self.ana_uygulama.isci.calistir(lambda: (get_anlik_oda_durumu(tarih_sql), gunun_cikislari(tarih_sql)), anahtar='kat_hizmetleri',
+                                        basarili=lambda sonuc: self._verileri_goster(tarih_sql, *sonuc), hata=basarisiz)
+
+    def _verileri_goster(self, tarih_sql, odalar, cikislar):
+        """Çekilen listeleri iki tabloya yansıtır."""
+        if not self.winfo_exists(): return # Sonuç gelmeden panel kapatıldı
+        self.odalar = odalar
+        self._odalari_goster()
+        tarih_gosterim = tarihi_cevir(tarih_sql, hedef_format="%d.%m.%Y")
+        self.cikis_baslik.config(text=f"Çıkışlar ({tarih_gosterim}): {len(cikislar)}")
+        self.cikis_esitleyici.esitle([(str(rez_id), (rez_id, ad, oda_no, odeme, oda_durumu), 'odendi' if odeme == "Tamamı Ödendi" else 'bekliyor')
+                                      for rez_id, ad, oda_no, _, odeme, oda_durumu in cikislar])
+
+    def _odalari_goster(self):
+        """Yardımcı: Son yüklenen odaları seçili filtreye göre listeler."""
+        filtre = self.filtre_var.get()
+        satirlar = [(str(oda_no), (oda_no, tip, durum, "BOŞ" if musteri is None else f"DOLU ({musteri})"), durum)
+                    for oda_no, tip, durum, musteri, _ in self.odalar if filtre == "Tümü" or durum == filtre]
+        kirli = sum(1 for oda in self.odalar if oda[2] == "Kirli")
+        self.oda_baslik.config(text=f"Odalar: {len(satirlar)} gösteriliyor, {kirli} kirli")
+        self.oda_esitleyici.esitle(satirlar)
+
+    def _toplu_islem_bitti(self, mesaj, rezervasyonlar_degisti=False):
+        """Yardımcı: Toplu işlemden sonra listeleri bir kez yeniler; ödeme değiştiyse ana listeyi de."""
+        if rezervasyonlar_degisti: self.ana_uygulama.listeyi_yenile()
+        if not self.winfo_exists(): return
+        self.sonuc_label.config(text=mesaj); self.yenile()
+
+    def durum_ayarla(self, durum):
+        """Seçili odaların fiziksel durumunu tek işlemde değiştirir."""
+        oda_nolar = self.oda_tree.selection()
+        if not oda_nolar: messagebox.showwarning("Uyarı", "Listeden en az bir oda seçin.", parent=self); return
+        def basarisiz(e):
+            if self.winfo_exists(): messagebox.showerror("Hata", f"Oda durumları güncellenirken hata oluştu:\n{e}", parent=self)
+        self.ana_uygulama.isci.calistir(oda_durumlarini_guncelle, oda_nolar, durum, hata=basarisiz,
+                                        basarili=lambda sayi: self._toplu_islem_bitti(f"{sayi} oda '{durum}' yapıldı"))
+
+    def secilenleri_check_out(self):
+        """Seçili çıkışları tek işlemde check-out yapar."""
+        rez_idler = [int(iid) for iid in self.cikis_tree.selection()]
+        if not rez_idler: messagebox.showwarning("Uyarı", "Listeden en az bir çıkış seçin.", parent=self); return
+        if not messagebox.askyesno("Check-Out Onayı", f"{len(rez_idler)} rezervasyon check-out yapılacak:\n"
+                                   f"  - Ödemeler 'Tamamı Ödendi' olacak.\n  - Odalar 'Kirli' olacak.\n\nOnaylıyor musunuz?", parent=self): return
+        self._check_out_calistir(toplu_check_out, rez_idler)
+
+    def tumunu_check_out(self):
+        """Seçilen günün tüm çıkışlarını tek işlemde check-out yapar."""
+        tarih_gosterim = tarihi_cevir(self.tarih_sql, hedef_format="%d.%m.%Y")
+        if not messagebox.askyesno("Check-Out Onayı", f"{tarih_gosterim} tarihinde çıkışı olan TÜM rezervasyonlar check-out yapılacak.\n\n"
+                                   f"Onaylıyor musunuz?", parent=self): return
+        self._check_out_calistir(gunun_cikislarini_yap, self.tarih_sql)
+
+    def _check_out_calistir(self, fonksiyon, *args):
+        """Yardımcı: Toplu check-out fonksiyonunu arka planda çalıştırır."""
+        def basarisiz(e):
+            if self.winfo_exists(): messagebox.showerror("Hata", f"Toplu check-out sırasında hata oluştu:\n{e}", parent=self)
+        self.ana_uygulama.isci.calistir(fonksiyon, *args, hata=basarisiz,
+                                        basarili=lambda odalar: self._toplu_islem_bitti(f"{len(odalar)} oda check-out yapıldı", rezervasyonlar_degisti=True))
 
 # --- ANA UYGULAMA SINIFI ---
 class OtelRezervasyonSistemi:
@@ -296,11 +865,25 @@ class OtelRezervasyonSistemi:
         
         self.guncellenen_kayit_id = None 
         self.guncellenen_oda_no = None 
+        self.tanilama_paneli = None # Modal olmayan tanılama penceresi (açıksa)
+        # Sanal liste durumu: Treeview yalnızca görünen bölge ve çevresindeki birkaç sayfayı tutar
+        self.satir_anahtarlari = {} # Treeview iid -> (giris_tarihi, id) sayfalama anahtarı
+        self.sayfali_mod = False # Arama sonuçları gösterilirken sayfalama kapalıdır
+        self.son_arama = "" # Arama modundaki listenin metni
+        self.arama_onbellegi = AramaOnbellegi() # Yazarken arama sonuçları (bkz. canli_arama)
+        self._canli_arama_zamanlayici = None
+        self._istenen_arama = "" # Kutudaki en son aranan metin (sonucu henüz gelmemiş olabilir)
+        self.onceki_var = self.sonraki_var = False
+        self._pencere_kontrolu_bekliyor = False
         self.ODEME_DURUMLARI = ["Ödenmedi", "Kapora Alındı", "Tamamı Ödendi"]
         self.entry_vars = {} 
+        # Veritabanı çağrıları arka planda çalışır, sonuçlar after() ile arayüze döner
+        self.isci = ArkaplanIscisi(master, mesgul_degisti=self._mesgul_goster)
+        master.protocol("WM_DELETE_WINDOW", self.kapat)
         
         try:
             self._arayuzu_olustur() # Arayüzü oluştur
+            self.refresh_oda_tipleri_combobox() # Oda tiplerini yükle
             self.rezervasyonlari_goster() # İlk açılışta listeyi doldur
         except Exception as e:
              # Arayüz veya ilk veri yükleme hatası
@@ -326,38 +909,48 @@ class OtelRezervasyonSistemi:
             else: # Müşteri Adı (Entry) ve Tarihler (Entry)
                 widget = tk.Entry(self.form_frame, width=30, font=('Arial', 10), textvariable=var)
             widget.grid(row=i, column=1, pady=5, padx=5); self.entry_dict[etiket_text] = widget; self.entry_vars[etiket_text] = var 
-        self.refresh_oda_tipleri_combobox() # Oda tiplerini yükle
         
         # Form Butonları
         self.form_buton_frame = tk.Frame(self.form_frame); self.form_buton_frame.grid(row=len(self.etiketler), column=0, columnspan=2, pady=10)
         self.rez_buton = tk.Button(self.form_buton_frame, text="Rezervasyon Yap/Güncelle", command=self.rezervasyon_yap, bg="#4CAF50", fg="white", font=('Arial', 10, 'bold'), width=25); self.rez_buton.pack(side=tk.LEFT, padx=5)
         self.form_temizle_buton = tk.Button(self.form_buton_frame, text="Temizle", command=self.temizle_form, font=('Arial', 10), width=10); self.form_temizle_buton.pack(side=tk.LEFT, padx=5)
+        tk.Button(self.form_buton_frame, text="Müsaitlik", command=self.musaitlik_goster, font=('Arial', 10), width=10).pack(side=tk.LEFT, padx=5)
         
         # --- Arama Çubuğu ---
         self.arama_frame = tk.Frame(self.master, padx=10, pady=5); self.arama_frame.pack(padx=10, pady=5, fill=tk.X)
         tk.Label(self.arama_frame, text="Arama (Ad/Tip/Oda No/Ödeme):", font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
         self.arama_entry = tk.Entry(self.arama_frame, width=25, font=('Arial', 10)); self.arama_entry.pack(side=tk.LEFT, padx=5)
+        self.arama_entry.bind('<KeyRelease>', self._arama_yazildi)
         tk.Button(self.arama_frame, text="Ara", command=self.arama_yap, font=('Arial', 10), bg="#007bff", fg="white").pack(side=tk.LEFT, padx=5)
         tk.Button(self.arama_frame, text="Aramayı Temizle", command=self.temizle_arama, font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        self.canli_arama_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(self.arama_frame, text="Yazarken ara", variable=self.canli_arama_var, font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
         
         # --- Rezervasyon Listesi (Treeview) ---
         self.list_frame = tk.Frame(self.master); self.list_frame.pack(padx=10, pady=10, fill="both", expand=True)
         self.sutunlar = ("ID", "Müşteri Adı", "Oda Tipi", "Oda No", "Giriş Tarihi", 
                          "Çıkış Tarihi", "Toplam Fiyat", "Ödeme Durumu")
         self.tree = ttk.Treeview(self.list_frame, columns=self.sutunlar, show="headings")
+        self.esitleyici = TreeviewEsitleyici(self.tree) # Yenilemede yalnızca değişen satırlar güncellenir
         self._treeview_kolon_ayarla() # Kolonları ayarla
         self._treeview_renk_ayarla() # Renkleri tanımla
         self.tree.pack(side="left", fill="both", expand=True)
-        vsb = ttk.Scrollbar(self.list_frame, orient="vertical", command=self.tree.yview); vsb.pack(side='right', fill='y')
-        self.tree.configure(yscrollcommand=vsb.set)
+        self.vsb = ttk.Scrollbar(self.list_frame, orient="vertical", command=self.tree.yview); self.vsb.pack(side='right', fill='y')
+        self.tree.configure(yscrollcommand=self._kaydirma_bildirimi) # Kaydırdıkça yeni sayfalar yüklenir
         self.tree.bind('<ButtonRelease-1>', self.kaydi_forma_yukle) # Seçince forma yükle
         
         # --- Alt Kontrol Butonları ---
         self.buton_frame = tk.Frame(self.master); self.buton_frame.pack(pady=10)
         tk.Button(self.buton_frame, text="Oda Yönetimi", command=self.oda_yonetim_panelini_ac, bg="#607D8B", fg="white", font=('Arial', 10, 'bold'), width=20).pack(side=tk.LEFT, padx=5)
         tk.Button(self.buton_frame, text="Oda Durum Paneli", command=self.oda_panelini_ac, bg="#1E90FF", fg="white", font=('Arial', 10, 'bold'), width=20).pack(side=tk.LEFT, padx=5)
+        tk.Button(self.buton_frame, text="Kat Hizmetleri", command=self.kat_hizmetleri_panelini_ac, bg="#8D6E63", fg="white", font=('Arial', 10, 'bold'), width=14).pack(side=tk.LEFT, padx=5)
+        tk.Button(self.buton_frame, text="Takvim", command=self.takvim_panelini_ac, bg="#3F51B5", fg="white", font=('Arial', 10, 'bold'), width=12).pack(side=tk.LEFT, padx=5)
+        tk.Button(self.buton_frame, text="Raporlar", command=self.rapor_panelini_ac, bg="#009688", fg="white", font=('Arial', 10, 'bold'), width=12).pack(side=tk.LEFT, padx=5)
+        tk.Button(self.buton_frame, text="Tanılama", command=self.tanilama_panelini_ac, bg="#795548", fg="white", font=('Arial', 10, 'bold'), width=12).pack(side=tk.LEFT, padx=5)
         tk.Button(self.buton_frame, text="Seçili Kaydı Check-Out Yap", command=self.check_out_yap, bg="#FF9800", fg="white", font=('Arial', 10, 'bold'), width=25).pack(side=tk.LEFT, padx=5)
         tk.Button(self.buton_frame, text="Seçili Rezervasyonu SİL", command=self.sil_secili_rezervasyon, bg="#D32F2F", fg="white", font=('Arial', 10, 'bold'), width=25).pack(side=tk.LEFT, padx=5) 
+        # Meşgul göstergesi (arka planda veritabanı işi varken)
+        self.durum_label = tk.Label(self.master, text="", fg="#607D8B", font=('Arial', 9, 'italic')); self.durum_label.pack(pady=(0, 5))
 
     def _treeview_kolon_ayarla(self):
         """Ana Treeview kolon başlıklarını ve genişliklerini ayarlar."""
@@ -373,48 +966,134 @@ class OtelRezervasyonSistemi:
         self.tree.tag_configure('kapora', background='#fff9c4')  # Sarı
         self.tree.tag_configure('odendi', background='#c8e6c9')   # Yeşil
         
-    def _guncelle_rezervasyon_listesi(self, rezervasyon_listesi):
-        """Treeview'ı verilen rezervasyon listesiyle günceller (DRY)."""
-        self.tree.delete(*self.tree.get_children()) # Mevcut listeyi temizle
-        if not rezervasyon_listesi: return # Boşsa çık
-            
-        for kayit in rezervasyon_listesi:
-            # (id, musteri_adi, tip, oda_no, giris, cikis, fiyat, odeme_durumu)
+    def _satir_degerleri(self, kayit):
+        """Bir rezervasyon kaydını (kayitlar.Rezervasyon) Treeview'da gösterilecek değerlere ve renk tag'ına çevirir."""
+        return kayit.gosterim(), self.odeme_durumu_tagi(kayit.odeme_durumu)
+
+    def _satirlari_hazirla(self, kayitlar):
+        """Kayıtları (iid, degerler, tag) satırlarına çevirir; iid olarak rezervasyon ID'si kullanılır."""
+        satirlar = []
+        for kayit in kayitlar:
             try:
-                giris_gosterim = tarihi_cevir(kayit[4], hedef_format="%d.%m.%Y")
-                cikis_gosterim = tarihi_cevir(kayit[5], hedef_format="%d.%m.%Y")
-                fiyat_gosterim = f"{kayit[6]:,.2f} TL"
-                odeme_durumu = kayit[7]
-                
-                # Sadece görünür sütunları al (veritabanından gelen sırayla eşleşmeli)
-                gosterilecek_kayit = (kayit[0], kayit[1], kayit[2], kayit[3], 
-                                      giris_gosterim, cikis_gosterim, 
-                                      fiyat_gosterim, odeme_durumu)
-                                      
-                tag = self.odeme_durumu_tagi(odeme_durumu)
-                self.tree.insert("", tk.END, values=gosterilecek_kayit, tags=(tag,))
+                degerler, tag = self._satir_degerleri(kayit)
+                satirlar.append((str(kayit.id), degerler, tag))
             except IndexError:
                 print(f"Hatalı rezervasyon verisi (IndexError): {kayit}") # Hata ayıklama
             except Exception as e:
                 print(f"Liste güncellenirken hata: {e} - Kayıt: {kayit}") # Hata ayıklama
+        return satirlar
+
+    def _satirlari_ekle(self, kayitlar, konum=tk.END):
+        """Kayıtları Treeview'ın sonuna (veya başına, konum=0) ekler."""
+        self.esitleyici.ekle(self._satirlari_hazirla(kayitlar), konum)
+        for kayit in kayitlar: self.satir_anahtarlari[str(kayit.id)] = (kayit.giris_tarihi, kayit.id)
+
+    def _guncelle_rezervasyon_listesi(self, rezervasyon_listesi):
+        """Treeview'ı verilen rezervasyon listesine eşitler; yalnızca farklı olan satırlar değişir."""
+        self.esitleyici.esitle(self._satirlari_hazirla(rezervasyon_listesi))
+        self.satir_anahtarlari = {str(kayit.id): (kayit.giris_tarihi, kayit.id) for kayit in rezervasyon_listesi}
+
+    # --- Sanal Liste (Sayfalı Yükleme) ---
+    def _kaydirma_bildirimi(self, ilk, son):
+        """Treeview kaydırıldığında çağrılır: kaydırma çubuğunu günceller, pencere ucuna yaklaşıldıysa sayfa yükletir."""
+        self.vsb.set(ilk, son)
+        if not self.sayfali_mod or self._pencere_kontrolu_bekliyor: return
+        toplam = len(self.tree.get_children())
+        kalan_ust, kalan_alt = float(ilk) * toplam, (1 - float(son)) * toplam
+        if (self.sonraki_var and kalan_alt < SAYFA_BOYUTU / 2) or (self.onceki_var and kalan_ust < SAYFA_BOYUTU / 2):
+            # Treeview çizim sırasında değiştirilmesin, boşta kalınca yükle
+            self._pencere_kontrolu_bekliyor = True
+            self.master.after_idle(self._pencereyi_kaydir)
+
+    def _pencereyi_kaydir(self):
+        """Görünen bölgenin altına/üstüne eklenecek sayfayı arka planda çektirir."""
+        cocuklar = self.tree.get_children()
+        if not cocuklar: self._pencere_kontrolu_bekliyor = False; return
+        son = self.tree.yview()[1]
+        sona_dogru = self.sonraki_var and (1 - son) * len(cocuklar) < SAYFA_BOYUTU / 2
+        kenar = cocuklar[-1] if sona_dogru else cocuklar[0] # Sayfanın komşu olacağı satır
+        def basarisiz(e):
+            self._pencere_kontrolu_bekliyor = False
+            messagebox.showerror("Hata", f"Rezervasyonlar çekilirken hata oluştu:\n{e}")
+        self.isci.calistir(rezervasyon_sayfasi_cek, self.satir_anahtarlari[kenar], SAYFA_BOYUTU, not sona_dogru,
+                           anahtar='sayfa', hata=basarisiz, basarili=lambda sayfa: self._sayfayi_yerlestir(sayfa, sona_dogru, kenar))
+
+    def _sayfayi_yerlestir(self, sayfa, sona_dogru, kenar):
+        """Çekilen sayfayı pencereye ekler, pencere büyüdüyse karşı uçtaki satırları atar."""
+        self._pencere_kontrolu_bekliyor = False
+        cocuklar = self.tree.get_children()
+        if not self.sayfali_mod or not cocuklar or kenar != (cocuklar[-1] if sona_dogru else cocuklar[0]):
+            return # Bu arada liste yenilendi; sayfa artık bu pencereye ait değil
+        ust_satir = cocuklar[min(int(self.tree.yview()[0] * len(cocuklar)), len(cocuklar) - 1)] # Ekranın en üstündeki satır
+        if sona_dogru:
+            self.sonraki_var = len(sayfa) == SAYFA_BOYUTU
+            self._satirlari_ekle(sayfa)
+        else:
+            self.onceki_var = len(sayfa) == SAYFA_BOYUTU
+            self._satirlari_ekle(sayfa, konum=0)
+
+        # Pencere sınırı aşıldıysa karşı uçtan at (bellekte ve Treeview'da sabit sayıda satır kalır)
+        cocuklar = self.tree.get_children()
+        fazla = len(cocuklar) - SAYFA_BOYUTU * PENCERE_SAYFA_SAYISI
+        if fazla > 0:
+            atilacaklar = cocuklar[:fazla] if sona_dogru else cocuklar[-fazla:]
+            self.esitleyici.sil(atilacaklar)
+            for iid in atilacaklar: self.satir_anahtarlari.pop(iid, None)
+            if sona_dogru: self.onceki_var = True
+            else: self.sonraki_var = True
+        # Kullanıcının baktığı satır ekranda aynı yerde kalsın
+        if self.tree.exists(ust_satir):
+            self.tree.yview_moveto(self.tree.index(ust_satir) / max(len(self.tree.get_children()), 1))
+
+    # --- Arka Plan İşleri ---
+    def _mesgul_goster(self, mesgul):
+        """Arka planda veritabanı işi varken durum yazısını ve imleci günceller."""
+        self.durum_label.config(text="Veritabanı işlemi sürüyor..." if mesgul else "")
+        self.master.config(cursor="watch" if mesgul else "")
+
+    def kapat(self):
+        """Bekleyen arka plan işlerini iptal edip pencereyi kapatır."""
+        self._canli_aramayi_durdur()
+        self.isci.kapat()
+        self.master.destroy()
 
     # --- Panel Açma Fonksiyonları ---
     def oda_yonetim_panelini_ac(self): 
         try: OdaYonetimPaneli(self.master, self).wait_window() 
         except Exception as e: messagebox.showerror("Panel Hatası", f"Oda Yönetim Paneli açılamadı:\n{e}")
     def oda_panelini_ac(self): 
-        try: OdaDurumPaneli(self.master).wait_window() 
+        try: OdaDurumPaneli(self.master, self).wait_window() 
         except Exception as e: messagebox.showerror("Panel Hatası", f"Oda Durum Paneli açılamadı:\n{e}")
+
+    def kat_hizmetleri_panelini_ac(self):
+        try: KatHizmetleriPaneli(self.master, self).wait_window()
+        except Exception as e: messagebox.showerror("Panel Hatası", f"Kat Hizmetleri Paneli açılamadı:\n{e}")
+
+    def takvim_panelini_ac(self):
+        try: TakvimPaneli(self.master, self).wait_window()
+        except Exception as e: messagebox.showerror("Panel Hatası", f"Takvim Paneli açılamadı:\n{e}")
+
+    def rapor_panelini_ac(self):
+        try: RaporPaneli(self.master, self).wait_window()
+        except Exception as e: messagebox.showerror("Panel Hatası", f"Rapor Paneli açılamadı:\n{e}")
+
+    def tanilama_panelini_ac(self):
+        """Tanılama penceresi modal değildir (uygulama kullanılırken izlenir); açıksa öne getirilir."""
+        if self.tanilama_paneli is not None and self.tanilama_paneli.winfo_exists():
+            self.tanilama_paneli.lift(); return
+        try: self.tanilama_paneli = TanilamaPaneli(self.master)
+        except Exception as e: messagebox.showerror("Panel Hatası", f"Tanılama Paneli açılamadı:\n{e}")
         
     # --- ComboBox Yenileme ---
     def refresh_oda_tipleri_combobox(self):
-        """Oda Tipi ComboBox'ını günceller."""
-        try: 
+        """Oda Tipi ComboBox'ını (arka planda çekerek) günceller."""
+        def tamamlandi(tipler):
             mevcut_deger = self.entry_vars.get("Oda Tipi:", tk.StringVar()).get() # Daha güvenli alma
-            self.oda_tipi_combobox['values'] = oda_tiplerini_cek()
-            if mevcut_deger in self.oda_tipi_combobox['values']: self.entry_vars["Oda Tipi:"].set(mevcut_deger)
+            self.oda_tipi_combobox['values'] = tipler
+            if mevcut_deger in tipler: self.entry_vars["Oda Tipi:"].set(mevcut_deger)
             else: self.entry_vars["Oda Tipi:"].set("") # Eşleşmiyorsa temizle
-        except Exception as e: messagebox.showerror("Hata", f"Oda tipleri yenilenemedi:\n{e}")
+        self.isci.calistir(oda_tiplerini_cek, anahtar='oda_tipleri', basarili=tamamlandi,
+                           hata=lambda e: messagebox.showerror("Hata", f"Oda tipleri yenilenemedi:\n{e}"))
 
     # --- Yardımcı Fonksiyonlar ---
     def odeme_durumu_tagi(self, durum):
@@ -492,79 +1171,170 @@ class OtelRezervasyonSistemi:
         if giris_dt >= cikis_dt:
             messagebox.showerror("Hata", "Çıkış tarihi, giriş tarihinden sonra olmalıdır.")
             return
-            
-        # Fiyatı hesapla
-        try:
-            gunluk_fiyat = fiyat_getir(oda_tipi)
-            if gunluk_fiyat <= 0: raise ValueError # Fiyat alınamadı veya 0
-        except Exception:
-            messagebox.showerror("Hata", f"'{oda_tipi}' için fiyat bilgisi alınamadı.\nLütfen Oda Yönetimi panelinden kontrol edin.", parent=self.master)
+        if not konaklama_tarihleri_gecerli_mi(giris_sql, cikis_sql):
+            messagebox.showerror("Hata", TARIH_ARALIGI_HATASI)
             return
-        gun_sayisi = (cikis_dt - giris_dt).days
-        toplam_fiyat = gun_sayisi * gunluk_fiyat
-        if toplam_fiyat <= 0:
-             messagebox.showerror("Hata", f"Geçersiz gün sayısı veya fiyat nedeniyle tutar hesaplanamadı.")
-             return
-             
-        # Veritabanı işlemi (Ekleme veya Güncelleme)
-        try:
-            if self.guncellenen_kayit_id is None: # Yeni Kayıt
-                atanan_oda = musait_oda_bul(oda_tipi, giris_sql, cikis_sql)
-                if atanan_oda is None:
-                    messagebox.showerror("Dolu!", f"Maalesef '{oda_tipi}' tipinde, belirtilen tarihler arasında TEMİZ ve BOŞ oda bulunamadı.")
-                    return
-                rezervasyon_ekle(ad, atanan_oda, giris_sql, cikis_sql, toplam_fiyat, odeme_durumu)
-                messagebox.showinfo("Başarılı", f"Rezervasyon yapıldı!\nOda No: {atanan_oda}\nTutar: {toplam_fiyat:,.2f} TL")
-            else: # Güncelleme
-                # Oda tipi değiştiyse yeni boş oda bulmaya çalış
-                secili_kayit_values = self.tree.item(self.tree.selection()[0], 'values')
-                mevcut_oda_tipi = secili_kayit_values[2]
-                atanacak_oda_no = self.guncellenen_oda_no # Varsayılan olarak mevcut odayı koru
-                
-                if oda_tipi != mevcut_oda_tipi: # Oda tipi değiştiyse
-                    yeni_atanan_oda = musait_oda_bul(oda_tipi, giris_sql, cikis_sql)
-                    if yeni_atanan_oda is None:
-                        messagebox.showerror("Dolu!", f"Maalesef yeni seçilen '{oda_tipi}' tipinde boş/temiz oda bulunamadı.")
-                        return
-                    atanacak_oda_no = yeni_atanan_oda # Yeni odayı ata
-                else: # Oda tipi aynı, sadece tarihler değişmiş olabilir
-                    # Mevcut odanın yeni tarihlerde (kendisi hariç) müsaitliğini kontrol et
-                    if not oda_musait_mi(self.guncellenen_oda_no, giris_sql, cikis_sql, self.guncellenen_kayit_id):
-                        messagebox.showerror("Çakışma!", f"Oda {self.guncellenen_oda_no} seçtiğiniz yeni tarihlerde başka bir rezervasyonla çakışıyor.")
-                        return
-                    # Oda numarası aynı kalacak (atanacak_oda_no)
-                
-                rezervasyon_guncelle(self.guncellenen_kayit_id, ad, atanacak_oda_no, giris_sql, cikis_sql, toplam_fiyat, odeme_durumu)
-                messagebox.showinfo("Başarılı", f"Rezervasyon ID: {self.guncellenen_kayit_id} başarıyla güncellendi.\nAtanan Oda No: {atanacak_oda_no}")
             
+        # Güncellemede oda tipinin değişip değişmediğini anlamak için seçili satırın tipi
+        mevcut_oda_tipi = oda_tipi
+        if self.guncellenen_kayit_id is not None and self.tree.selection():
+            mevcut_oda_tipi = self.tree.item(self.tree.selection()[0], 'values')[2]
+
+        # Veritabanı işlemi (Ekleme veya Güncelleme) arka planda; bitene kadar buton kapalı
+        def tamamlandi(sonuc):
+            self.rez_buton.config(state=tk.NORMAL)
+            basarili_mi, baslik, mesaj = sonuc
+            if not basarili_mi: messagebox.showerror(baslik, mesaj); return
+            messagebox.showinfo(baslik, mesaj)
             # İşlem başarılıysa formu temizle ve listeyi yenile
             self.temizle_form()
-            self.rezervasyonlari_goster()
-            
-        except Exception as e:
+            self.listeyi_yenile()
+        def basarisiz(e):
+            self.rez_buton.config(state=tk.NORMAL)
             messagebox.showerror("Veritabanı Hatası", f"Rezervasyon kaydedilirken/güncellenirken bir hata oluştu:\n{e}")
+        self.rez_buton.config(state=tk.DISABLED)
+        self.isci.calistir(self._rezervasyonu_kaydet, self.guncellenen_kayit_id, self.guncellenen_oda_no, mevcut_oda_tipi,
+                           ad, oda_tipi, giris_sql, cikis_sql, odeme_durumu,
+                           basarili=tamamlandi, hata=basarisiz)
+
+    def _rezervasyonu_kaydet(self, kayit_id, oda_no, mevcut_oda_tipi, ad, oda_tipi, giris_sql, cikis_sql, odeme_durumu):
+        """
+        Arka plan thread'inde çalışır (arayüze dokunmaz): fiyatı hesaplar, rezervasyonu ekler veya
+        günceller. (başarılı_mı, mesaj başlığı, mesaj) döndürür.
+        """
+        # Fiyatı hesapla (fiyat planları, hafta sonu fiyatı ve uzun konaklama indirimi dahil)
+        toplam_fiyat = konaklama_fiyati(oda_tipi, giris_sql, cikis_sql)
+        if not toplam_fiyat or toplam_fiyat <= 0: # Fiyat alınamadı veya 0
+            return False, "Hata", f"'{oda_tipi}' için fiyat bilgisi alınamadı.\nLütfen Oda Yönetimi panelinden kontrol edin."
+
+        if kayit_id is None: # Yeni Kayıt
+            # Oda seçimi ve ekleme tek işlemde yapılır (aynı odanın iki kez satılmasını önler)
+            sonuc = rezervasyon_yap_atomik(oda_tipi, giris_sql, cikis_sql, ad, toplam_fiyat, odeme_durumu)
+            if sonuc is None:
+                return False, "Dolu!", f"Maalesef '{oda_tipi}' tipinde, belirtilen tarihler arasında TEMİZ ve BOŞ oda bulunamadı."
+            rez_id, atanan_oda = sonuc
+            return True, "Başarılı", f"Rezervasyon yapıldı!\nRezervasyon ID: {rez_id}\nOda No: {atanan_oda}\nTutar: {toplam_fiyat:,.2f} TL"
+
+        # Güncelleme
+        atanacak_oda_no = oda_no # Varsayılan olarak mevcut odayı koru
+        if oda_tipi != mevcut_oda_tipi: # Oda tipi değiştiyse yeni boş oda bulmaya çalış
+            atanacak_oda_no = musait_oda_bul(oda_tipi, giris_sql, cikis_sql)
+            if atanacak_oda_no is None:
+                return False, "Dolu!", f"Maalesef yeni seçilen '{oda_tipi}' tipinde boş/temiz oda bulunamadı."
+        # Oda tipi aynı, sadece tarihler değişmiş olabilir: mevcut odanın yeni tarihlerde (kendisi hariç) müsaitliği
+        elif not oda_musait_mi(oda_no, giris_sql, cikis_sql, kayit_id):
+            return False, "Çakışma!", f"Oda {oda_no} seçtiğiniz yeni tarihlerde başka bir rezervasyonla çakışıyor."
+        rezervasyon_guncelle(kayit_id, ad, atanacak_oda_no, giris_sql, cikis_sql, toplam_fiyat, odeme_durumu)
+        return True, "Başarılı", f"Rezervasyon ID: {kayit_id} başarıyla güncellendi.\nAtanan Oda No: {atanacak_oda_no}"
+
+    def musaitlik_goster(self):
+        """Formdaki tarihler için tüm oda tiplerinin boş/temiz oda sayısını ve en düşük fiyatını gösterir."""
+        giris_str = self.entry_vars["Giriş Tarihi (GG/AA/YYYY):"].get()
+        cikis_str = self.entry_vars["Çıkış Tarihi (GG/AA/YYYY):"].get()
+        try:
+            giris_sql = datetime.strptime(giris_str, "%d/%m/%Y").strftime("%Y-%m-%d")
+            cikis_sql = datetime.strptime(cikis_str, "%d/%m/%Y").strftime("%Y-%m-%d")
+        except ValueError:
+            messagebox.showerror("Hata", "Müsaitlik için giriş ve çıkış tarihlerini GG/AA/YYYY formatında giriniz.")
+            return
+        if giris_sql >= cikis_sql:
+            messagebox.showerror("Hata", "Çıkış tarihi, giriş tarihinden sonra olmalıdır.")
+            return
+        def tamamlandi(ozet):
+            if not ozet:
+                messagebox.showinfo("Müsaitlik", "Oda bilgisi alınamadı."); return
+            satirlar = [f"{tip}: {len(bos)}/{toplam} boş" + (f", {fiyat:,.0f} TL'den" if fiyat is not None else "")
+                        for tip, toplam, bos, fiyat in ozet]
+            messagebox.showinfo("Müsaitlik", f"{giris_str} - {cikis_str}\n\n" + "\n".join(satirlar))
+        self.isci.calistir(musaitlik_ozeti, giris_sql, cikis_sql, basarili=tamamlandi, anahtar='musaitlik')
 
     # --- Liste Güncelleme / Arama ---
+    def _liste_hatasi(self, e):
+        """Yardımcı: Liste verisi çekilemediğinde kullanıcıya bildirir."""
+        messagebox.showerror("Hata", f"Rezervasyonlar çekilirken hata oluştu:\n{e}")
+
     def rezervasyonlari_goster(self):
-        """Tüm rezervasyonları veritabanından çeker ve listeler."""
-        try: liste = rezervasyonlari_cek()
-        except Exception as e: 
-            messagebox.showerror("Hata", f"Rezervasyonlar çekilirken hata oluştu:\n{e}"); return
-        self._guncelle_rezervasyon_listesi(liste)
+        """Rezervasyonları baştan itibaren sayfalı olarak listeler (kaydırdıkça devamı yüklenir)."""
+        def tamamlandi(sayfa):
+            self._guncelle_rezervasyon_listesi(sayfa)
+            self.sayfali_mod, self.onceki_var = True, False
+            self.sonraki_var = len(sayfa) == SAYFA_BOYUTU * 2
+            self.tree.yview_moveto(0)
+        # Aynı anahtar: listeyi dolduran isteklerden yalnızca en sonuncusu uygulanır
+        self.isci.calistir(rezervasyon_sayfasi_cek, None, SAYFA_BOYUTU * 2, anahtar='liste', basarili=tamamlandi, hata=self._liste_hatasi)
+
+    def listeyi_yenile(self):
+        """Bir kayıt değiştikten sonra ekrandaki bölümü (veya son aramayı) yeniden çeker; yalnızca farklar uygulanır."""
+        self.arama_onbellegi.temizle() # Önbellekteki arama sonuçları artık eski
+        if self.sayfali_mod:
+            # Pencerenin ilk satırından itibaren aynı sayıda kaydı tekrar çek (kaydırma konumu bozulmaz)
+            cocuklar = self.tree.get_children()
+            ilk_anahtar = self.satir_anahtarlari.get(cocuklar[0]) if cocuklar and self.onceki_var else None
+            adet = max(len(cocuklar), SAYFA_BOYUTU * 2)
+            def tamamlandi(liste):
+                self.sonraki_var = len(liste) == adet
+                self._guncelle_rezervasyon_listesi(liste)
+            self.isci.calistir(lambda: rezervasyon_sayfasi_cek(ilk_anahtar, adet, dahil=True),
+                               anahtar='liste', basarili=tamamlandi, hata=self._liste_hatasi)
+        else:
+            self.isci.calistir(rezervasyon_ara, self.son_arama, anahtar='liste',
+                               basarili=self._guncelle_rezervasyon_listesi, hata=self._liste_hatasi)
 
     def arama_yap(self):
         """Genel arama kutusundaki metne göre arama yapar ve listeyi günceller."""
-        arama_metni = self.arama_entry.get().strip()
+        self._canli_aramayi_durdur()
+        arama_metni = self._istenen_arama = self.arama_entry.get().strip()
         if not arama_metni: # Boşsa tümünü göster
             self.rezervasyonlari_goster(); return 
-        try: liste = rezervasyon_ara(arama_metni)
-        except Exception as e: 
-            messagebox.showerror("Hata", f"Arama yapılırken hata oluştu:\n{e}"); return
-        self._guncelle_rezervasyon_listesi(liste)
-        if not liste: messagebox.showinfo("Sonuç Yok", f"'{arama_metni}' ile eşleşen kayıt bulunamadı.")
+        self._ara(arama_metni)
+
+    def _canli_aramayi_durdur(self):
+        """Yardımcı: Ertelenmiş canlı aramayı iptal eder."""
+        if self._canli_arama_zamanlayici is not None:
+            self.master.after_cancel(self._canli_arama_zamanlayici); self._canli_arama_zamanlayici = None
+
+    def _arama_yazildi(self, event=None):
+        """Arama kutusuna yazıldıkça (yazarken arama açıksa) aramayı son tuştan CANLI_ARAMA_GECIKMESI sonraya erteler."""
+        if not self.canli_arama_var.get(): return
+        self._canli_aramayi_durdur()
+        self._canli_arama_zamanlayici = self.master.after(CANLI_ARAMA_GECIKMESI, self._canli_ara)
+
+    def _canli_ara(self):
+        """Yazma durduktan sonra kutudaki metni arar; metin değişmediyse (örn. ok tuşları) bir şey yapmaz."""
+        self._canli_arama_zamanlayici = None
+        arama_metni = self.arama_entry.get().strip()
+        if arama_metni == self._istenen_arama: return
+        self._istenen_arama = arama_metni
+        if not arama_metni: self.rezervasyonlari_goster(); return
+        self._ara(arama_metni, canli=True)
+
+    def _ara(self, arama_metni, canli=False):
+        """
+        Yardımcı: Aramayı yapar ve listeyi günceller. Canlı aramada sonuç önce önbellekte aranır (daha geniş
+        bir aramanın sonucundan süzülebilir) ve sonuç yoksa mesaj gösterilmez. "Ara" butonu her zaman
+        veritabanına gider.
+        """
+        def goster(liste):
+            self.sayfali_mod = False # Arama sonuçları sınırlı sayıda, tamamı gösterilir
+            self.son_arama = arama_metni # Kayıt değişince aynı arama tekrarlanır
+            self._guncelle_rezervasyon_listesi(liste)
+            if not liste and not canli: messagebox.showinfo("Sonuç Yok", f"'{arama_metni}' ile eşleşen kayıt bulunamadı.")
+        onbellekte = self.arama_onbellegi.bul(arama_metni) if canli else None
+        if onbellekte is not None:
+            self.isci.iptal('liste') # Sürmekte olan eski arama sonradan listeyi ezmesin
+            goster(onbellekte); return
+        def tamamlandi(sonuc):
+            liste, kelime_aramasi = sonuc
+            # Süzme FTS5'in kelime öneki kuralını uygular; LIKE ile bulunan sonuçlar önbelleğe girmez
+            if kelime_aramasi: self.arama_onbellegi.ekle(arama_metni, liste, len(liste) < ARAMA_SONUC_LIMITI)
+            goster(liste)
+        # Art arda yapılan aramalarda yalnızca son aramanın sonucu gösterilir
+        self.isci.calistir(rezervasyon_ara, arama_metni, False, True, anahtar='liste', basarili=tamamlandi,
+                           hata=lambda e: messagebox.showerror("Hata", f"Arama yapılırken hata oluştu:\n{e}"))
 
     def temizle_arama(self):
         """Arama kutusunu temizler ve tüm rezervasyonları gösterir."""
+        self._canli_aramayi_durdur(); self._istenen_arama = ""
         self.arama_entry.delete(0, tk.END)
         self.rezervasyonlari_goster() # Tüm listeyi tekrar göster
 
@@ -574,17 +1344,17 @@ class OtelRezervasyonSistemi:
         secili_kayit = self.tree.selection()
         if not secili_kayit: messagebox.showwarning("Uyarı", "Silmek için listeden bir rezervasyon seçin."); return
         onay = messagebox.askyesno("Onay", "Seçili rezervasyonu silmek istediğinizden emin misiniz?")
-        if onay: 
-            try:
-                secili_değerler = self.tree.item(secili_kayit[0])['values']
-                rez_id = int(secili_değerler[0]) 
-                rezervasyon_sil(rez_id)
-                messagebox.showinfo("Başarılı", f"Rezervasyon ID: {rez_id} başarıyla silindi.")
-                self.rezervasyonlari_goster(); self.temizle_form()
-            except (ValueError, IndexError):
-                 messagebox.showerror("Hata", "Kayıt ID'si okunamadı.")
-            except Exception as e: 
-                messagebox.showerror("Hata", f"Silme işlemi sırasında hata oluştu:\n{e}")
+        if not onay: return
+        try:
+            secili_değerler = self.tree.item(secili_kayit[0])['values']
+            rez_id = int(secili_değerler[0]) 
+        except (ValueError, IndexError):
+            messagebox.showerror("Hata", "Kayıt ID'si okunamadı."); return
+        def tamamlandi(_):
+            messagebox.showinfo("Başarılı", f"Rezervasyon ID: {rez_id} başarıyla silindi.")
+            self.listeyi_yenile(); self.temizle_form()
+        self.isci.calistir(rezervasyon_sil, rez_id, basarili=tamamlandi,
+                           hata=lambda e: messagebox.showerror("Hata", f"Silme işlemi sırasında hata oluştu:\n{e}"))
 
     def check_out_yap(self):
         """Seçili rezervasyon için check-out işlemini yapar."""
@@ -609,19 +1379,22 @@ class OtelRezervasyonSistemi:
         
         if not onay: return
         
-        try: 
-            check_out_yap(rez_id, oda_no) # Veritabanı işlemini yap
+        def tamamlandi(_):
             messagebox.showinfo("Başarılı", f"Check-out tamamlandı.\nOda {oda_no} 'Kirli' olarak ayarlandı.", parent=self.master)
-            self.rezervasyonlari_goster(); self.temizle_form() # Listeyi yenile
-        except Exception as e: 
-            messagebox.showerror("Hata", f"Check-out işlemi sırasında hata oluştu:\n{e}", parent=self.master)
+            self.listeyi_yenile(); self.temizle_form() # Listeyi yenile
+        self.isci.calistir(check_out_yap, rez_id, oda_no, basarili=tamamlandi, # Veritabanı işlemini yap
+                           hata=lambda e: messagebox.showerror("Hata", f"Check-out işlemi sırasında hata oluştu:\n{e}", parent=self.master))
 
 # --- Uygulamayı Başlatma ---
 if __name__ == "__main__":
     root = None # Hata durumunda destroy() için
     try:
-        # Veritabanı başlatma işlemi zaten veritabani.py import edilirken yapılıyor.
         root = tk.Tk()
+        try: veritabani_baslat() # Şemayı hazırla (gerekirse geçişleri çalıştır)
+        except Exception as e:
+            root.withdraw()
+            messagebox.showerror("Veritabanı Başlatma Hatası", f"Veritabanı başlatılırken hata oluştu:\n{e}\n\nProgram kapatılacak.")
+            root.destroy(); exit()
         uygulama = OtelRezervasyonSistemi(root)
         root.mainloop()
     except Exception as e:
@@ -0,0 +1,84 @@
+"""
+Veritabanı çağrılarını Tk ana döngüsünü bloklamadan arka plan thread'lerinde çalıştırır.
+
+İşler bir thread havuzunda çalışır; sonuç (veya hata) bir kuyruğa konur, Tk tarafında
+after() ile yoklanır ve geri çağrılar her zaman ana thread'de çalıştırılır. Aynı 'anahtar'
+ile verilen işlerden yalnızca en sonuncusunun sonucu teslim edilir (örn. art arda yapılan
+aramalar): henüz başlamamış eski iş iptal edilir, başlamış olanın sonucu atılır.
+"""
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+ISCI_SAYISI = 2 # Aynı anda çalışabilecek veritabanı işi
+YOKLAMA_ARALIGI = 30 # ms; yalnızca bekleyen iş varken yoklanır
+
+class ArkaplanIscisi:
+    """Tk uygulaması için arka plan veritabanı iş yürütücüsü."""
+    def __init__(self, master, isci_sayisi=ISCI_SAYISI, mesgul_degisti=None):
+        self.master = master
+        self.mesgul_degisti = mesgul_degisti # mesgul_degisti(True/False): meşgul göstergesi için
+        self.havuz = ThreadPoolExecutor(max_workers=isci_sayisi, thread_name_prefix="veritabani")
+        self.sonuclar = queue.Queue()
+        self.bekleyen = 0 # Sonucu henüz teslim edilmemiş iş sayısı (yalnızca Tk thread'inde değişir)
+        self.son_isler = {} # anahtar -> (sira, future): o anahtarla verilen en son iş
+        self.sira = 0
+        self._yoklama = None
+
+    def calistir(self, fonksiyon, *argumanlar, basarili=None, hata=None, anahtar=None):
+        """
+        fonksiyon(*argumanlar)'ı arka planda çalıştırır. Sonuç basarili(sonuc), istisna hata(e)
+        ile Tk thread'inde bildirilir. anahtar verilirse aynı anahtarlı önceki iş geçersiz olur.
+        """
+        self.sira += 1; sira = self.sira
+        if anahtar is not None:
+            onceki = self.son_isler.get(anahtar)
+            if onceki is not None and onceki[1].cancel(): self._is_bitti() # Başlamamıştı, hiç çalışmayacak
+        def is_():
+            try: self.sonuclar.put((sira, anahtar, True, fonksiyon(*argumanlar), basarili, hata))
+            except Exception as e: self.sonuclar.put((sira, anahtar, False, e, basarili, hata))
+        self.bekleyen += 1
+        if self.bekleyen == 1: self._mesgul_bildir(True)
+        future = self.havuz.submit(is_)
+        if anahtar is not None: self.son_isler[anahtar] = (sira, future)
+        if self._yoklama is None: self._yoklama = self.master.after(YOKLAMA_ARALIGI, self._yokla)
+        return future
+
+    def iptal(self, anahtar):
+        """Anahtarla verilen son işi geçersiz kılar: başlamamışsa çalışmaz, başlamışsa sonucu atılır."""
+        onceki = self.son_isler.pop(anahtar, None)
+        if onceki is not None and onceki[1].cancel(): self._is_bitti()
+
+    def _mesgul_bildir(self, mesgul):
+        """Yardımcı: Meşgul durumu değiştiğinde geri çağrıyı çalıştırır."""
+        if self.mesgul_degisti is None: return
+        try: self.mesgul_degisti(mesgul)
+        except Exception as e: print(f"Meşgul göstergesi güncellenirken hata: {e}")
+
+    def _is_bitti(self):
+        """Yardımcı: Bekleyen iş sayısını azaltır; iş kalmadıysa meşgul göstergesini kapatır."""
+        self.bekleyen -= 1
+        if self.bekleyen == 0: self._mesgul_bildir(False)
+
+    def _yokla(self):
+        """Tamamlanan işlerin geri çağrılarını Tk thread'inde çalıştırır."""
+        self._yoklama = None
+        while True:
+            try: sira, anahtar, basarili_mi, sonuc, basarili, hata = self.sonuclar.get_nowait()
+            except queue.Empty: break
+            self._is_bitti()
+            if anahtar is not None:
+                if self.son_isler.get(anahtar, (None,))[0] != sira: continue # Yerine daha yeni bir iş verilmiş
+                del self.son_isler[anahtar]
+            geri_cagri = basarili if basarili_mi else hata
+            try:
+                if geri_cagri is not None: geri_cagri(sonuc)
+                elif not basarili_mi: print(f"Arka plan işinde hata: {sonuc}")
+            except Exception as e:
+                print(f"Arka plan işinin sonucu işlenirken hata: {e}")
+        if self.bekleyen > 0: self._yoklama = self.master.after(YOKLAMA_ARALIGI, self._yokla)
+
+    def kapat(self):
+        """Bekleyen işleri iptal eder ve havuzu kapatır (çalışan iş varsa bitmesi beklenmez)."""
+        if self._yoklama is not None:
+            self.master.after_cancel(self._yoklama); self._yoklama = None
+        self.havuz.shutdown(wait=False, cancel_futures=True)
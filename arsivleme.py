@@ -0,0 +1,155 @@
+"""
+Geçmiş rezervasyonların arşivlenmesi ve program çalışırken yedek alınması.
+
+Arşivleme: çıkışı ARSIV_AY_SINIRI aydan eski rezervasyonlar, veritabanına 'arsiv' adıyla bağlanan
+ayrı bir dosyaya (veritabani.arsiv_yolu()) taşınır. Böylece sıcak tablo ve indeksleri küçük kalır;
+müsaitlik, listeleme ve arama sorguları yıllar öncesinin satırlarını taşımaz. Taşıma
+ARSIV_PARCA_BOYUTU'luk parçalarla yapılır ve her parça iki kısa yazma işlemidir:
+  1. satırlar arşive kopyalanır (INSERT OR REPLACE; üretilmiş gün sütunları kopyalanmaz, arşivde yeniden üretilir),
+  2. sıcak tablodan yalnızca arşivdeki kopyasıyla hâlâ aynı olan satırlar silinir; arada değişen
+     veya silinen satırların kopyaları arşivden geri alınır.
+WAL modunda birden çok veritabanına yazan bir işlem, veritabanları arasında atomik değildir. Bu
+sıralamayla bir çökme satır kaybettirmez: en kötü ihtimalle satır iki tarafta kalır ve bir sonraki
+çalıştırmada tamamlanır (birleşik sorgular sıcak tabloda bulunan ID'yi arşivden okumaz).
+
+Sıcak tablodan silme, tetikleyicilerle gunluk_ozet'teki katkıyı da çıkarır. Arşivi de kapsayan
+rapor ve aramalar arsiv_dahil=True ile istenir (raporlama.py, veritabani.rezervasyon_ara). Boşalan
+sayfalar dosyada kalır ve yeni kayıtlarla yeniden kullanılır.
+
+Yedek: sqlite3 yedekleme API'siyle YEDEK_SAYFA_ADIMI sayfalık adımlarla kopyalanır. Kaynak yalnızca
+adım süresince okuma kilidi tutar, yani resepsiyondaki yazmalar beklemez. Yedek önce geçici dosyaya
+yazılır, tamamlanınca hedefin yerine konur. Kopyalama sırasında başka bir bağlantı veritabanına
+yazarsa SQLite kopyalamayı baştan başlatır.
+
+Kullanım:  python arsivleme.py arsivle [--ay 12]
+           python arsivleme.py yedekle yedek.db [--arsiv]
+"""
+import argparse
+import os
+import sqlite3
+import time
+from datetime import date
+
+import izleme
+import veritabani
+
+ARSIV_AY_SINIRI = 12 # Çıkışı bundan eski (ay) rezervasyonlar arşive taşınır
+ARSIV_PARCA_BOYUTU = 2000 # Her yazma işleminde taşınan satır sayısı
+YEDEK_SAYFA_ADIMI = 256 # Yedekleme adımı başına kopyalanan sayfa sayısı
+YEDEK_ADIM_ARASI = 0.01 # Yedekleme adımları arasında beklenen süre (saniye)
+
+# Arşivdeki kopya (a) ile sıcak tablodaki satır (r) aynı mı? (toplam_fiyat NULL olabilir)
+_AYNI_KAYIT = """a.musteri_adi = r.musteri_adi AND a.oda_no = r.oda_no AND a.giris_tarihi = r.giris_tarihi
+                 AND a.cikis_tarihi = r.cikis_tarihi AND a.toplam_fiyat IS r.toplam_fiyat AND a.odeme_durumu = r.odeme_durumu"""
+
+def _arsive_kopyala(conn, idler, arsivlenme_tarihi):
+    """Yardımcı: Verilen ID'lerdeki rezervasyonları (oda tipleriyle) arşive yazar ve arşivin arama indeksini günceller."""
+    yer = ','.join('?' * len(idler))
+    conn.execute(f"""
+        INSERT OR REPLACE INTO arsiv.rezervasyonlar
+            (id, musteri_adi, oda_tipi, oda_no, giris_tarihi, cikis_tarihi, toplam_fiyat, odeme_durumu, arsivlenme_tarihi)
+        SELECT r.id, r.musteri_adi, o.oda_tipi, r.oda_no, r.giris_tarihi, r.cikis_tarihi, r.toplam_fiyat, r.odeme_durumu, ?
+        FROM rezervasyonlar r JOIN odalar o ON o.oda_numarasi = r.oda_no
+        WHERE r.id IN ({yer})
+    """, [arsivlenme_tarihi] + idler)
+    if conn.execute("SELECT 1 FROM arsiv.sqlite_master WHERE name = 'rezervasyon_arama'").fetchone():
+        conn.execute(f"DELETE FROM arsiv.rezervasyon_arama WHERE rowid IN ({yer})", idler)
+        conn.execute(f"""
+            INSERT INTO arsiv.rezervasyon_arama (rowid, musteri_adi, oda_no, oda_tipi, odeme_durumu)
+            SELECT id, {veritabani._sql_normalle('musteri_adi')}, oda_no, {veritabani._sql_normalle('oda_tipi')},
+                   {veritabani._sql_normalle('odeme_durumu')}
+            FROM arsiv.rezervasyonlar WHERE id IN ({yer})
+        """, idler)
+
+def _arsivden_sil(conn, idler):
+    """Yardımcı: Verilen ID'lerin arşivdeki kopyalarını (ve arama indeksindeki satırlarını) siler."""
+    yer = ','.join('?' * len(idler))
+    conn.execute(f"DELETE FROM arsiv.rezervasyonlar WHERE id IN ({yer})", idler)
+    if conn.execute("SELECT 1 FROM arsiv.sqlite_master WHERE name = 'rezervasyon_arama'").fetchone():
+        conn.execute(f"DELETE FROM arsiv.rezervasyon_arama WHERE rowid IN ({yer})", idler)
+
+@izleme.olculur
+def eski_rezervasyonlari_arsivle(ay=ARSIV_AY_SINIRI, bugun_sql=None, parca_boyutu=ARSIV_PARCA_BOYUTU):
+    """
+    Çıkışı 'ay' aydan eski rezervasyonları arşive taşır (bkz. modül açıklaması).
+    {'tasinan': int, 'sinir': tarih, 'sure': saniye} döndürür.
+    """
+    baslangic = time.perf_counter()
+    bugun_sql = bugun_sql or date.today().isoformat()
+    try:
+        with veritabani.baglanti() as conn:
+            sinir = conn.execute("SELECT date(?, ?)", (bugun_sql, f"-{int(ay)} months")).fetchone()[0]
+            if not veritabani._arsivi_bagla(conn, olustur=True):
+                raise sqlite3.OperationalError("Arşiv bağlanamadı (açık bir işlem var veya salt okunur mod).")
+        tasinan, son_id = 0, 0
+        while True:
+            with veritabani.yazma_islemi() as conn:
+                idler = [satir[0] for satir in conn.execute(
+                    "SELECT id FROM rezervasyonlar WHERE id > ? AND cikis_tarihi < ? ORDER BY id LIMIT ?", (son_id, sinir, parca_boyutu))]
+                if not idler: break
+                _arsive_kopyala(conn, idler, bugun_sql)
+            with veritabani.yazma_islemi() as conn:
+                yer = ','.join('?' * len(idler))
+                silinecekler = [satir[0] for satir in conn.execute(f"""
+                    SELECT r.id FROM rezervasyonlar r JOIN arsiv.rezervasyonlar a ON a.id = r.id
+                    WHERE r.id IN ({yer}) AND {_AYNI_KAYIT}
+                """, idler)]
+                conn.execute(f"DELETE FROM rezervasyonlar WHERE id IN ({','.join('?' * len(silinecekler))})", silinecekler)
+                # Arada değişen veya silinen satırların arşivdeki kopyaları bırakılmaz
+                kalanlar = sorted(set(idler) - set(silinecekler))
+                if kalanlar: _arsivden_sil(conn, kalanlar)
+                tasinan += len(silinecekler)
+            son_id = idler[-1]
+        return {'tasinan': tasinan, 'sinir': sinir, 'sure': time.perf_counter() - baslangic}
+    except sqlite3.Error as e:
+        print(f"Rezervasyonlar arşivlenirken hata: {e}")
+        raise
+
+@izleme.olculur
+def yedek_al(hedef_yolu, arsiv=False, sayfa_adimi=YEDEK_SAYFA_ADIMI, ilerleme=None):
+    """
+    Veritabanının (arsiv=True ise arşivin) tutarlı bir kopyasını hedef_yolu'na yazar. ilerleme verilirse
+    her adımdan sonra ilerleme(kalan_sayfa, toplam_sayfa) çağrılır. {'sayfa': int, 'sure': saniye} döndürür.
+    """
+    baslangic = time.perf_counter()
+    kaynak_yolu = veritabani.arsiv_yolu() if arsiv else veritabani.DB_NAME
+    if not os.path.exists(kaynak_yolu): raise FileNotFoundError(f"Yedeklenecek veritabanı bulunamadı: {kaynak_yolu}")
+    gecici_yol, sayfalar = hedef_yolu + ".tmp", [0]
+    def adim(durum, kalan, toplam):
+        sayfalar[0] = toplam
+        if ilerleme: ilerleme(kalan, toplam)
+        if kalan: time.sleep(YEDEK_ADIM_ARASI) # Adımlar arasında kaynakta kilit yok; yazıcılar bu arada çalışır
+    try:
+        if os.path.exists(gecici_yol): os.remove(gecici_yol)
+        # Ayrı bağlantılar: paylaşılan thread bağlantısı yedekleme boyunca meşgul kalmasın
+        bekleme = veritabani.DEPOLAMA_PROFILLERI[veritabani.DEPOLAMA_PROFILI].get('busy_timeout', 5000) / 1000
+        kaynak = sqlite3.connect(kaynak_yolu, timeout=bekleme)
+        hedef = sqlite3.connect(gecici_yol)
+        try: kaynak.backup(hedef, pages=sayfa_adimi, progress=adim, sleep=YEDEK_ADIM_ARASI)
+        finally:
+            hedef.close(); kaynak.close()
+        os.replace(gecici_yol, hedef_yolu)
+        return {'sayfa': sayfalar[0], 'sure': time.perf_counter() - baslangic}
+    except sqlite3.Error as e:
+        print(f"Yedek alınırken hata: {e}")
+        if os.path.exists(gecici_yol): os.remove(gecici_yol)
+        raise
+
+if __name__ == "__main__":
+    ayristirici = argparse.ArgumentParser(description="Eski rezervasyonları arşivler veya çalışırken yedek alır.")
+    komutlar = ayristirici.add_subparsers(dest="komut", required=True)
+    arsivle = komutlar.add_parser("arsivle", help="Çıkışı eski rezervasyonları arşive taşır")
+    arsivle.add_argument("--ay", type=int, default=ARSIV_AY_SINIRI, help="Çıkışı bundan eski (ay) rezervasyonlar taşınır")
+    arsivle.add_argument("--parca", type=int, default=ARSIV_PARCA_BOYUTU, help="İşlem başına satır sayısı")
+    yedekle = komutlar.add_parser("yedekle", help="Veritabanının yedeğini alır")
+    yedekle.add_argument("hedef", help="Yedeğin yazılacağı dosya")
+    yedekle.add_argument("--arsiv", action="store_true", help="Ana veritabanı yerine arşivi yedekle")
+    yedekle.add_argument("--adim", type=int, default=YEDEK_SAYFA_ADIMI, help="Adım başına sayfa sayısı")
+    argumanlar = ayristirici.parse_args()
+
+    if argumanlar.komut == "arsivle":
+        sonuc = eski_rezervasyonlari_arsivle(argumanlar.ay, parca_boyutu=argumanlar.parca)
+        print(f"Çıkışı {sonuc['sinir']} öncesi olan {sonuc['tasinan']} rezervasyon arşive taşındı ({sonuc['sure']:.2f} sn).")
+    else:
+        sonuc = yedek_al(argumanlar.hedef, argumanlar.arsiv, argumanlar.adim)
+        print(f"{sonuc['sayfa']} sayfa {argumanlar.hedef} dosyasına yedeklendi ({sonuc['sure']:.2f} sn).")
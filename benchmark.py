@@ -0,0 +1,313 @@
+"""
+veritabani.py fonksiyonlarının veri büyüdükçe nasıl ölçeklendiğini ölçer.
+
+Varsayılan ölçüm paketi her boyut (rezervasyon sayısı) için sentetik_veri.py ile gerçekçi bir
+otel kurar ve okuma (müsaitlik, anlık durum, arama, listeleme) ile yazma (ekle, güncelle,
+check-out, sil, atomik rezervasyon) yollarının her çağrısını ayrı ayrı ölçer. Fonksiyon başına
+p50/p95/p99, ortalama ve saniyedeki işlem sayısı yazdırılır ve JSON olarak kaydedilir.
+--karsilastir önceki bir JSON'la p95 değerlerini karşılaştırır ve gerilemeleri işaretler.
+
+--indeks eski ölçümü çalıştırır: tarih indeksi varken ve yokken müsaitlik sorgularının süresi.
+--atama oda atama kurallarını bellekte, aynı talep akışıyla karşılaştırır ve satılan oda-geceyi yazdırır.
+Veritabanı kullanan ölçümler geçici veritabanlarında yapılır.
+
+Kullanım:  python benchmark.py [--boyut 10000 100000 1000000] [--tekrar 300] [--cikti sonuc.json]
+                               [--karsilastir onceki.json] [--onbelleksiz] [--veri-klasoru klasor]
+           python benchmark.py --indeks
+           python benchmark.py --atama
+"""
+import argparse
+import bisect
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import oda_atama
+import sentetik_veri
+import veritabani
+
+BOYUTLAR = [1_000, 10_000, 100_000, 300_000] # --indeks: geçmiş rezervasyon sayıları
+PAKET_BOYUTLARI = [10_000, 100_000, 1_000_000] # Ölçüm paketi: toplam rezervasyon sayıları
+TEKRAR = 200 # Her ölçüm için çağrı sayısı
+AGIR_TEKRAR = 5 # Tüm tabloyu okuyan çağrılar (rezervasyonlari_cek) için
+TOPLU_ADET = 80 # Toplu check-out ve oda durumu ölçümlerinde bir işlemdeki kayıt sayısı
+ODA_SAYISI = 60
+GERILEME_ESIGI = 1.2 # p95 bu oranda (ve en az 0.05 ms) kötüleşirse gerileme sayılır
+
+def _otel_kur(db_yolu):
+    """Yardımcı: Boş bir veritabanı hazırlar ve ODA_SAYISI kadar oda ekler."""
+    veritabani.DB_NAME = db_yolu
+    veritabani.DOLULUK_ONBELLEGI_AKTIF = False # İndeksin etkisi ölçülüyor, SQL yolu kullanılsın
+    veritabani.veritabani_baslat()
+    tipler = [('Tek Kişilik', 1500), ('Çift Kişilik', 2500), ('Suit', 4000)]
+    with veritabani.baglanti() as conn:
+        conn.execute("DELETE FROM odalar")
+        conn.executemany("INSERT INTO odalar VALUES (?, ?, ?, 'Temiz')",
+                         [(str(100 + i), tipler[i % 3][0], tipler[i % 3][1]) for i in range(ODA_SAYISI)])
+
+def _gecmis_ekle(adet, bitis):
+    """Yardımcı: 'bitis' tarihinden geriye doğru, çakışmayan 'adet' kadar geçmiş konaklama ekler."""
+    odalar = [str(100 + i) for i in range(ODA_SAYISI)]
+    kayitlar = []
+    for i, oda in enumerate(odalar):
+        gun = bitis
+        for _ in range(adet // ODA_SAYISI + (1 if i < adet % ODA_SAYISI else 0)):
+            cikis = gun - timedelta(days=random.randint(0, 1))
+            giris = cikis - timedelta(days=random.randint(1, 4))
+            kayitlar.append(("Misafir", oda, giris.isoformat(), cikis.isoformat(), 1000, 'Tamamı Ödendi'))
+            gun = giris
+    with veritabani.baglanti() as conn:
+        conn.execute("DELETE FROM rezervasyonlar")
+        conn.executemany("INSERT INTO rezervasyonlar (musteri_adi, oda_no, giris_tarihi, cikis_tarihi, toplam_fiyat, odeme_durumu) VALUES (?, ?, ?, ?, ?, ?)", kayitlar)
+
+def _olc(fonksiyon, *argumanlar):
+    """Yardımcı: Fonksiyonun TEKRAR kez çağrılmasının ortalama süresini milisaniye olarak döndürür."""
+    baslangic = time.perf_counter()
+    for _ in range(TEKRAR):
+        fonksiyon(*argumanlar)
+    return (time.perf_counter() - baslangic) * 1000 / TEKRAR
+
+def musaitlik_olc():
+    """Her geçmiş boyutu için indeksli ve indekssiz sorgu sürelerini tablo halinde yazdırır."""
+    bugun = date.today()
+    giris, cikis = (bugun + timedelta(days=3)).isoformat(), (bugun + timedelta(days=6)).isoformat()
+    with tempfile.TemporaryDirectory() as klasor:
+        _otel_kur(os.path.join(klasor, "benchmark.db"))
+        print(f"{'Geçmiş':>8} | {'İndeks':>6} | {'musait_oda_bul':>14} | {'oda_musait_mi':>13} | {'anlik_durum':>11}  (ms/çağrı)")
+        for boyut in BOYUTLAR:
+            _gecmis_ekle(boyut, bugun)
+            for indeks_var in (True, False):
+                with veritabani.baglanti() as conn:
+                    if indeks_var: veritabani._gecis_2_tarih_indeksleri(conn.cursor()) # İndeksi (yeniden) oluşturur
+                    else: conn.execute("DROP INDEX IF EXISTS idx_rezervasyonlar_oda_tarih")
+                sureler = (_olc(veritabani.musait_oda_bul, 'Suit', giris, cikis),
+                           _olc(veritabani.oda_musait_mi, '101', giris, cikis),
+                           _olc(veritabani.get_anlik_oda_durumu, giris))
+                print(f"{boyut:>8} | {'var' if indeks_var else 'yok':>6} | {sureler[0]:>14.3f} | {sureler[1]:>13.3f} | {sureler[2]:>11.3f}")
+        veritabani.tum_baglantilari_kapat()
+
+# --- ODA ATAMA SİMÜLASYONU ---
+
+def _atama_simule_et(kural, oda_sayisi, gun_sayisi, talep_orani, tohum):
+    """
+    Yardımcı: Tek tipte oda_sayisi odalı bir otele gun_sayisi gün boyunca rastgele talepler gelir
+    (ortalama 20 gün önceden, ortalama 3 gece). kural: 'ilk', 'rastgele', 'en_uygun' veya
+    'en_uygun+gece' (her gece gelecek atamalar yeniden planlanır). (satılan gece, kabul, red) döndürür.
+    """
+    rastgele = random.Random(tohum) # Her kural aynı talep akışını görür
+    secim = random.Random(tohum + 1)
+    odalar = [str(100 + i) for i in range(oda_sayisi)]
+    girisler, cikislar = {o: [] for o in odalar}, {o: [] for o in odalar}
+    yerlesim = {} # rezervasyon no -> (oda, giris, cikis)
+    satilan = kabul = red = 0
+    for bugun in range(gun_sayisi):
+        if kural == 'en_uygun+gece' and yerlesim:
+            tasimalar, _, _ = oda_atama.gelecegi_planla([(o, 'Tip', 'Temiz') for o in odalar],
+                [(rez, oda, giris, cikis) for rez, (oda, giris, cikis) in yerlesim.items() if cikis > bugun], bugun)
+            for rez, yeni_oda in tasimalar.items():
+                oda, giris, cikis = yerlesim[rez]
+                i = girisler[oda].index(giris); del girisler[oda][i]; del cikislar[oda][i]
+                j = bisect.bisect_left(girisler[yeni_oda], giris)
+                girisler[yeni_oda].insert(j, giris); cikislar[yeni_oda].insert(j, cikis)
+                yerlesim[rez] = (yeni_oda, giris, cikis)
+        for _ in range(talep_orani(rastgele, oda_sayisi)):
+            giris = bugun + 1 + int(rastgele.expovariate(1 / 20))
+            cikis = giris + min(14, 1 + int(rastgele.expovariate(1 / 2)))
+            adaylar = []
+            for oda in odalar:
+                i = bisect.bisect_left(girisler[oda], cikis)
+                if i == 0 or cikislar[oda][i - 1] <= giris:
+                    adaylar.append((oda, cikislar[oda][i - 1] if i else None, girisler[oda][i] if i < len(girisler[oda]) else None))
+            if not adaylar: red += 1; continue
+            if kural == 'ilk': oda = adaylar[0][0]
+            elif kural == 'rastgele': oda = secim.choice(adaylar)[0]
+            else: oda = oda_atama.en_uygun_oda(adaylar, giris, cikis, bugun)
+            i = bisect.bisect_left(girisler[oda], giris)
+            girisler[oda].insert(i, giris); cikislar[oda].insert(i, cikis)
+            yerlesim[kabul] = (oda, giris, cikis)
+            kabul += 1; satilan += cikis - giris
+    return satilan, kabul, red
+
+def atama_olc(oda_sayisi=40, gun_sayisi=365, tohum=7):
+    """Aynı talep akışında atama kurallarının sattığı oda-geceyi karşılaştırır (talep kapasitenin ~%105'i)."""
+    # Günlük talep: oda başına ortalama 0.35 talep × ~3 gece ≈ kapasitenin biraz üstü
+    talep_orani = lambda rastgele, odalar: sum(1 for _ in range(odalar) if rastgele.random() < 0.35)
+    print(f"{oda_sayisi} oda, {gun_sayisi} gün")
+    print(f"{'Kural':<14} | {'Satılan gece':>12} | {'Kabul':>6} | {'Red':>6} | {'Fark':>7}")
+    temel = None
+    for kural in ('rastgele', 'ilk', 'en_uygun', 'en_uygun+gece'):
+        satilan, kabul, red = _atama_simule_et(kural, oda_sayisi, gun_sayisi, talep_orani, tohum)
+        temel = temel or satilan
+        print(f"{kural:<14} | {satilan:>12} | {kabul:>6} | {red:>6} | {(satilan / temel - 1) * 100:>+6.1f}%")
+
+# --- ÖLÇÜM PAKETİ ---
+
+def _istatistik(sureler_ms):
+    """Yardımcı: Çağrı sürelerinden yüzdelikler (en yakın sıra yöntemi) ve saniyedeki işlem sayısı."""
+    sirali = sorted(sureler_ms)
+    yuzdelik = lambda oran: round(sirali[math.ceil(oran * len(sirali)) - 1], 4)
+    toplam = sum(sirali)
+    return {"cagri": len(sirali), "p50_ms": yuzdelik(0.50), "p95_ms": yuzdelik(0.95), "p99_ms": yuzdelik(0.99),
+            "ortalama_ms": round(toplam / len(sirali), 4), "islem_sn": round(len(sirali) * 1000 / toplam, 1) if toplam else None}
+
+def _cagrilari_olc(fonksiyon, arguman_listesi):
+    """Yardımcı: fonksiyon'u her argüman demeti için ayrı ayrı zamanlar; (süreler, sonuçlar) döndürür."""
+    sureler, sonuclar = [], []
+    for argumanlar in arguman_listesi:
+        baslangic = time.perf_counter()
+        sonuclar.append(fonksiyon(*argumanlar))
+        sureler.append((time.perf_counter() - baslangic) * 1000)
+    return sureler, sonuclar
+
+def _veriyi_hazirla(boyut, veri_klasoru, calisma_yolu, uretim_ayarlari):
+    """
+    Yardımcı: Boyut için sentetik veritabanını calisma_yolu'na hazırlar. veri_klasoru verilmişse
+    üretilen veri orada saklanır ve sonraki çalıştırmalarda kopyalanarak yeniden kullanılır.
+    """
+    baslangic = time.perf_counter()
+    if veri_klasoru is None:
+        oda_sayisi, kalan = sentetik_veri.sentetik_otel(calisma_yolu, boyut, **uretim_ayarlari)
+        return oda_sayisi, kalan, time.perf_counter() - baslangic
+    ayar_metni = "_".join(f"{ad}{deger}" for ad, deger in sorted(uretim_ayarlari.items()))
+    kaynak = os.path.join(veri_klasoru, f"sentetik_{boyut}_{ayar_metni}.db")
+    if not os.path.exists(kaynak):
+        sentetik_veri.sentetik_otel(kaynak, boyut, **uretim_ayarlari)
+        veritabani.tum_baglantilari_kapat() # WAL dosyası kaynağa işlensin
+    shutil.copyfile(kaynak, calisma_yolu)
+    veritabani.DB_NAME = calisma_yolu
+    veritabani.doluluk_onbellegini_sifirla()
+    with veritabani.baglanti() as conn:
+        oda_sayisi = conn.execute("SELECT COUNT(*) FROM odalar").fetchone()[0]
+        kalan = conn.execute("SELECT COUNT(*) FROM rezervasyonlar").fetchone()[0]
+    return oda_sayisi, kalan, time.perf_counter() - baslangic
+
+def boyutu_olc(boyut, tekrar, rastgele, veri_klasoru=None, uretim_ayarlari=None):
+    """Bir boyut için veriyi hazırlar ve tüm fonksiyonları ölçer; JSON'a yazılacak sözlüğü döndürür."""
+    with tempfile.TemporaryDirectory() as klasor:
+        oda_sayisi, kalan, hazirlik_sn = _veriyi_hazirla(boyut, veri_klasoru, os.path.join(klasor, "paket.db"), uretim_ayarlari or {})
+        with veritabani.baglanti() as conn:
+            odalar = conn.execute("SELECT oda_numarasi, oda_tipi FROM odalar").fetchall()
+            ilk, son = conn.execute("SELECT MIN(giris_tarihi), MAX(cikis_tarihi) FROM rezervasyonlar").fetchone()
+            anahtarlar = conn.execute("SELECT giris_tarihi, id FROM rezervasyonlar ORDER BY random() LIMIT ?", (tekrar,)).fetchall()
+        ilk_gun, gun_araligi = date.fromisoformat(ilk), (date.fromisoformat(son) - date.fromisoformat(ilk)).days
+        tipler = sorted({tip for _, tip in odalar})
+
+        def tarih_araligi(gelecek=False):
+            giris = date.today() + timedelta(days=rastgele.randint(0, 120)) if gelecek else ilk_gun + timedelta(days=rastgele.randint(0, gun_araligi))
+            return giris.isoformat(), (giris + timedelta(days=rastgele.randint(1, 7))).isoformat()
+
+        sonuclar = {}
+        def olc(ad, fonksiyon, arguman_listesi):
+            sureler, donenler = _cagrilari_olc(fonksiyon, arguman_listesi)
+            sonuclar[ad] = _istatistik(sureler)
+            return donenler
+
+        # Doluluk önbelleğinin (açıksa) ilk kurulumu ayrıca ölçülür, sonraki çağrılar sıcak önbellekle yapılır
+        veritabani.doluluk_onbellegini_sifirla()
+        olc("onbellek_kurulumu", veritabani.musait_oda_bul, [(tipler[0],) + tarih_araligi(True)])
+        olc("musait_oda_bul", veritabani.musait_oda_bul, [(rastgele.choice(tipler),) + tarih_araligi(True) for _ in range(tekrar)])
+        olc("oda_musait_mi", veritabani.oda_musait_mi, [(rastgele.choice(odalar)[0],) + tarih_araligi(True) for _ in range(tekrar)])
+        olc("musaitlik_ozeti", veritabani.musaitlik_ozeti, [tarih_araligi(True) for _ in range(tekrar)])
+        olc("get_anlik_oda_durumu", veritabani.get_anlik_oda_durumu, [(tarih_araligi()[0],) for _ in range(max(tekrar // 10, 10))])
+        olc("rezervasyon_ara", veritabani.rezervasyon_ara,
+            [(rastgele.choice([rastgele.choice(sentetik_veri.ADLAR), rastgele.choice(sentetik_veri.SOYADLAR)])[:rastgele.randint(3, 6)],)
+             for _ in range(tekrar)])
+        olc("rezervasyon_sayfasi_cek", veritabani.rezervasyon_sayfasi_cek, [(tuple(anahtar), 200) for anahtar in anahtarlar])
+        olc("rezervasyonlari_cek", veritabani.rezervasyonlari_cek, [()] * AGIR_TEKRAR)
+
+        # Yazma yolları: ölçüm verisinin dışında kalsın diye uzak gelecekte, rastgele odalara
+        ileri = date.today() + timedelta(days=3650)
+        def yeni_kayit(i):
+            giris = ileri + timedelta(days=i * 8)
+            return ("Benchmark", rastgele.choice(odalar)[0], giris.isoformat(), (giris + timedelta(days=3)).isoformat(), 3000, 'Ödenmedi')
+        # Önümüzdeki aylar sentetik veride çoğunlukla dolu; boş oda bulunabilsin diye uzak gelecek.
+        # check_out_yap odaları 'Kirli' yaptığından atomik rezervasyon ondan önce ölçülür.
+        atomik_tarihler = [ileri + timedelta(days=rastgele.randint(0, 365)) for _ in range(tekrar)]
+        olc("rezervasyon_yap_atomik", veritabani.rezervasyon_yap_atomik,
+            [(rastgele.choice(tipler), giris.isoformat(), (giris + timedelta(days=rastgele.randint(1, 7))).isoformat(), "Benchmark Atomik", 3000)
+             for giris in atomik_tarihler])
+        kayitlar = [yeni_kayit(i) for i in range(tekrar)]
+        idler = olc("rezervasyon_ekle", veritabani.rezervasyon_ekle, kayitlar)
+        olc("rezervasyon_guncelle", veritabani.rezervasyon_guncelle,
+            [(rez_id, ad + " Güncel", oda, giris, cikis, fiyat + 100, 'Kapora Alındı') for rez_id, (ad, oda, giris, cikis, fiyat, _) in zip(idler, kayitlar)])
+        olc("check_out_yap", veritabani.check_out_yap, [(rez_id, kayit[1]) for rez_id, kayit in zip(idler, kayitlar)])
+        # Toplu kat hizmetleri: yoğun bir sabahtaki gibi 80'lik gruplar
+        olc("toplu_check_out", veritabani.toplu_check_out, [(idler[i:i + TOPLU_ADET],) for i in range(0, len(idler), TOPLU_ADET)])
+        olc("oda_durumlarini_guncelle", veritabani.oda_durumlarini_guncelle,
+            [([oda_no for oda_no, _ in rastgele.sample(odalar, min(TOPLU_ADET, len(odalar)))], 'Temiz') for _ in range(max(tekrar // TOPLU_ADET, 5))])
+        olc("rezervasyon_sil", veritabani.rezervasyon_sil, [(rez_id,) for rez_id in idler])
+        veritabani.tum_baglantilari_kapat()
+    return {"veri": {"oda": oda_sayisi, "rezervasyon": kalan, "hazirlik_sn": round(hazirlik_sn, 2)}, "islemler": sonuclar}
+
+def karsilastir(onceki, simdiki):
+    """İki sonuç dosyasındaki p95 değerlerini karşılaştırır; gerileme sayısını döndürür."""
+    gerileme = 0
+    print(f"\n{'Boyut':>8} | {'İşlem':<24} | {'önceki p95':>10} | {'şimdi p95':>10} | {'oran':>6}")
+    for boyut, sonuc in simdiki["sonuclar"].items():
+        eski_islemler = onceki.get("sonuclar", {}).get(boyut, {}).get("islemler", {})
+        for ad, olcum in sonuc["islemler"].items():
+            if ad not in eski_islemler: continue
+            eski, yeni = eski_islemler[ad]["p95_ms"], olcum["p95_ms"]
+            oran = yeni / eski if eski else float('inf')
+            kotu = oran > GERILEME_ESIGI and yeni - eski > 0.05
+            gerileme += kotu
+            print(f"{boyut:>8} | {ad:<24} | {eski:>10.3f} | {yeni:>10.3f} | {oran:>5.2f}x{'  << GERİLEME' if kotu else ''}")
+    return gerileme
+
+def paket_olc(boyutlar, tekrar, onbellek=True, veri_klasoru=None, uretim_ayarlari=None, tohum=1):
+    """Ölçüm paketini tüm boyutlar için çalıştırır, tabloları yazdırır ve sonuç sözlüğünü döndürür."""
+    veritabani.DOLULUK_ONBELLEGI_AKTIF = onbellek
+    rastgele = random.Random(tohum)
+    sonuc = {"zaman": datetime.now().isoformat(timespec="seconds"),
+             "ortam": {"python": platform.python_version(), "sqlite": sqlite3.sqlite_version, "platform": platform.platform()},
+             "ayarlar": {"tekrar": tekrar, "doluluk_onbellegi": onbellek, "depolama_profili": veritabani.DEPOLAMA_PROFILI,
+                         "uretim": uretim_ayarlari or {}, "tohum": tohum},
+             "sonuclar": {}}
+    for boyut in boyutlar:
+        olcum = boyutu_olc(boyut, tekrar, rastgele, veri_klasoru, uretim_ayarlari)
+        sonuc["sonuclar"][str(boyut)] = olcum
+        veri = olcum["veri"]
+        print(f"\n{boyut} rezervasyon ({veri['oda']} oda, kalan {veri['rezervasyon']}, hazırlık {veri['hazirlik_sn']} sn)")
+        print(f"{'İşlem':<24} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | {'işlem/sn':>9}")
+        for ad, istatistik in olcum["islemler"].items():
+            print(f"{ad:<24} | {istatistik['p50_ms']:>8.3f} | {istatistik['p95_ms']:>8.3f} | {istatistik['p99_ms']:>8.3f} | {istatistik['islem_sn'] or 0:>9.1f}")
+    return sonuc
+
+if __name__ == "__main__":
+    ayristirici = argparse.ArgumentParser(description="veritabani.py ölçüm paketi.")
+    ayristirici.add_argument("--indeks", action="store_true", help="Yalnızca tarih indeksi var/yok karşılaştırmasını çalıştırır")
+    ayristirici.add_argument("--atama", action="store_true", help="Yalnızca oda atama kurallarının simülasyonunu çalıştırır")
+    ayristirici.add_argument("--boyut", type=int, nargs="+", default=PAKET_BOYUTLARI, help="Rezervasyon sayıları")
+    ayristirici.add_argument("--tekrar", type=int, default=TEKRAR, help="İşlem başına ölçülen çağrı sayısı")
+    ayristirici.add_argument("--oda", type=int, default=None, help="Oda sayısı (verilmezse --yil'a göre hesaplanır)")
+    ayristirici.add_argument("--yil", type=float, default=5, help="Rezervasyon geçmişinin yaklaşık yıl sayısı")
+    ayristirici.add_argument("--doluluk", type=float, default=0.7)
+    ayristirici.add_argument("--iptal", type=float, default=0.1, help="İptal edilip silinen rezervasyon oranı")
+    ayristirici.add_argument("--onbelleksiz", action="store_true", help="Doluluk önbelleğini kapatır (SQL yolları ölçülür)")
+    ayristirici.add_argument("--veri-klasoru", default=None, help="Üretilen veritabanlarını saklayıp yeniden kullanır")
+    ayristirici.add_argument("--cikti", default="benchmark_sonuclari.json", help="Sonuçların yazılacağı JSON dosyası")
+    ayristirici.add_argument("--karsilastir", default=None, help="Karşılaştırılacak önceki JSON sonuç dosyası")
+    argumanlar = ayristirici.parse_args()
+
+    if argumanlar.indeks:
+        musaitlik_olc()
+    elif argumanlar.atama:
+        atama_olc()
+    else:
+        uretim = {"oda_sayisi": argumanlar.oda, "yil": argumanlar.yil, "doluluk": argumanlar.doluluk, "iptal_orani": argumanlar.iptal}
+        sonuc = paket_olc(argumanlar.boyut, argumanlar.tekrar, not argumanlar.onbelleksiz, argumanlar.veri_klasoru, uretim)
+        with open(argumanlar.cikti, "w", encoding="utf-8") as dosya:
+            json.dump(sonuc, dosya, ensure_ascii=False, indent=2)
+        print(f"\nSonuçlar {argumanlar.cikti} dosyasına yazıldı.")
+        if argumanlar.karsilastir:
+            with open(argumanlar.karsilastir, encoding="utf-8") as dosya:
+                gerileme = karsilastir(json.load(dosya), sonuc)
+            print(f"\n{gerileme} işlemde gerileme." if gerileme else "\nGerileme yok.")
+            if gerileme: raise SystemExit(1)
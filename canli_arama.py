@@ -0,0 +1,84 @@
+"""
+Ana penceredeki yazarken aramanın (canlı arama) sonuç önbelleği.
+
+Her arama metninin sonucu, normalleştirilmiş kelimeleriyle bir LRU önbellekte tutulur. Yeni metin
+önbellekteki daha geniş bir aramanın daraltılmışıysa ("ahm" -> "ahmet y") sonuç SQLite'a gitmeden
+o aramanın sonucundan süzülür. veritabani.rezervasyon_ara her kelimeyi önek olarak arar ve hepsinin
+eşleşmesini ister; bu yüzden geniş aramanın her kelimesi yeni aramadaki bir kelimenin öneki ise yeni
+aramanın eşleşmeleri eskilerin alt kümesidir. Süzme aynı kuralı (Türkçe harf ve aksan duyarsız kelime
+öneki, bkz. FTS5 'unicode61 remove_diacritics 2') Python'da uygular. Sonuç sınırına takılmış (eksik
+olabilecek) sonuçlar süzmede kullanılmaz. Süzülen sonuç geniş aramanın sırasını korur; alaka
+sırası yeniden hesaplanmaz.
+
+Önbelleğe yalnızca FTS5 ile yapılmış aramalar konur (rezervasyon_ara(..., yol_bildir=True)). FTS5
+yoksa veya metinde kelime yoksa arama LIKE '%metin%' ile yapılır; bu kural kelime ortasında da
+eşleştiğinden süzme ona uymaz ve bu aramalar her seferinde veritabanına gider.
+
+Kayıtlar OMUR saniye sonra eskir (başka terminallerin değişiklikleri için); bu terminalde bir kayıt
+değişince önbellek temizle() ile boşaltılır.
+"""
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+
+KAPASITE = 64 # Önbellekte tutulan en fazla arama metni
+OMUR = 30.0 # Saniye
+
+def normalle(metin):
+    """Metni FTS5 indeksiyle aynı biçime getirir: küçük harf, aksansız, 'ı'/'İ' -> 'i'."""
+    metin = metin.replace('ı', 'i').replace('İ', 'i').lower()
+    return ''.join(harf for harf in unicodedata.normalize('NFD', metin) if not unicodedata.combining(harf))
+
+def kelimeler(metin):
+    """Arama metninin normalleştirilmiş kelimeleri (veritabani._arama_ifadesi ile aynı bölme)."""
+    return tuple(re.findall(r"\w+", normalle(metin)))
+
+def eslesir_mi(kayit, aranan):
+    """Aranan kelimelerin her biri, kaydın aranan alanlarındaki bir kelimenin öneki mi?"""
+    kayit_kelimeleri = kelimeler(f"{kayit.musteri_adi} {kayit.oda_no} {kayit.oda_tipi or ''} {kayit.odeme_durumu}")
+    return all(any(kelime.startswith(on) for kelime in kayit_kelimeleri) for on in aranan)
+
+def _kapsar_mi(genis, dar):
+    """Yardımcı: 'genis' kelimelerle yapılan aramanın eşleşmeleri 'dar' aramanınkileri içerir mi?"""
+    return all(any(kelime.startswith(on) for kelime in dar) for on in genis)
+
+class AramaOnbellegi:
+    """Arama kelimeleri -> (zaman, sonuç, tam mı) LRU önbelleği."""
+    def __init__(self, kapasite=KAPASITE, omur=OMUR):
+        self.kapasite, self.omur = kapasite, omur
+        self.kayitlar = OrderedDict()
+
+    def ekle(self, metin, sonuc, tam):
+        """Aramanın sonucunu saklar; tam=False ise (sonuç sınırına takılmış) yalnızca aynı metin için kullanılır."""
+        anahtar = kelimeler(metin)
+        if not anahtar: return
+        self.kayitlar[anahtar] = (time.monotonic(), sonuc, tam)
+        self.kayitlar.move_to_end(anahtar)
+        while len(self.kayitlar) > self.kapasite: self.kayitlar.popitem(last=False)
+
+    def bul(self, metin):
+        """
+        Metnin sonucunu önbellekten verir: aynı arama varsa onu, yoksa onu kapsayan en dar tam sonucu
+        süzerek (süzüleni de saklar). Bulunamazsa None.
+        """
+        anahtar = kelimeler(metin)
+        if not anahtar: return None
+        simdi = time.monotonic()
+        for eski in [a for a, (zaman, _, _) in self.kayitlar.items() if simdi - zaman > self.omur]: del self.kayitlar[eski]
+        if anahtar in self.kayitlar:
+            self.kayitlar.move_to_end(anahtar)
+            return self.kayitlar[anahtar][1]
+        adaylar = [(len(sonuc), genis) for genis, (_, sonuc, tam) in self.kayitlar.items() if tam and _kapsar_mi(genis, anahtar)]
+        if not adaylar: return None
+        genis = min(adaylar)[1]
+        zaman, sonuc, _ = self.kayitlar[genis]
+        self.kayitlar.move_to_end(genis)
+        suzulen = [kayit for kayit in sonuc if eslesir_mi(kayit, anahtar)]
+        self.kayitlar[anahtar] = (zaman, suzulen, True) # Kaynağıyla aynı anda eskir
+        while len(self.kayitlar) > self.kapasite: self.kayitlar.popitem(last=False)
+        return suzulen
+
+    def temizle(self):
+        """Tüm sonuçları bırakır (veri değiştiğinde)."""
+        self.kayitlar.clear()
@@ -0,0 +1,238 @@
+"""
+Rezervasyonları muhasebe için CSV'ye veya sıkıştırılmış sütunlu bir dosyaya akış halinde aktarır.
+
+Satırlar tek bir okuma işleminde, ID sırasıyla ve PARCA_BOYUTU'luk fetchmany parçalarıyla okunur;
+her parça hemen dosyaya yazılır. Bellek kullanımı tablo boyutundan bağımsızdır.
+Seçenekler:
+- --baslangic/--bitis: yalnızca bu aralıkla çakışan konaklamalar ([baslangic, bitis));
+- --son-id N: yalnızca ID'si N'den büyük (sonradan eklenmiş) rezervasyonlar;
+- --durum dosya.json: son aktarılan ID bu dosyada tutulur, her çalıştırma kaldığı yerden devam eder.
+Artımlı aktarım yeni kayıtları alır. Önceden aktarılmış kayıtlardaki güncellemeler ve silmeler gelmez.
+
+Sütunlu biçim (.otlk), Parquet'e benzer:
+  SIHIRLI | satır grubu 1 | ... | satır grubu n | altbilgi (JSON) | altbilgi uzunluğu (4 bayt) | SIHIRLI
+Her satır grubu (bir fetchmany parçası) her sütun için zlib ile sıkıştırılmış ayrı bir blok içerir.
+Blokların yeri ve satır sayıları altbilgidedir; okuyucu yalnızca istenen sütunların bloklarını açar.
+Sütun kodlamaları:
+  artan    int64, önceki satırdan fark olarak (ID)
+  metin    uint32 bayt uzunlukları + art arda UTF-8 metinler (müşteri adı)
+  sozluk   farklı değerlerin JSON listesi + uint32 kodlar (oda tipi, oda no, ödeme durumu)
+  gun      int32, 1970-01-01'den itibaren gün (bkz. doluluk.gun_no)
+  ondalik  float64; NULL için NaN
+Sayılar little-endian yazılır.
+
+Kullanım:  python disa_aktar.py hedef.csv|hedef.otlk [--baslangic YYYY-MM-DD] [--bitis YYYY-MM-DD]
+                                                      [--son-id N | --durum disa_aktarim.json]
+           python disa_aktar.py --oku hedef.otlk [--sutun oda_no --sutun toplam_fiyat]
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+import veritabani
+from doluluk import gun_tarihi
+
+PARCA_BOYUTU = 10_000 # fetchmany ve sütunlu dosyada satır grubu boyutu
+SIHIRLI = b"OTLK0001"
+# (sütun, kodlama); sorgu da bu sırayla seçer
+SUTUNLAR = [('id', 'artan'), ('musteri_adi', 'metin'), ('oda_tipi', 'sozluk'), ('oda_no', 'sozluk'),
+            ('giris_tarihi', 'gun'), ('cikis_tarihi', 'gun'), ('toplam_fiyat', 'ondalik'), ('odeme_durumu', 'sozluk')]
+
+def _sorgu(baslangic=None, bitis=None, son_id=None):
+    """Yardımcı: Filtrelere göre (sql, parametreler). ID sırası rowid taramasıdır, sıralama için geçici tablo gerekmez."""
+    kosullar, parametreler = [], []
+    if son_id is not None: kosullar.append("r.id > ?"); parametreler.append(son_id)
+    if baslangic is not None: kosullar.append("r.cikis_tarihi > ?"); parametreler.append(baslangic)
+    if bitis is not None: kosullar.append("r.giris_tarihi < ?"); parametreler.append(bitis)
+    return f"""
+        SELECT r.id, r.musteri_adi, o.oda_tipi, r.oda_no, r.giris_tarihi, r.cikis_tarihi, r.toplam_fiyat, r.odeme_durumu,
+               r.giris_gun, r.cikis_gun
+        FROM rezervasyonlar r LEFT JOIN odalar o ON r.oda_no = o.oda_numarasi
+        {'WHERE ' + ' AND '.join(kosullar) if kosullar else ''}
+        ORDER BY r.id
+    """, parametreler
+
+# --- YAZICILAR ---
+
+class _CsvYazici:
+    """Parçaları başlıklı CSV olarak yazar (Excel Türkçe karakterleri doğru açsın diye UTF-8 BOM'lu)."""
+    def __init__(self, dosya_yolu):
+        self.dosya = open(dosya_yolu, 'w', encoding='utf-8-sig', newline='')
+        self.yazici = csv.writer(self.dosya)
+        self.yazici.writerow([ad for ad, _ in SUTUNLAR])
+
+    def yaz(self, satirlar):
+        self.yazici.writerows(satir[:8] for satir in satirlar)
+
+    def kapat(self, ozet):
+        self.dosya.close()
+
+def _sayilar(kod, degerler):
+    """Yardımcı: Sayı dizisinin little-endian baytları."""
+    dizi = array(kod, degerler)
+    if sys.byteorder == 'big': dizi.byteswap()
+    return dizi.tobytes()
+
+def _sutunu_kodla(kodlama, degerler, onceki_id):
+    """Yardımcı: Bir satır grubundaki sütun değerlerini kodlamasına göre baytlara çevirir."""
+    if kodlama == 'artan':
+        return _sayilar('q', [deger - onceki for onceki, deger in zip([onceki_id] + degerler, degerler)])
+    if kodlama == 'metin':
+        baytlar = [deger.encode('utf-8') for deger in degerler]
+        return _sayilar('I', [len(b) for b in baytlar]) + b"".join(baytlar)
+    if kodlama == 'sozluk':
+        kodlar = {}
+        sira = [kodlar.setdefault(deger, len(kodlar)) for deger in degerler]
+        sozluk = json.dumps(list(kodlar), ensure_ascii=False).encode('utf-8')
+        return struct.pack('<I', len(sozluk)) + sozluk + _sayilar('I', sira)
+    if kodlama == 'gun':
+        return _sayilar('i', degerler)
+    return _sayilar('d', [math.nan if deger is None else deger for deger in degerler]) # ondalik
+
+class _SutunluYazici:
+    """Her parçayı bir satır grubu olarak yazar; altbilgi kapatırken eklenir (bkz. modül açıklaması)."""
+    def __init__(self, dosya_yolu):
+        self.dosya = open(dosya_yolu, 'wb')
+        self.dosya.write(SIHIRLI)
+        self.gruplar = [] # Her grup için satır sayısı ve (ofset, uzunluk) blokları; yalnızca meta veri
+        self.onceki_id = 0
+
+    def yaz(self, satirlar):
+        # Gün sütunları sorgunun sonundaki üretilmiş giris_gun/cikis_gun'dan gelir
+        kaynaklar = {'giris_tarihi': 8, 'cikis_tarihi': 9}
+        bloklar = []
+        for sira, (ad, kodlama) in enumerate(SUTUNLAR):
+            degerler = [satir[kaynaklar.get(ad, sira)] for satir in satirlar]
+            blok = zlib.compress(_sutunu_kodla(kodlama, degerler, self.onceki_id), 6)
+            bloklar.append((self.dosya.tell(), len(blok)))
+            self.dosya.write(blok)
+        self.onceki_id = satirlar[-1][0]
+        self.gruplar.append({'satir': len(satirlar), 'bloklar': bloklar})
+
+    def kapat(self, ozet):
+        altbilgi = json.dumps({'surum': 1, 'sutunlar': SUTUNLAR, 'gruplar': self.gruplar, **ozet}, ensure_ascii=False).encode('utf-8')
+        self.dosya.write(altbilgi + struct.pack('<I', len(altbilgi)) + SIHIRLI)
+        self.dosya.close()
+
+# --- AKTARIM ---
+
+def disa_aktar(dosya_yolu, bicim=None, baslangic=None, bitis=None, son_id=None, parca_boyutu=PARCA_BOYUTU):
+    """
+    Filtrelere uyan rezervasyonları dosyaya akış halinde yazar; bicim verilmezse uzantıdan ('.otlk' ise
+    sütunlu, değilse CSV). {'satir': int, 'son_id': aktarılan en büyük ID (yoksa son_id), 'sure': saniye} döndürür.
+    """
+    baslangic_zamani = time.perf_counter()
+    bicim = bicim or ('sutunlu' if dosya_yolu.lower().endswith('.otlk') else 'csv')
+    yazici = (_SutunluYazici if bicim == 'sutunlu' else _CsvYazici)(dosya_yolu)
+    sayi, en_buyuk_id = 0, son_id
+    try:
+        with veritabani.baglanti() as conn:
+            cursor = conn.execute(*_sorgu(baslangic, bitis, son_id)) # Tek SELECT: tüm parçalar aynı anlık görüntüden
+            while True:
+                satirlar = cursor.fetchmany(parca_boyutu)
+                if not satirlar: break
+                yazici.yaz(satirlar)
+                sayi += len(satirlar); en_buyuk_id = satirlar[-1][0]
+    except BaseException:
+        yazici.kapat({}); os.remove(dosya_yolu) # Yarım dosya bırakma
+        raise
+    ozet = {'satir': sayi, 'son_id': en_buyuk_id}
+    yazici.kapat({**ozet, 'baslangic': baslangic, 'bitis': bitis, 'onceki_son_id': son_id})
+    return {**ozet, 'sure': time.perf_counter() - baslangic_zamani}
+
+# --- OKUMA ---
+
+def _sayilari_ac(kod, baytlar):
+    """Yardımcı: Little-endian baytlardan sayı dizisi."""
+    dizi = array(kod); dizi.frombytes(baytlar)
+    if sys.byteorder == 'big': dizi.byteswap()
+    return dizi
+
+def _sutunu_coz(kodlama, baytlar, satir_sayisi, onceki_id):
+    """Yardımcı: _sutunu_kodla'nın tersi; değer listesi döndürür."""
+    if kodlama == 'artan':
+        degerler, toplam = [], onceki_id
+        for fark in _sayilari_ac('q', baytlar): toplam += fark; degerler.append(toplam)
+        return degerler
+    if kodlama == 'metin':
+        uzunluklar, ofset, degerler = _sayilari_ac('I', baytlar[:4 * satir_sayisi]), 4 * satir_sayisi, []
+        for uzunluk in uzunluklar:
+            degerler.append(baytlar[ofset:ofset + uzunluk].decode('utf-8')); ofset += uzunluk
+        return degerler
+    if kodlama == 'sozluk':
+        uzunluk = struct.unpack_from('<I', baytlar)[0]
+        sozluk = json.loads(baytlar[4:4 + uzunluk].decode('utf-8'))
+        return [sozluk[kod] for kod in _sayilari_ac('I', baytlar[4 + uzunluk:])]
+    if kodlama == 'gun':
+        return [gun_tarihi(gun) for gun in _sayilari_ac('i', baytlar)]
+    return [None if math.isnan(deger) else deger for deger in _sayilari_ac('d', baytlar)] # ondalik
+
+def sutunlu_altbilgi(dosya_yolu):
+    """Sütunlu dosyanın altbilgisini (sütunlar, satır grupları, satır sayısı, son_id, filtreler) döndürür."""
+    with open(dosya_yolu, 'rb') as dosya:
+        if dosya.read(len(SIHIRLI)) != SIHIRLI: raise ValueError(f"{dosya_yolu} sütunlu dışa aktarım dosyası değil.")
+        dosya.seek(-(len(SIHIRLI) + 4), os.SEEK_END)
+        uzunluk = struct.unpack('<I', dosya.read(4))[0]
+        if dosya.read(len(SIHIRLI)) != SIHIRLI: raise ValueError(f"{dosya_yolu} eksik yazılmış (altbilgi yok).")
+        dosya.seek(-(len(SIHIRLI) + 4 + uzunluk), os.SEEK_END)
+        return json.loads(dosya.read(uzunluk).decode('utf-8'))
+
+def sutunlu_oku(dosya_yolu, sutunlar=None):
+    """
+    Sütunlu dosyayı satır grubu satır grubu okur ve satırları demet olarak üretir. sutunlar verilirse
+    yalnızca o sütunların blokları açılır (demetler o sırada olur).
+    """
+    altbilgi = sutunlu_altbilgi(dosya_yolu)
+    adlar = [ad for ad, _ in altbilgi['sutunlar']]
+    secilen = [adlar.index(ad) for ad in (sutunlar or adlar)]
+    onceki_id = 0 # 'artan' sütununun ilk farkı 0'dan
+    with open(dosya_yolu, 'rb') as dosya:
+        for grup in altbilgi['gruplar']:
+            kolonlar = []
+            for sira in secilen:
+                ofset, uzunluk = grup['bloklar'][sira]
+                dosya.seek(ofset)
+                kolonlar.append(_sutunu_coz(altbilgi['sutunlar'][sira][1], zlib.decompress(dosya.read(uzunluk)), grup['satir'], onceki_id))
+            if 0 in secilen: onceki_id = kolonlar[secilen.index(0)][-1]
+            else: # ID sütunu okunmadıysa bir sonraki grubun başlangıcı için yine de gerekli
+                ofset, uzunluk = grup['bloklar'][0]
+                dosya.seek(ofset); onceki_id += sum(_sayilari_ac('q', zlib.decompress(dosya.read(uzunluk))))
+            yield from zip(*kolonlar)
+
+def _durumu_oku(durum_dosyasi):
+    """Yardımcı: Artımlı aktarımın son ID'si (dosya yoksa None)."""
+    if not os.path.exists(durum_dosyasi): return None
+    with open(durum_dosyasi, encoding='utf-8') as dosya: return json.load(dosya).get('son_id')
+
+if __name__ == "__main__":
+    ayristirici = argparse.ArgumentParser(description="Rezervasyonları CSV veya sütunlu dosyaya akış halinde aktarır.")
+    ayristirici.add_argument("hedef", help="Yazılacak .csv veya .otlk dosyası (--oku ile okunacak .otlk dosyası)")
+    ayristirici.add_argument("--bicim", choices=("csv", "sutunlu"), help="Dosya biçimi (varsayılan: uzantıdan)")
+    ayristirici.add_argument("--baslangic", help="Bu tarihten sonra çıkışı olan konaklamalar (YYYY-MM-DD)")
+    ayristirici.add_argument("--bitis", help="Bu tarihten önce girişi olan konaklamalar (YYYY-MM-DD)")
+    ayristirici.add_argument("--son-id", type=int, help="Yalnızca ID'si bundan büyük rezervasyonlar")
+    ayristirici.add_argument("--durum", help="Artımlı aktarım: son ID bu JSON dosyasından okunur ve güncellenir")
+    ayristirici.add_argument("--parca", type=int, default=PARCA_BOYUTU, help="fetchmany / satır grubu boyutu")
+    ayristirici.add_argument("--oku", action="store_true", help="Sütunlu dosyayı CSV olarak standart çıktıya yazar")
+    ayristirici.add_argument("--sutun", action="append", help="--oku ile yalnızca bu sütunlar (tekrarlanabilir)")
+    argumanlar = ayristirici.parse_args()
+
+    if argumanlar.oku:
+        yazici = csv.writer(sys.stdout)
+        yazici.writerow(argumanlar.sutun or [ad for ad, _ in SUTUNLAR])
+        yazici.writerows(sutunlu_oku(argumanlar.hedef, argumanlar.sutun))
+        sys.exit()
+    if argumanlar.durum and argumanlar.son_id is not None: ayristirici.error("--son-id ve --durum birlikte kullanılamaz.")
+    son_id = _durumu_oku(argumanlar.durum) if argumanlar.durum else argumanlar.son_id
+    sonuc = disa_aktar(argumanlar.hedef, argumanlar.bicim, argumanlar.baslangic, argumanlar.bitis, son_id, argumanlar.parca)
+    print(f"{sonuc['satir']} rezervasyon aktarıldı ({sonuc['sure']:.2f} sn), son ID: {sonuc['son_id']}.")
+    if argumanlar.durum:
+        with open(argumanlar.durum, 'w', encoding='utf-8') as dosya:
+            json.dump({'son_id': sonuc['son_id']}, dosya)
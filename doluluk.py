@@ -0,0 +1,169 @@
+"""
+Oda × gün doluluk bit haritası (bellek içi önbellek).
+
+Her oda için bir bytearray tutulur; 1970-01-01'den itibaren her gün bir bittir.
+"X odası D1..D2 arasında boş mu?" ve "D günü tüm odaların durumu" soruları
+SQLite'a gitmeden, bit işlemleriyle cevaplanır. Önbellek veritabani.py tarafından
+kurulur ve rezervasyon/oda değişikliklerinde artımlı olarak güncellenir.
+"""
+import bisect
+import threading
+from array import array
+from datetime import date
+
+EPOCH = date(1970, 1, 1).toordinal()
+
+def gun_no(tarih_sql):
+    """'YYYY-MM-DD' tarihini 1970-01-01'den itibaren gün sayısına çevirir."""
+    return date.fromisoformat(tarih_sql).toordinal() - EPOCH
+
+def gun_tarihi(gun):
+    """Gün sayısını tekrar 'YYYY-MM-DD' metnine çevirir."""
+    return date.fromordinal(gun + EPOCH).isoformat()
+
+def _aralik_dolu_mu(satir, giris, cikis):
+    """Yardımcı: Bit satırında [giris, cikis) günlerinden herhangi biri işaretli mi?"""
+    bas = giris >> 3
+    if bas >= len(satir) or giris >= cikis: return False
+    parca = int.from_bytes(satir[bas:(cikis + 7) >> 3], 'little') >> (giris & 7)
+    return parca & ((1 << (cikis - giris)) - 1) != 0
+
+class DolulukOnbellegi:
+    """Odaların fiziksel durumu, gün bazında doluluk bitleri ve oda başına sıralı konaklama listeleri."""
+    def __init__(self, surumler):
+        self.surumler = surumler # Önbelleğin yansıttığı degisiklik_sayaci değerleri
+        self.kilit = threading.RLock()
+        self.odalar = {} # oda_no -> [oda_tipi, oda_durumu]
+        self.bitler = {} # oda_no -> bytearray
+        self.girisler, self.cikislar, self.idler = {}, {}, {} # oda_no -> giriş gününe göre sıralı array('l')
+        self.konum = {} # rezervasyon_id -> oda_no
+        self.adlar = {} # rezervasyon_id -> musteri_adi (yalnızca güncel ve gelecek konaklamalar)
+
+    @classmethod
+    def olustur(cls, conn, surumler):
+        """Önbelleği odalar ve rezervasyonlar tablolarından sıfırdan kurar."""
+        onbellek = cls(surumler)
+        for oda_no, tip, durum in conn.execute("SELECT oda_numarasi, oda_tipi, oda_durumu FROM odalar"):
+            onbellek.oda_ekle(oda_no, tip, durum)
+        # Gün numaraları üretilmiş giris_gun/cikis_gun sütunlarından gelir; ad yalnızca yakın/gelecek konaklamalar için bellekte tutulur
+        bugun = date.today().toordinal() - EPOCH
+        cursor = conn.execute("SELECT id, oda_no, giris_gun, cikis_gun, musteri_adi FROM rezervasyonlar ORDER BY oda_no, giris_tarihi, id")
+        for rez_id, oda_no, giris, cikis, ad in cursor:
+            if giris is None or cikis is None: continue # Geçersiz tarihli kayıt
+            onbellek.rezervasyon_ekle(rez_id, oda_no, giris, cikis, ad if cikis >= bugun - 1 else None)
+        return onbellek
+
+    # --- Güncelleme ---
+    def oda_ekle(self, oda_no, oda_tipi, oda_durumu):
+        """Odayı ekler veya tip/durum bilgisini günceller."""
+        with self.kilit:
+            self.odalar[oda_no] = [oda_tipi, oda_durumu]
+            if oda_no not in self.bitler:
+                self.bitler[oda_no] = bytearray()
+                self.girisler[oda_no], self.cikislar[oda_no], self.idler[oda_no] = array('l'), array('l'), array('l')
+
+    def oda_durumu_ayarla(self, oda_no, oda_durumu):
+        """Odanın fiziksel durumunu (Temiz/Kirli/Tadilatta) değiştirir."""
+        with self.kilit:
+            if oda_no in self.odalar: self.odalar[oda_no][1] = oda_durumu
+
+    def _bitleri_yaz(self, oda_no, giris, cikis, deger):
+        """Yardımcı: Odanın [giris, cikis) günlerini işaretler veya temizler."""
+        satir = self.bitler[oda_no]
+        giris = max(giris, 0)
+        if deger and len(satir) <= (cikis >> 3): satir.extend(bytes((cikis >> 3) + 1 - len(satir)))
+        for gun in range(giris, min(cikis, len(satir) * 8)):
+            if deger: satir[gun >> 3] |= 1 << (gun & 7)
+            else: satir[gun >> 3] &= ~(1 << (gun & 7)) & 0xFF
+
+    def rezervasyon_ekle(self, rez_id, oda_no, giris, cikis, musteri_adi=None):
+        """Bir konaklamayı (gün numaralarıyla) önbelleğe ekler."""
+        with self.kilit:
+            if oda_no not in self.bitler: self.oda_ekle(oda_no, None, None)
+            girisler = self.girisler[oda_no]
+            i = bisect.bisect_right(girisler, giris)
+            girisler.insert(i, giris); self.cikislar[oda_no].insert(i, cikis); self.idler[oda_no].insert(i, rez_id)
+            self._bitleri_yaz(oda_no, giris, cikis, True)
+            self.konum[rez_id] = oda_no
+            if musteri_adi is not None: self.adlar[rez_id] = musteri_adi
+
+    def rezervasyon_sil(self, rez_id):
+        """Bir konaklamayı önbellekten çıkarır; çakışan başka kayıt varsa onun günleri işaretli kalır."""
+        with self.kilit:
+            oda_no = self.konum.pop(rez_id, None)
+            self.adlar.pop(rez_id, None)
+            if oda_no is None: return
+            idler = self.idler[oda_no]
+            i = idler.index(rez_id)
+            giris, cikis = self.girisler[oda_no][i], self.cikislar[oda_no][i]
+            del idler[i]; del self.girisler[oda_no][i]; del self.cikislar[oda_no][i]
+            self._bitleri_yaz(oda_no, giris, cikis, False)
+            # Hatalı veriyle çakışan kayıtlar olabilir: aynı günleri kapsayanları yeniden işaretle
+            son = bisect.bisect_left(self.girisler[oda_no], cikis)
+            for j in range(son):
+                if self.cikislar[oda_no][j] > giris:
+                    self._bitleri_yaz(oda_no, max(giris, self.girisler[oda_no][j]), min(cikis, self.cikislar[oda_no][j]), True)
+
+    # --- Sorgular ---
+    def bos_mu(self, oda_no, giris, cikis, haric_id=None):
+        """Oda [giris, cikis) günlerinde boş mu? haric_id verilirse o rezervasyon yok sayılır."""
+        with self.kilit:
+            if oda_no not in self.bitler: return True
+            if haric_id is None or self.konum.get(haric_id) != oda_no:
+                return not _aralik_dolu_mu(self.bitler[oda_no], giris, cikis)
+            # Hariç tutulan kayıt bu odadaysa bitler yetmez, aralıklara bak
+            girisler, cikislar, idler = self.girisler[oda_no], self.cikislar[oda_no], self.idler[oda_no]
+            for j in range(bisect.bisect_left(girisler, cikis)):
+                if cikislar[j] > giris and idler[j] != haric_id: return False
+            return True
+
+    def bos_odalar(self, oda_tipi, giris, cikis, sadece_temiz=True):
+        """Verilen tipte, tarihleri boş (ve istenirse 'Temiz') odaların sıralı listesi."""
+        with self.kilit:
+            return [oda_no for oda_no, (tip, durum) in sorted(self.odalar.items())
+                    if tip == oda_tipi and (not sadece_temiz or durum == 'Temiz')
+                    and not _aralik_dolu_mu(self.bitler[oda_no], giris, cikis)]
+
+    def bos_odalar_ve_komsulari(self, oda_tipi, giris, cikis, sadece_temiz=True):
+        """
+        bos_odalar gibidir, ama her oda için (oda_no, önceki konaklamanın çıkış günü, sonraki konaklamanın
+        giriş günü) döndürür; o yanda konaklama yoksa None (oda atama bu boşluklara bakar).
+        """
+        with self.kilit:
+            sonuc = []
+            for oda_no in self.bos_odalar(oda_tipi, giris, cikis, sadece_temiz):
+                girisler = self.girisler[oda_no]
+                i = bisect.bisect_left(girisler, cikis) # Oda boş: i'den öncekiler girişten önce biter
+                sonuc.append((oda_no, self.cikislar[oda_no][i - 1] if i else None, girisler[i] if i < len(girisler) else None))
+            return sonuc
+
+    def tip_bazinda_bos_odalar(self, giris, cikis, sadece_temiz=True):
+        """Tüm tipler için tek geçişte oda_tipi -> (toplam oda sayısı, tarihleri boş odaların sıralı listesi)."""
+        with self.kilit:
+            sonuc = {}
+            for oda_no, (tip, durum) in sorted(self.odalar.items()):
+                if tip is None: continue # Odası silinmiş eski kayıtlar için açılan satır
+                kayit = sonuc.setdefault(tip, [0, []]); kayit[0] += 1
+                if (not sadece_temiz or durum == 'Temiz') and not _aralik_dolu_mu(self.bitler[oda_no], giris, cikis):
+                    kayit[1].append(oda_no)
+            return {tip: tuple(deger) for tip, deger in sonuc.items()}
+
+    def _gundeki_rezervasyon(self, oda_no, gun):
+        """Yardımcı: Odada o gün kalan rezervasyonun ID'si (yoksa None)."""
+        girisler, cikislar = self.girisler[oda_no], self.cikislar[oda_no]
+        for j in range(bisect.bisect_right(girisler, gun) - 1, -1, -1):
+            if cikislar[j] > gun: return self.idler[oda_no][j]
+        return None
+
+    def gun_durumu(self, gun):
+        """O gün için (oda_no, oda_tipi, oda_durumu, rezervasyon_id veya None, cikis_gunu) listesi."""
+        with self.kilit:
+            durumlar = []
+            for oda_no, (tip, durum) in sorted(self.odalar.items()):
+                satir = self.bitler[oda_no]
+                rez_id = cikis = None
+                if (gun >> 3) < len(satir) and gun >= 0 and satir[gun >> 3] >> (gun & 7) & 1:
+                    rez_id = self._gundeki_rezervasyon(oda_no, gun)
+                    if rez_id is not None: cikis = self.cikislar[oda_no][self.idler[oda_no].index(rez_id)]
+                durumlar.append((oda_no, tip, durum, rez_id, cikis))
+            return durumlar
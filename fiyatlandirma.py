@@ -0,0 +1,218 @@
+"""
+Fiyat planları (sezon, hafta sonu) ve uzun konaklama indirimleriyle konaklama fiyatı hesaplama.
+
+Her oda tipi için bugünden geriye TAKVIM_GECMIS_GUN, ileriye TAKVIM_GELECEK_GUN gecelik bir
+fiyat takvimi bellekte önceden hesaplanır ve önek toplamları (prefix sum) olarak tutulur:
+bir konaklamanın toplamı gece sayısından bağımsız olarak iki dizi okumasıyla bulunur.
+Takvim, fiyatı belirleyen girdiler değişince (başka bir terminalde yapılan değişiklikler dahil)
+yeniden kurulur: degisiklik_sayaci'ndaki fiyat_planlari / konaklama_indirimleri sürümleri ve oda
+tiplerinin taban fiyatları. odalar tablosu check-out ve temizlik durumlarıyla sık değiştiğinden
+sürümü yalnızca taban fiyatların yeniden okunması gerekip gerekmediğini söyler.
+
+Gece fiyatı kuralı: Planı olmayan geceler o tipteki odaların en düşük gunluk_fiyat'ıdır.
+Planlar öncelik sırasıyla (eşitse sonra eklenen) üst üste uygulanır; hafta_sonu_fiyati
+verilmişse cuma ve cumartesi geceleri onu kullanır. Uzun konaklama indirimi olarak o tip
+(veya tüm tipler) için gece sayısını karşılayan en yüksek oran toplamdan düşülür.
+"""
+import threading
+from array import array
+from datetime import date
+from itertools import accumulate
+
+import sqlite3
+
+import izleme
+import veritabani
+from doluluk import EPOCH, gun_no
+
+TAKVIM_GECMIS_GUN = 366
+TAKVIM_GELECEK_GUN = 2 * 366
+HAFTA_SONU_GECELERI = (4, 5) # date.weekday(): cuma ve cumartesi geceleri
+_IZLENEN_TABLOLAR = ('odalar', 'fiyat_planlari', 'konaklama_indirimleri')
+_TABAN_FIYAT_SORGUSU = "SELECT oda_tipi, MIN(gunluk_fiyat) FROM odalar GROUP BY oda_tipi"
+
+def _hafta_gunu(gun):
+    """Yardımcı: Gün numarasının haftanın hangi günü olduğu (pazartesi=0). 1970-01-01 perşembedir."""
+    return (gun + 3) % 7
+
+class FiyatTakvimi:
+    """Oda tipi başına gecelik fiyatların önek toplamları, planlar ve indirim kuralları."""
+    def __init__(self, surumler, ilk_gun, gun_sayisi):
+        self.surumler = surumler # Takvimin yansıttığı degisiklik_sayaci değerleri
+        self.ilk_gun, self.gun_sayisi = ilk_gun, gun_sayisi
+        self.taban = {} # oda_tipi -> planı olmayan gecelerin fiyatı
+        self.planlar = {} # oda_tipi -> [(baslangic_gun, bitis_gun, fiyat, hafta_sonu_fiyati)] uygulama sırasıyla
+        self.toplamlar = {} # oda_tipi -> array('d'): toplamlar[i] = ilk_gun'den itibaren ilk i gecenin toplamı
+        self.indirimler = {} # oda_tipi (None: tümü) -> [(en_az_gece, oran)]
+
+    @classmethod
+    def olustur(cls, conn, surumler):
+        """Takvimi odalar, fiyat_planlari ve konaklama_indirimleri tablolarından kurar."""
+        bugun = date.today().toordinal() - EPOCH
+        takvim = cls(surumler, bugun - TAKVIM_GECMIS_GUN, TAKVIM_GECMIS_GUN + TAKVIM_GELECEK_GUN)
+        takvim.taban = dict(conn.execute(_TABAN_FIYAT_SORGUSU))
+        for tip, bas, bit, fiyat, hafta_sonu in conn.execute("""
+                SELECT oda_tipi, baslangic_tarihi, bitis_tarihi, gunluk_fiyat, hafta_sonu_fiyati
+                FROM fiyat_planlari ORDER BY oncelik, id"""):
+            takvim.planlar.setdefault(tip, []).append((gun_no(bas), gun_no(bit), fiyat, hafta_sonu))
+        for tip, en_az_gece, oran in conn.execute("SELECT oda_tipi, en_az_gece, indirim_orani FROM konaklama_indirimleri"):
+            takvim.indirimler.setdefault(tip, []).append((en_az_gece, oran))
+        for tip in set(takvim.taban) | set(takvim.planlar):
+            takvim.toplamlar[tip] = array('d', accumulate(takvim._geceler(tip, takvim.ilk_gun, takvim.ilk_gun + takvim.gun_sayisi), initial=0.0))
+        return takvim
+
+    def _geceler(self, oda_tipi, giris, cikis):
+        """Yardımcı: [giris, cikis) gecelerinin fiyat listesi (takvim dışı tarihler için de çalışır)."""
+        geceler = [self.taban.get(oda_tipi) or 0.0] * max(cikis - giris, 0)
+        for bas, bit, fiyat, hafta_sonu in self.planlar.get(oda_tipi, ()):
+            for gun in range(max(bas, giris), min(bit, cikis)):
+                geceler[gun - giris] = hafta_sonu if hafta_sonu is not None and _hafta_gunu(gun) in HAFTA_SONU_GECELERI else fiyat
+        return geceler
+
+    def indirim_orani(self, oda_tipi, gece_sayisi):
+        """Gece sayısına uyan en yüksek uzun konaklama indirimi (yoksa 0)."""
+        return max((oran for kurallar in (self.indirimler.get(oda_tipi, ()), self.indirimler.get(None, ()))
+                    for en_az_gece, oran in kurallar if gece_sayisi >= en_az_gece), default=0.0)
+
+    def ham_toplam(self, oda_tipi, giris, cikis):
+        """[giris, cikis) gecelerinin indirimsiz toplamı (gün numaralarıyla)."""
+        toplamlar = self.toplamlar.get(oda_tipi)
+        if toplamlar is None: return 0.0 # Bilinmeyen tip
+        bas, son = giris - self.ilk_gun, cikis - self.ilk_gun
+        if 0 <= bas <= son <= self.gun_sayisi: return toplamlar[son] - toplamlar[bas]
+        return sum(self._geceler(oda_tipi, giris, cikis)) # Takvim penceresi dışında: gece gece hesapla
+
+    def konaklama_fiyati(self, oda_tipi, giris, cikis):
+        """'YYYY-MM-DD' tarihli konaklamanın indirimli toplam fiyatı (bilinmeyen tipte 0)."""
+        giris, cikis = gun_no(giris), gun_no(cikis)
+        toplam = self.ham_toplam(oda_tipi, giris, cikis)
+        return round(toplam * (1 - self.indirim_orani(oda_tipi, cikis - giris)), 2)
+
+_takvim = None # (DB_NAME, FiyatTakvimi)
+_takvim_kilidi = threading.Lock()
+
+@izleme.olculur
+def fiyat_takvimi():
+    """Veritabanıyla aynı fiyat girdilerindeki takvimi döndürür; gerekirse yeniden kurar."""
+    global _takvim
+    with veritabani.baglanti() as conn:
+        surumler = veritabani._surumleri_oku(conn, _IZLENEN_TABLOLAR)
+        with _takvim_kilidi:
+            takvim = _takvim[1] if _takvim is not None and _takvim[0] == veritabani.DB_NAME else None
+            if takvim is not None and any(takvim.surumler.get(t) != surumler.get(t) for t in _IZLENEN_TABLOLAR if t != 'odalar'):
+                takvim = None
+            if takvim is not None and takvim.surumler.get('odalar') != surumler.get('odalar'):
+                # Oda değişikliklerinin çoğu (check-out, temizlik) fiyatı etkilemez: taban fiyatlar aynıysa takvim kalır
+                if dict(conn.execute(_TABAN_FIYAT_SORGUSU)) == takvim.taban: takvim.surumler = surumler
+                else: takvim = None
+            if takvim is None:
+                _takvim = (veritabani.DB_NAME, FiyatTakvimi.olustur(conn, surumler))
+            return _takvim[1]
+
+def fiyat_takvimini_sifirla():
+    """Fiyat takvimini bırakır; bir sonraki hesaplama onu veritabanından yeniden kurar."""
+    global _takvim
+    with _takvim_kilidi: _takvim = None
+
+# --- FİYAT HESAPLAMA ---
+
+@izleme.olculur
+def konaklama_fiyati(oda_tipi, giris, cikis):
+    """Bir konaklamanın (plan, hafta sonu ve uzun konaklama indirimi uygulanmış) toplam fiyatı. Hata olursa 0."""
+    try:
+        return fiyat_takvimi().konaklama_fiyati(oda_tipi, giris, cikis)
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Konaklama fiyatı hesaplanırken hata: {e}")
+        return 0
+
+@izleme.olculur
+def konaklama_fiyatlari(talepler):
+    """[(oda_tipi, giris, cikis), ...] için toplam fiyat listesi; sürüm kontrolü bir kez yapılır (gelir yönetimi). Hata olursa boş liste."""
+    try:
+        takvim = fiyat_takvimi()
+        return [takvim.konaklama_fiyati(oda_tipi, giris, cikis) for oda_tipi, giris, cikis in talepler]
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Konaklama fiyatları hesaplanırken hata: {e}")
+        return []
+
+@izleme.olculur
+def gecelik_fiyatlar(oda_tipi, giris, cikis):
+    """Konaklamanın gece gece (indirimsiz) fiyat listesi; fiyat dökümü göstermek için. Hata olursa boş liste."""
+    try:
+        takvim = fiyat_takvimi()
+        giris, cikis = gun_no(giris), gun_no(cikis)
+        toplamlar, bas = takvim.toplamlar.get(oda_tipi), giris - takvim.ilk_gun
+        if toplamlar is not None and 0 <= bas <= cikis - takvim.ilk_gun <= takvim.gun_sayisi:
+            return [toplamlar[i + 1] - toplamlar[i] for i in range(bas, cikis - takvim.ilk_gun)]
+        return takvim._geceler(oda_tipi, giris, cikis)
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Gecelik fiyatlar hesaplanırken hata: {e}")
+        return []
+
+# --- PLAN VE İNDİRİM YÖNETİMİ ---
+
+@izleme.olculur
+def fiyat_plani_ekle(oda_tipi, baslangic, bitis, gunluk_fiyat, hafta_sonu_fiyati=None, oncelik=0, aciklama=""):
+    """[baslangic, bitis) geceleri için bir fiyat planı ekler ve ID'sini döndürür."""
+    try:
+        with veritabani.yazma_islemi() as conn:
+            return conn.execute("""
+                INSERT INTO fiyat_planlari (oda_tipi, baslangic_tarihi, bitis_tarihi, gunluk_fiyat, hafta_sonu_fiyati, oncelik, aciklama)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (oda_tipi, baslangic, bitis, gunluk_fiyat, hafta_sonu_fiyati, oncelik, aciklama)).lastrowid
+    except sqlite3.Error as e:
+        print(f"Fiyat planı eklenirken hata: {e}")
+        raise
+
+@izleme.olculur
+def fiyat_planlarini_cek(oda_tipi=None):
+    """Fiyat planlarını (isteğe bağlı olarak bir tip için) başlangıç tarihine göre listeler."""
+    try:
+        with veritabani.baglanti() as conn:
+            sorgu = "SELECT id, oda_tipi, baslangic_tarihi, bitis_tarihi, gunluk_fiyat, hafta_sonu_fiyati, oncelik, aciklama FROM fiyat_planlari"
+            if oda_tipi is None: return conn.execute(sorgu + " ORDER BY baslangic_tarihi, id").fetchall()
+            return conn.execute(sorgu + " WHERE oda_tipi = ? ORDER BY baslangic_tarihi, id", (oda_tipi,)).fetchall()
+    except sqlite3.Error as e:
+        print(f"Fiyat planları çekilirken hata: {e}")
+        return []
+
+@izleme.olculur
+def fiyat_plani_sil(plan_id):
+    """Bir fiyat planını siler."""
+    try:
+        with veritabani.yazma_islemi() as conn:
+            conn.execute("DELETE FROM fiyat_planlari WHERE id = ?", (plan_id,))
+    except sqlite3.Error as e:
+        print(f"Fiyat planı silinirken hata: {e}")
+        raise
+
+@izleme.olculur
+def konaklama_indirimi_ekle(en_az_gece, indirim_orani, oda_tipi=None):
+    """En az 'en_az_gece' gecelik konaklamalara indirim_orani (0.10 = %10) indirimi ekler; oda_tipi None ise tüm tipler."""
+    try:
+        with veritabani.yazma_islemi() as conn:
+            return conn.execute("INSERT INTO konaklama_indirimleri (oda_tipi, en_az_gece, indirim_orani) VALUES (?, ?, ?)",
+                                (oda_tipi, en_az_gece, indirim_orani)).lastrowid
+    except sqlite3.Error as e:
+        print(f"Konaklama indirimi eklenirken hata: {e}")
+        raise
+
+@izleme.olculur
+def konaklama_indirimlerini_cek():
+    """Uzun konaklama indirimlerini listeler."""
+    try:
+        with veritabani.baglanti() as conn:
+            return conn.execute("SELECT id, oda_tipi, en_az_gece, indirim_orani FROM konaklama_indirimleri ORDER BY oda_tipi, en_az_gece").fetchall()
+    except sqlite3.Error as e:
+        print(f"Konaklama indirimleri çekilirken hata: {e}")
+        return []
+
+@izleme.olculur
+def konaklama_indirimi_sil(indirim_id):
+    """Bir uzun konaklama indirimini siler."""
+    try:
+        with veritabani.yazma_islemi() as conn:
+            conn.execute("DELETE FROM konaklama_indirimleri WHERE id = ?", (indirim_id,))
+    except sqlite3.Error as e:
+        print(f"Konaklama indirimi silinirken hata: {e}")
+        raise
@@ -0,0 +1,169 @@
+"""
+Veri katmanı için isteğe bağlı ölçüm (izleme) katmanı.
+
+@olculur ile işaretlenen fonksiyonlar (veritabani.py, fiyatlandirma.py, raporlama.py) izleme
+açıkken her çağrı için bir kayıt üretir. Kayıtta şunlar bulunur:
+- süre ve bağlantı/yazma kilidi için beklenen süre;
+- dönen satır sayısı ve değişen satır sayısı (total_changes farkı);
+- çalışan SQL metinleri (sqlite3 trace callback) ve SQLite sanal makine adım sayısı
+  (progress handler, ILERLEME_ADIMI komutta bir).
+PLAN_ESIGI_MS'yi aşan çağrıların SELECT'leri için EXPLAIN QUERY PLAN da alınır.
+
+Kayıtlar 'otel.izleme' logger'ına yazılır: her çağrı DEBUG, YAVAS_ESIGI_MS'yi aşanlar WARNING
+seviyesinde. ac(jsonl_dosyasi=...) ile ayrıca dönen (rotating) bir JSONL dosyasına da yazılır.
+Son SON_KAYIT_SAYISI kayıt bellekte tutulur (Tanılama penceresi bunları gösterir).
+
+İzleme kapalıyken maliyet çağrı başına bir bayrak kontrolüdür. Bağlantılardaki geri çağırımlar
+kapatıldığında kaldırılır (bkz. geri_cagirimlari_kur).
+"""
+import functools
+import json
+import logging
+import logging.handlers
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+AKTIF = False
+YAVAS_ESIGI_MS = 100 # Bu süreyi aşan çağrılar WARNING olarak yazılır
+PLAN_ESIGI_MS = 50 # Bu süreyi aşan çağrıların SELECT'leri için EXPLAIN QUERY PLAN alınır
+ILERLEME_ADIMI = 1000 # progress handler kaç sanal makine komutunda bir çağrılır
+SON_KAYIT_SAYISI = 500
+KAYIT_BASINA_SORGU = 50 # Bir kayıtta saklanan en fazla SQL metni (executemany binlerce üretebilir)
+JSONL_BOYUTU = 5 * 1024 * 1024 # Dönen JSONL dosyasının en fazla boyutu (bayt) ve yedek sayısı
+JSONL_YEDEK = 3
+
+gunluk = logging.getLogger("otel.izleme")
+_jsonl_gunlugu = logging.getLogger("otel.izleme.jsonl")
+_jsonl_gunlugu.propagate = False # JSON satırları normal günlüğe karışmasın
+_jsonl_gunlugu.setLevel(logging.INFO)
+
+surum = 0 # ac()/kapat() her çağrıldığında artar; bağlantılar geri çağırımlarını buna göre günceller
+_son_kayitlar = deque(maxlen=SON_KAYIT_SAYISI)
+_yerel = threading.local() # Bu thread'de ölçülmekte olan çağrının kaydı
+
+def ac(jsonl_dosyasi=None):
+    """İzlemeyi açar; jsonl_dosyasi verilirse kayıtlar ayrıca o dosyaya satır satır JSON olarak yazılır."""
+    global AKTIF, surum
+    _jsonl_kapat()
+    if jsonl_dosyasi:
+        isleyici = logging.handlers.RotatingFileHandler(jsonl_dosyasi, maxBytes=JSONL_BOYUTU, backupCount=JSONL_YEDEK, encoding="utf-8")
+        isleyici.setFormatter(logging.Formatter("%(message)s"))
+        _jsonl_gunlugu.addHandler(isleyici)
+    AKTIF = True; surum += 1
+
+def kapat():
+    """İzlemeyi kapatır; bağlantılar geri çağırımlarını bir sonraki kullanımda kaldırır."""
+    global AKTIF, surum
+    AKTIF = False; surum += 1
+    _jsonl_kapat()
+
+def _jsonl_kapat():
+    """Yardımcı: JSONL dosya işleyicilerini kaldırır ve kapatır."""
+    for isleyici in list(_jsonl_gunlugu.handlers):
+        _jsonl_gunlugu.removeHandler(isleyici); isleyici.close()
+
+def geri_cagirimlari_kur(conn):
+    """
+    Bağlantıya izleme durumuna uygun trace/progress geri çağırımlarını kurar (kapalıysa kaldırır)
+    ve kurulan sürümü döndürür. veritabani.baglanti() bunu yalnızca sürüm değiştiğinde çağırır.
+    """
+    if AKTIF:
+        conn.set_trace_callback(lambda sql: _sql_izle(conn, sql))
+        conn.set_progress_handler(_ilerleme, ILERLEME_ADIMI)
+    else:
+        conn.set_trace_callback(None)
+        conn.set_progress_handler(None, 0)
+    return surum
+
+def _sql_izle(conn, sql):
+    """trace callback: Ölçülen bir çağrı varsa SQL metnini (parametreleri yerleştirilmiş) kaydeder."""
+    kayit = getattr(_yerel, 'kayit', None)
+    if kayit is None: return
+    if kayit['_baglanti'] is None: # Değişen satırlar bu bağlantının sayacından hesaplanır
+        kayit['_baglanti'], kayit['_degisiklik'] = conn, conn.total_changes
+    kayit['sorgu_sayisi'] += 1
+    if len(kayit['sorgular']) < KAYIT_BASINA_SORGU:
+        kayit['sorgular'].append((round((time.perf_counter() - kayit['_baslangic']) * 1000, 3), sql))
+
+def _ilerleme():
+    """progress handler: Sanal makine adımlarını sayar; 0 döndürmek sorgunun devam etmesi demektir."""
+    kayit = getattr(_yerel, 'kayit', None)
+    if kayit is not None: kayit['adim'] += ILERLEME_ADIMI
+    return 0
+
+def bekleme_ekle(saniye):
+    """Ölçülen çağrının bağlantı/kilit bekleme süresine ekler (veritabani.yazma_islemi çağırır)."""
+    kayit = getattr(_yerel, 'kayit', None)
+    if kayit is not None: kayit['bekleme_ms'] += saniye * 1000
+
+def olculur(fonksiyon):
+    """Dekoratör: İzleme açıkken çağrıyı ölçer. İç içe ölçülen çağrılar en dıştakinin kaydına katılır."""
+    @functools.wraps(fonksiyon)
+    def sarmalayici(*args, **kwargs):
+        if not AKTIF or getattr(_yerel, 'kayit', None) is not None:
+            return fonksiyon(*args, **kwargs)
+        return _olcerek_cagir(fonksiyon, args, kwargs)
+    return sarmalayici
+
+def _olcerek_cagir(fonksiyon, args, kwargs):
+    """Yardımcı: Çağrıyı bu thread'in kaydı açıkken çalıştırır; SQL ve adımlar geri çağırımlarla bu kayda yazılır."""
+    kayit = {'fonksiyon': f"{fonksiyon.__module__}.{fonksiyon.__name__}", 'zaman': datetime.now().isoformat(timespec='milliseconds'),
+             'thread': threading.current_thread().name, 'sure_ms': 0.0, 'bekleme_ms': 0.0, 'satir': None, 'degisen': 0,
+             'adim': 0, 'sorgu_sayisi': 0, 'sorgular': [], 'planlar': {}, 'hata': None,
+             '_baslangic': time.perf_counter(), '_baglanti': None, '_degisiklik': 0}
+    _yerel.kayit = kayit
+    try:
+        sonuc = fonksiyon(*args, **kwargs)
+        if isinstance(sonuc, (list, tuple, dict)): kayit['satir'] = len(sonuc)
+        return sonuc
+    except BaseException as e:
+        kayit['hata'] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _yerel.kayit = None
+        _kaydi_bitir(kayit)
+
+def _kaydi_bitir(kayit):
+    """Yardımcı: Süreyi ve değişen satırları hesaplar, gerekirse sorgu planlarını alır ve kaydı yayınlar."""
+    kayit['sure_ms'] = round((time.perf_counter() - kayit.pop('_baslangic')) * 1000, 3)
+    kayit['bekleme_ms'] = round(kayit['bekleme_ms'], 3)
+    conn, baslangic_degisikligi = kayit.pop('_baglanti'), kayit.pop('_degisiklik')
+    if conn is not None:
+        try:
+            kayit['degisen'] = conn.total_changes - baslangic_degisikligi
+            if kayit['sure_ms'] >= PLAN_ESIGI_MS: kayit['planlar'] = _sorgu_planlari(conn, kayit['sorgular'])
+        except sqlite3.Error: pass # Bağlantı bu arada kapatılmış olabilir
+    _son_kayitlar.append(kayit)
+    if kayit['sure_ms'] >= YAVAS_ESIGI_MS:
+        gunluk.warning("Yavaş çağrı: %s %.1f ms (bekleme %.1f ms, %d sorgu, %s satır)", kayit['fonksiyon'], kayit['sure_ms'],
+                       kayit['bekleme_ms'], kayit['sorgu_sayisi'], kayit['satir'] if kayit['satir'] is not None else kayit['degisen'])
+    elif gunluk.isEnabledFor(logging.DEBUG):
+        gunluk.debug("%s %.2f ms (%d sorgu)", kayit['fonksiyon'], kayit['sure_ms'], kayit['sorgu_sayisi'])
+    if _jsonl_gunlugu.handlers:
+        _jsonl_gunlugu.info(json.dumps(kayit, ensure_ascii=False))
+
+def _sorgu_planlari(conn, sorgular):
+    """Yardımcı: Kayıttaki farklı SELECT'lerin EXPLAIN QUERY PLAN çıktısı: {sql: [plan satırları]}."""
+    planlar = {}
+    for _, sql in sorgular:
+        if sql in planlar or sql.lstrip()[:6].upper() not in ('SELECT', 'WITH'): continue
+        try:
+            planlar[sql] = [satir[3] for satir in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+        except sqlite3.Error as e:
+            planlar[sql] = [f"Plan alınamadı: {e}"]
+    return planlar
+
+def son_kayitlar():
+    """Bellekteki son kayıtlar (eskiden yeniye)."""
+    return list(_son_kayitlar)
+
+def en_yavas_kayitlar(adet=50):
+    """Bellekteki son kayıtların en yavaş 'adet' tanesi."""
+    return sorted(_son_kayitlar, key=lambda kayit: kayit['sure_ms'], reverse=True)[:adet]
+
+def kayitlari_temizle():
+    """Bellekteki kayıtları siler."""
+    _son_kayitlar.clear()
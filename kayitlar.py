@@ -0,0 +1,91 @@
+"""
+Veri katmanının döndürdüğü satırlar için bellek dostu kayıt tipleri (Rezervasyon, Oda).
+
+Kayıtlar __slots__ kullanır, yani satır başına sözlük tutulmaz. Demet gibi de davranırlar:
+kayit[4], açma (a, b, ... = kayit), len() ve demetle karşılaştırma eski kodda olduğu gibi
+çalışır. Yeni kod alan adlarını kullanmalıdır (kayit.giris_tarihi).
+
+SQLite her satır için yeni str nesneleri üretir. satirdan() tekrar eden değerleri (oda no, oda
+tipi, tarihler, ödeme durumu) sys.intern ile paylaştırır. Bir yıllık rezervasyonda bunlar birkaç
+bin farklı değerdir, bu yüzden satır başına yalnızca müşteri adı ve fiyat yeni nesne olarak kalır.
+Gösterim metinleri kayıtta saklanmaz; gosterim() istendiğinde üretir ve tarih çevirisi farklı
+tarih başına bir kez yapılır (tarih_gosterimi).
+
+satirdan() sqlite3 row_factory imzasındadır (cursor, satir); veritabani.py sorgu sütunlarını
+__slots__ sırasıyla seçer.
+"""
+import functools
+import sys
+from datetime import datetime
+
+def _paylas(deger):
+    """Yardımcı: Metinleri ortak (intern edilmiş) nesneye çevirir; None ve sayılar olduğu gibi kalır."""
+    return sys.intern(deger) if deger.__class__ is str else deger
+
+@functools.lru_cache(maxsize=4096)
+def tarih_gosterimi(tarih_sql, hedef_format="%d.%m.%Y"):
+    """
+    Veritabanındaki 'YYYY-MM-DD' tarihini gösterim formatına çevirir (geçersizse boş metin).
+    Konaklamalar tarihleri paylaştığından çeviri maliyeti satır sayısıyla değil, farklı tarih sayısıyla artar.
+    """
+    try: return datetime.strptime(tarih_sql, "%Y-%m-%d").strftime(hedef_format)
+    except (TypeError, ValueError): return ""
+
+class _Kayit:
+    """Ortak demet davranışı; alt sınıflar yalnızca __slots__ ve __init__ tanımlar."""
+    __slots__ = ()
+
+    def __getitem__(self, sira):
+        if isinstance(sira, slice): return tuple(self)[sira]
+        return getattr(self, self.__slots__[sira])
+
+    def __iter__(self):
+        return (getattr(self, alan) for alan in self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __eq__(self, diger):
+        if isinstance(diger, (tuple, _Kayit)): return tuple(self) == tuple(diger)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{alan}={getattr(self, alan)!r}' for alan in self.__slots__)})"
+
+    def sozluk(self):
+        """Alan adı -> değer sözlüğü (JSON çıktısı için)."""
+        return {alan: getattr(self, alan) for alan in self.__slots__}
+
+class Rezervasyon(_Kayit):
+    """Listeleme, arama ve sayfalama sorgularının döndürdüğü rezervasyon satırı."""
+    __slots__ = ('id', 'musteri_adi', 'oda_tipi', 'oda_no', 'giris_tarihi', 'cikis_tarihi', 'toplam_fiyat', 'odeme_durumu')
+
+    def __init__(self, id, musteri_adi, oda_tipi, oda_no, giris_tarihi, cikis_tarihi, toplam_fiyat, odeme_durumu):
+        self.id, self.musteri_adi, self.oda_tipi, self.oda_no = id, musteri_adi, oda_tipi, oda_no
+        self.giris_tarihi, self.cikis_tarihi, self.toplam_fiyat, self.odeme_durumu = giris_tarihi, cikis_tarihi, toplam_fiyat, odeme_durumu
+
+    @classmethod
+    def satirdan(cls, cursor, satir):
+        """row_factory: (id, musteri_adi, oda_tipi, oda_no, giris, cikis, fiyat, odeme) satırından kayıt."""
+        ortak = sys.intern # oda_no, tarihler ve ödeme durumu NOT NULL; oda_tipi LEFT JOIN'de None olabilir
+        return cls(satir[0], satir[1], _paylas(satir[2]), ortak(satir[3]), ortak(satir[4]), ortak(satir[5]), satir[6], ortak(satir[7]))
+
+    def gosterim(self):
+        """Listede gösterilecek değerler: tarihler GG.AA.YYYY, fiyat 'TL' ile."""
+        return (self.id, self.musteri_adi, self.oda_tipi, self.oda_no, tarih_gosterimi(self.giris_tarihi),
+                tarih_gosterimi(self.cikis_tarihi), f"{self.toplam_fiyat:,.2f} TL", self.odeme_durumu)
+
+class Oda(_Kayit):
+    """odalari_cek satırı."""
+    __slots__ = ('oda_numarasi', 'oda_tipi', 'gunluk_fiyat', 'oda_durumu')
+
+    def __init__(self, oda_numarasi, oda_tipi, gunluk_fiyat, oda_durumu):
+        self.oda_numarasi, self.oda_tipi, self.gunluk_fiyat, self.oda_durumu = oda_numarasi, oda_tipi, gunluk_fiyat, oda_durumu
+
+    @classmethod
+    def satirdan(cls, cursor, satir):
+        """row_factory: (oda_numarasi, oda_tipi, gunluk_fiyat, oda_durumu) satırından kayıt."""
+        return cls(_paylas(satir[0]), _paylas(satir[1]), satir[2], _paylas(satir[3]))
@@ -0,0 +1,100 @@
+"""
+Oda atama: bir konaklama için aynı tipteki boş odalardan, boş günleri en az parçalayanı seçer.
+
+Bir konaklama bir odaya yerleştirilince iki boşluk kalır. Biri önceki konaklamanın çıkışı ile
+girişin arasında, diğeri çıkış ile sonraki konaklamanın girişi arasındadır. Yerleşim maliyeti bu
+iki boşluğun gece toplamıdır; sonrasında konaklama olmayan taraf ACIK_BOSLUK gece sayılır.
+Toplam maliyeti en düşük oda seçilir (best-fit): kısa konaklamalar mevcut boşlukları doldurur,
+uzun boş aralıklar uzun konaklamalara kalır. Bugünden önceki günler satılamayacağı için soldaki
+boşluk bugünden itibaren ölçülür.
+
+Yetim geceler (1..YETIM_ESIGI gecelik, çoğu konaklamaya yetmeyen boşluklar) seçimde cezalandırılmaz:
+benzetimde ceza, toplam boşluğu büyüttüğü için satılan geceyi azalttı (bkz. benchmark.py --atama).
+gelecegi_planla() bunları ölçüt olarak kullanır: girişi bugünden sonraki konaklamaları tip içinde
+giriş sırasıyla, önceki konaklaması girişe en yakın bitmiş odaya yeniden dağıtır. Aynı tipteki
+odalar birbirinin yerine geçebildiği için bu sıra, mevcut atama mümkünse her konaklamaya bir oda
+bulur. Yalnızca yetim geceyi azaltan planlar önerilir.
+
+Tüm tarihler gün numarasıdır (bkz. doluluk.gun_no). Modül veritabanına erişmez.
+"""
+YETIM_ESIGI = 2
+ACIK_BOSLUK = 365
+
+def yerlesim_maliyeti(onceki_cikis, giris, cikis, sonraki_giris, bugun):
+    """[giris, cikis) konaklamasının bir odada bırakacağı boş gece sayısı; o yanda konaklama yoksa komşu None verilir."""
+    sol = giris - max(onceki_cikis if onceki_cikis is not None else bugun, bugun)
+    sag = min(sonraki_giris - cikis, ACIK_BOSLUK) if sonraki_giris is not None else ACIK_BOSLUK
+    return sol + sag
+
+def odalari_sirala(adaylar, giris, cikis, bugun):
+    """adaylar: (oda_no, onceki_cikis, sonraki_giris) listesi. Oda numaralarını en uygundan başlayarak sıralar."""
+    return [aday[0] for aday in sorted(adaylar, key=lambda aday: (yerlesim_maliyeti(aday[1], giris, cikis, aday[2], bugun), aday[0]))]
+
+def en_uygun_oda(adaylar, giris, cikis, bugun):
+    """En az boşluk bırakan odanın numarası (aday yoksa None)."""
+    if not adaylar: return None
+    return min(adaylar, key=lambda aday: (yerlesim_maliyeti(aday[1], giris, cikis, aday[2], bugun), aday[0]))[0]
+
+def yetim_geceler(araliklar, bugun):
+    """Bir odanın (giris, cikis) aralıklarında, bugünden sonra kalan 1..YETIM_ESIGI gecelik boşlukların toplamı."""
+    toplam, onceki = 0, bugun
+    for giris, cikis in sorted(araliklar):
+        bosluk = giris - max(onceki, bugun)
+        if 0 < bosluk <= YETIM_ESIGI: toplam += bosluk
+        onceki = max(onceki, cikis)
+    return toplam
+
+def _tipi_planla(odalar, sabitler, tasinabilirler, bugun):
+    """
+    Yardımcı: Tek bir tip için {rezervasyon_id: oda_no} planı; bir konaklama sığmazsa None.
+    sabitler: oda_no -> en geç çıkış günü; tasinabilirler: (id, oda_no, giris, cikis) listesi.
+    """
+    son_cikis = {oda_no: max(sabitler.get(oda_no, bugun), bugun) for oda_no in odalar}
+    plan = {}
+    for rez_id, mevcut_oda, giris, cikis in sorted(tasinabilirler, key=lambda r: (r[2], r[2] - r[3], r[0])):
+        # Önceki konaklaması girişe en yakın biten oda (best-fit); eşitlikte mevcut oda, sonra numara
+        adaylar = [(giris - son, oda_no != mevcut_oda, oda_no) for oda_no, son in son_cikis.items() if son <= giris]
+        if not adaylar: return None
+        oda_no = min(adaylar)[2]
+        plan[rez_id], son_cikis[oda_no] = oda_no, cikis
+    return plan
+
+def gelecegi_planla(odalar, rezervasyonlar, bugun):
+    """
+    odalar: (oda_no, oda_tipi, oda_durumu); rezervasyonlar: (id, oda_no, giris, cikis) — bugünden sonra
+    çıkışı olanlar. Girişi bugünden sonraki konaklamalar taşınabilir, diğerleri yerinde kalır; 'Tadilatta'
+    odalara yalnızca zaten oradaki konaklamalar kalabilir. {id: yeni_oda} taşımalarını,
+    planlamadan önceki ve sonraki yetim gece sayılarıyla (tasimalar, onceki, sonraki) olarak döndürür.
+    """
+    oda_tipleri = {oda_no: tip for oda_no, tip, _ in odalar}
+    tipler = {}
+    for oda_no, tip, durum in odalar:
+        tipler.setdefault(tip, {'odalar': set(), 'sabitler': {}, 'tasinabilirler': [], 'araliklar': {}})
+        if durum != 'Tadilatta': tipler[tip]['odalar'].add(oda_no)
+    for rez_id, oda_no, giris, cikis in rezervasyonlar:
+        tip = tipler.get(oda_tipleri.get(oda_no))
+        if tip is None: continue # Odası olmayan eski kayıt
+        tip['araliklar'].setdefault(oda_no, []).append((giris, cikis))
+        if giris > bugun:
+            tip['tasinabilirler'].append((rez_id, oda_no, giris, cikis)); tip['odalar'].add(oda_no)
+        else:
+            tip['sabitler'][oda_no] = max(tip['sabitler'].get(oda_no, bugun), cikis)
+
+    tasimalar, toplam_once, toplam_sonra = {}, 0, 0
+    for tip in tipler.values():
+        once = sum(yetim_geceler(araliklar, bugun) for araliklar in tip['araliklar'].values())
+        plan = _tipi_planla(tip['odalar'], tip['sabitler'], tip['tasinabilirler'], bugun)
+        sonra = once
+        if plan is not None:
+            yeni_araliklar = {}
+            for oda_no, araliklar in tip['araliklar'].items(): # Yerinde kalanlar
+                for giris, cikis in araliklar:
+                    if giris <= bugun: yeni_araliklar.setdefault(oda_no, []).append((giris, cikis))
+            for rez_id, _, giris, cikis in tip['tasinabilirler']:
+                yeni_araliklar.setdefault(plan[rez_id], []).append((giris, cikis))
+            sonra = sum(yetim_geceler(araliklar, bugun) for araliklar in yeni_araliklar.values())
+            if sonra < once:
+                tasimalar.update((rez_id, plan[rez_id]) for rez_id, oda_no, _, _ in tip['tasinabilirler'] if plan[rez_id] != oda_no)
+            else: sonra = once # İyileşme yoksa bu tipte kimse taşınmaz
+        toplam_once += once; toplam_sonra += sonra
+    return tasimalar, toplam_once, toplam_sonra
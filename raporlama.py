@@ -0,0 +1,90 @@
+"""
+Doluluk ve gelir raporları: doluluk oranı, ADR (satılan oda başına ortalama gelir) ve
+RevPAR (mevcut oda başına gelir).
+
+Raporlar rezervasyonları taramaz; gunluk_ozet tablosundaki gün × oda tipi satırlarını toplar.
+Bu tablo rezervasyon ve oda değişikliklerinde tetikleyicilerle aynı işlem içinde güncellenir
+(bkz. veritabani._gecis_6_gunluk_ozet), bu yüzden bir aylık rapor en fazla 31 × tip sayısı,
+yıllık rapor 366 × tip sayısı satır okur. Oda sayısı olarak bugünkü odalar tablosu kullanılır.
+arsiv_dahil=True ile arşive taşınmış rezervasyonlar da sayılır (bkz. arsivleme.py); onların katkısı
+dönemle çakışan arşiv satırlarından hesaplanır.
+"""
+import calendar
+import sqlite3
+from datetime import date
+
+import izleme
+import veritabani
+
+def _gostergeler(satilan, gelir, kapasite):
+    """Yardımcı: (doluluk oranı, ADR, RevPAR); kapasite = oda sayısı × gün sayısı."""
+    return (satilan / kapasite if kapasite else 0.0,
+            gelir / satilan if satilan else 0.0,
+            gelir / kapasite if kapasite else 0.0)
+
+@izleme.olculur
+def donem_raporu(baslangic, bitis, arsiv_dahil=False):
+    """
+    [baslangic, bitis) günleri için oda tipi başına
+    (oda_tipi, oda_sayisi, satilan_gece, gelir, doluluk_orani, adr, revpar) listesi; son satır 'Toplam'.
+    """
+    try:
+        gun_sayisi = (date.fromisoformat(bitis) - date.fromisoformat(baslangic)).days
+        with veritabani.baglanti() as conn:
+            oda_sayilari = dict(conn.execute("SELECT oda_tipi, COUNT(*) FROM odalar GROUP BY oda_tipi"))
+            kaynak, parametreler = veritabani._ozet_kaynagi(conn, baslangic, bitis, arsiv_dahil)
+            satislar = {tip: (satilan, gelir) for tip, satilan, gelir in conn.execute(f"""
+                SELECT oda_tipi, SUM(satilan_oda), TOTAL(gelir) FROM {kaynak}
+                WHERE gun >= ? AND gun < ? GROUP BY oda_tipi
+            """, parametreler + [baslangic, bitis])}
+        rapor = []
+        for tip in sorted(set(oda_sayilari) | set(satislar)):
+            satilan, gelir = satislar.get(tip, (0, 0.0))
+            oda_sayisi = oda_sayilari.get(tip, 0)
+            rapor.append((tip, oda_sayisi, satilan, gelir) + _gostergeler(satilan, gelir, oda_sayisi * gun_sayisi))
+        toplam_oda, toplam_satilan, toplam_gelir = (sum(satir[i] for satir in rapor) for i in (1, 2, 3))
+        rapor.append(('Toplam', toplam_oda, toplam_satilan, toplam_gelir) + _gostergeler(toplam_satilan, toplam_gelir, toplam_oda * gun_sayisi))
+        return rapor
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Dönem raporu hazırlanırken hata: {e}")
+        return []
+
+@izleme.olculur
+def aylik_rapor(yil, ay, arsiv_dahil=False):
+    """Bir ayın oda tipi bazında raporu (bkz. donem_raporu)."""
+    return donem_raporu(date(yil, ay, 1).isoformat(), date(yil + ay // 12, ay % 12 + 1, 1).isoformat(), arsiv_dahil)
+
+@izleme.olculur
+def yillik_rapor(yil, arsiv_dahil=False):
+    """Bir yılın ay ay toplam raporu: (ay, oda_sayisi, satilan_gece, gelir, doluluk_orani, adr, revpar) listesi; son satır 'Toplam'."""
+    try:
+        with veritabani.baglanti() as conn:
+            oda_sayisi = conn.execute("SELECT COUNT(*) FROM odalar").fetchone()[0]
+            donem = [f"{yil:04d}-01-01", f"{yil + 1:04d}-01-01"]
+            kaynak, parametreler = veritabani._ozet_kaynagi(conn, *donem, arsiv_dahil)
+            satislar = {int(ay): (satilan, gelir) for ay, satilan, gelir in conn.execute(f"""
+                SELECT substr(gun, 6, 2), SUM(satilan_oda), TOTAL(gelir) FROM {kaynak}
+                WHERE gun >= ? AND gun < ? GROUP BY substr(gun, 6, 2)
+            """, parametreler + donem)}
+        rapor = []
+        for ay in range(1, 13):
+            satilan, gelir = satislar.get(ay, (0, 0.0))
+            kapasite = oda_sayisi * calendar.monthrange(yil, ay)[1]
+            rapor.append((ay, oda_sayisi, satilan, gelir) + _gostergeler(satilan, gelir, kapasite))
+        toplam_satilan, toplam_gelir = sum(satir[2] for satir in rapor), sum(satir[3] for satir in rapor)
+        kapasite = oda_sayisi * (366 if calendar.isleap(yil) else 365)
+        rapor.append(('Toplam', oda_sayisi, toplam_satilan, toplam_gelir) + _gostergeler(toplam_satilan, toplam_gelir, kapasite))
+        return rapor
+    except sqlite3.Error as e:
+        print(f"Yıllık rapor hazırlanırken hata: {e}")
+        return []
+
+@izleme.olculur
+def gunluk_ozeti_yeniden_kur():
+    """gunluk_ozet tablosunu rezervasyonlardan baştan hesaplar (örn. tetikleyiciler dışında değiştirilmiş veriden sonra)."""
+    try:
+        with veritabani.yazma_islemi() as conn:
+            veritabani._gunluk_ozeti_doldur(conn.cursor())
+    except sqlite3.Error as e:
+        print(f"Rapor özeti yeniden kurulurken hata: {e}")
+        raise
@@ -0,0 +1,112 @@
+"""
+Ölçüm ve deneme için gerçekçi, sentetik otel veritabanı üretir.
+
+Odalar tiplere (Tek/Çift/Suit) bölünür. Her oda için bugünden GELECEK_GUN sonrasından geriye
+doğru, birbirine değmeyen konaklamalar üretilir. İki konaklama arasındaki boş gün sayısı ayın
+sezon katsayısına göre değişir, bu yüzden yaz ayları dolu, kış ayları boştur. Fiyat oda tipi ×
+sezon katsayısı × gece sayısıdır. iptal_orani kadar ek rezervasyon önce eklenir, sonra silinir.
+Bu, gerçek sistemdeki gibi ID boşlukları ve arama indeksinde silinmiş satırlar bırakır.
+
+Kullanım:  python sentetik_veri.py hedef.db [--rezervasyon 100000] [--oda 120 | --yil 5] [--iptal 0.1]
+"""
+import argparse
+import os
+import random
+from datetime import date, timedelta
+
+import veritabani
+
+ODA_TIPLERI = [('Tek Kişilik', 1500, 0.4), ('Çift Kişilik', 2500, 0.45), ('Suit', 4000, 0.15)] # (tip, fiyat, oran)
+# Ay -> sezon katsayısı (doluluk ve fiyat bununla çarpılır)
+SEZON = {1: 0.55, 2: 0.6, 3: 0.7, 4: 0.85, 5: 0.95, 6: 1.15, 7: 1.3, 8: 1.3, 9: 1.05, 10: 0.85, 11: 0.6, 12: 0.8}
+ADLAR = ["Ahmet", "Mehmet", "Ayşe", "Fatma", "Ali", "Zeynep", "Mustafa", "Emine", "Hüseyin", "Elif",
+         "İbrahim", "Hatice", "Can", "Şule", "Ömer", "Özlem", "Murat", "Gül", "Burak", "Çağla"]
+SOYADLAR = ["Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Yıldırım", "Öztürk", "Aydın", "Özdemir",
+            "Arslan", "Doğan", "Kılıç", "Aslan", "Çetin", "Kara", "Koç", "Kurt", "Özkan", "Şimşek"]
+GELECEK_GUN = 180 # Bugünden sonra ne kadar ileriye rezervasyon üretilir
+ORTALAMA_GECE = 3
+PARCA = 50_000 # executemany parça boyutu
+
+def oda_sayisi_hesapla(rezervasyon_sayisi, yil, doluluk):
+    """Verilen rezervasyon sayısının yaklaşık 'yil' yıla yayılması için gereken oda sayısı."""
+    gece_basina_rezervasyon = doluluk / ORTALAMA_GECE
+    return max(6, round(rezervasyon_sayisi / (yil * 365 * gece_basina_rezervasyon)))
+
+def _odalar(oda_sayisi, rastgele):
+    """Yardımcı: (oda_no, tip, fiyat, durum) listesi; katlara 100'erli numaralandırılır."""
+    odalar, sira = [], 0
+    for tip, fiyat, oran in ODA_TIPLERI:
+        for _ in range(max(1, round(oda_sayisi * oran))):
+            kat, no = divmod(sira, 100)
+            durum = rastgele.choices(['Temiz', 'Kirli', 'Tadilatta'], weights=[90, 8, 2])[0]
+            odalar.append((str((kat + 1) * 1000 + no), tip, fiyat, durum)); sira += 1
+    return odalar
+
+def _konaklamalar(odalar, rezervasyon_sayisi, doluluk, rastgele):
+    """Yardımcı: Odalara eşit dağılmış, oda başına çakışmasız rezervasyon satırları üretir."""
+    bugun = date.today()
+    for i, (oda_no, tip, fiyat, _) in enumerate(odalar):
+        adet = rezervasyon_sayisi // len(odalar) + (1 if i < rezervasyon_sayisi % len(odalar) else 0)
+        cikis = bugun + timedelta(days=GELECEK_GUN - rastgele.randint(0, 30))
+        for _ in range(adet):
+            sezon = SEZON[cikis.month]
+            gece = min(14, 1 + int(rastgele.expovariate(1 / (ORTALAMA_GECE - 1))))
+            giris = cikis - timedelta(days=gece)
+            ad = f"{rastgele.choice(ADLAR)} {rastgele.choice(SOYADLAR)}"
+            if cikis <= bugun: odeme = 'Tamamı Ödendi'
+            else: odeme = rastgele.choices(['Ödenmedi', 'Kapora Alındı', 'Tamamı Ödendi'], weights=[50, 35, 15])[0]
+            yield (ad, oda_no, giris.isoformat(), cikis.isoformat(), round(fiyat * sezon * gece, 2), odeme)
+            # Bir önceki konaklamaya kadar boş geçen gün: sezonun doluluğuna göre
+            hedef = min(0.97, doluluk * sezon)
+            bosluk = int(rastgele.expovariate(1 / max(ORTALAMA_GECE * (1 / hedef - 1), 0.1)))
+            cikis = giris - timedelta(days=bosluk)
+
+def sentetik_otel(db_yolu, rezervasyon_sayisi, oda_sayisi=None, yil=5, doluluk=0.7, iptal_orani=0.1, tohum=42):
+    """
+    db_yolu'nda (varsa silinip) sentetik bir otel veritabanı kurar. oda_sayisi verilmezse
+    rezervasyonlar yaklaşık 'yil' yıla yayılacak şekilde hesaplanır. (oda sayısı, kalan rezervasyon) döndürür.
+    """
+    rastgele = random.Random(tohum)
+    if oda_sayisi is None: oda_sayisi = oda_sayisi_hesapla(rezervasyon_sayisi, yil, doluluk)
+    for ek in ("", "-wal", "-shm"):
+        if os.path.exists(db_yolu + ek): os.remove(db_yolu + ek)
+    veritabani.DB_NAME = db_yolu
+    veritabani.doluluk_onbellegini_sifirla()
+    veritabani.veritabani_baslat()
+    odalar = _odalar(oda_sayisi, rastgele)
+    iptal_sayisi = int(rezervasyon_sayisi * iptal_orani)
+    with veritabani.yazma_islemi() as conn:
+        conn.execute("DELETE FROM odalar")
+        conn.executemany("INSERT INTO odalar VALUES (?, ?, ?, ?)", odalar)
+        parca = []
+        for satir in _konaklamalar(odalar, rezervasyon_sayisi + iptal_sayisi, doluluk, rastgele):
+            parca.append(satir)
+            if len(parca) == PARCA:
+                conn.executemany("INSERT INTO rezervasyonlar (musteri_adi, oda_no, giris_tarihi, cikis_tarihi, toplam_fiyat, odeme_durumu) VALUES (?, ?, ?, ?, ?, ?)", parca)
+                parca = []
+        conn.executemany("INSERT INTO rezervasyonlar (musteri_adi, oda_no, giris_tarihi, cikis_tarihi, toplam_fiyat, odeme_durumu) VALUES (?, ?, ?, ?, ?, ?)", parca)
+        # İptaller: rastgele seçilen kayıtlar silinir
+        son_id = conn.execute("SELECT MAX(id) FROM rezervasyonlar").fetchone()[0] or 0
+        iptaller = rastgele.sample(range(1, son_id + 1), min(iptal_sayisi, son_id))
+        conn.executemany("DELETE FROM rezervasyonlar WHERE id = ?", ((rez_id,) for rez_id in iptaller))
+    veritabani.doluluk_onbellegini_sifirla()
+    with veritabani.baglanti() as conn:
+        conn.execute("ANALYZE")
+        return len(odalar), conn.execute("SELECT COUNT(*) FROM rezervasyonlar").fetchone()[0]
+
+if __name__ == "__main__":
+    ayristirici = argparse.ArgumentParser(description="Sentetik otel veritabanı üretir.")
+    ayristirici.add_argument("hedef", help="Oluşturulacak veritabanı dosyası (varsa üzerine yazılır)")
+    ayristirici.add_argument("--rezervasyon", type=int, default=100_000)
+    ayristirici.add_argument("--oda", type=int, default=None, help="Oda sayısı (verilmezse --yil'a göre hesaplanır)")
+    ayristirici.add_argument("--yil", type=float, default=5, help="Rezervasyon geçmişinin yaklaşık kaç yıl olacağı")
+    ayristirici.add_argument("--doluluk", type=float, default=0.7, help="Sezon ortalaması doluluk oranı")
+    ayristirici.add_argument("--iptal", type=float, default=0.1, help="İptal edilip silinen rezervasyon oranı")
+    ayristirici.add_argument("--tohum", type=int, default=42)
+    argumanlar = ayristirici.parse_args()
+    if os.path.abspath(argumanlar.hedef) == os.path.abspath(veritabani.DB_NAME):
+        ayristirici.error("Gerçek veritabanının üzerine yazılamaz; başka bir dosya adı verin.")
+    oda_sayisi, kalan = sentetik_otel(argumanlar.hedef, argumanlar.rezervasyon, argumanlar.oda, argumanlar.yil,
+                                      argumanlar.doluluk, argumanlar.iptal, argumanlar.tohum)
+    print(f"{argumanlar.hedef}: {oda_sayisi} oda, {kalan} rezervasyon")
+    veritabani.tum_baglantilari_kapat()
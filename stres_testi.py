@@ -0,0 +1,92 @@
+"""
+Birden fazla resepsiyon terminalinin aynı veritabanını aynı anda kullanmasını taklit eder.
+
+Her depolama profili için geçici bir veritabanı kurulur; SURECLER kadar süreç aynı anda
+rezervasyon yapar (rezervasyon_yap_atomik), müsaitlik sorar ve liste sayfası çeker.
+Toplam işlem/saniye ile "database is locked" gibi hatalarla biten işlem sayısı yazdırılır.
+
+Kullanım:  python stres_testi.py [--surec 8] [--islem 300] [--profil klasik yerel]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+
+import veritabani
+
+YAZMA_ORANI = 0.3 # İşlemlerin ne kadarı rezervasyon (yazma), gerisi okuma
+ODA_SAYISI = 60
+
+def _veritabanini_kur(db_yolu, profil):
+    """Yardımcı: Verilen profil ile boş bir veritabanı ve ODA_SAYISI kadar oda hazırlar."""
+    veritabani.DB_NAME, veritabani.DEPOLAMA_PROFILI = db_yolu, profil
+    veritabani.veritabani_baslat()
+    tipler = [('Tek Kişilik', 1500), ('Çift Kişilik', 2500), ('Suit', 4000)]
+    with veritabani.baglanti() as conn:
+        conn.execute("DELETE FROM odalar")
+        conn.executemany("INSERT INTO odalar VALUES (?, ?, ?, 'Temiz')",
+                         [(str(100 + i), tipler[i % 3][0], tipler[i % 3][1]) for i in range(ODA_SAYISI)])
+    veritabani.tum_baglantilari_kapat()
+
+def _terminal(db_yolu, profil, islem_sayisi, baslama, sonuclar):
+    """Bir süreç (terminal): başlama işaretini bekler, karışık okuma/yazma işlemleri yapar."""
+    veritabani.DB_NAME, veritabani.DEPOLAMA_PROFILI = db_yolu, profil
+    veritabani.DOLULUK_ONBELLEGI_AKTIF = False # Depolama katmanı ölçülüyor, her sorgu SQLite'a gitsin
+    rastgele = random.Random(os.getpid())
+    bugun = date.today()
+    yazma = okuma = hata = 0
+    baslama.wait()
+    baslangic = time.perf_counter()
+    for _ in range(islem_sayisi):
+        giris = bugun + timedelta(days=rastgele.randint(0, 3650))
+        cikis = giris + timedelta(days=rastgele.randint(1, 5))
+        try:
+            if rastgele.random() < YAZMA_ORANI:
+                veritabani.rezervasyon_yap_atomik(rastgele.choice(['Tek Kişilik', 'Çift Kişilik', 'Suit']),
+                                                  giris.isoformat(), cikis.isoformat(), "Stres Testi", 1000)
+                yazma += 1
+            else:
+                with veritabani.baglanti() as conn: # Hata yutulmasın diye doğrudan sorgu
+                    conn.execute("SELECT COUNT(*) FROM rezervasyonlar WHERE oda_no = ? AND cikis_tarihi > ? AND giris_tarihi < ?",
+                                 (str(100 + rastgele.randrange(ODA_SAYISI)), giris.isoformat(), cikis.isoformat())).fetchone()
+                    conn.execute("SELECT id FROM rezervasyonlar ORDER BY giris_tarihi, id LIMIT 100").fetchall()
+                okuma += 1
+        except sqlite3.OperationalError:
+            hata += 1
+    sonuclar.put((yazma, okuma, hata, time.perf_counter() - baslangic))
+    veritabani.tum_baglantilari_kapat()
+
+def profil_olc(profil, surec_sayisi, islem_sayisi):
+    """Bir profil için tüm süreçleri aynı anda başlatır; (işlem/sn, yazma, okuma, hata) döndürür."""
+    with tempfile.TemporaryDirectory() as klasor:
+        db_yolu = os.path.join(klasor, "stres.db")
+        _veritabanini_kur(db_yolu, profil)
+        baslama, sonuclar = multiprocessing.Event(), multiprocessing.Queue()
+        surecler = [multiprocessing.Process(target=_terminal, args=(db_yolu, profil, islem_sayisi, baslama, sonuclar))
+                    for _ in range(surec_sayisi)]
+        for surec in surecler: surec.start()
+        time.sleep(0.5) # Süreçler hazır olsun
+        baslangic = time.perf_counter()
+        baslama.set()
+        toplamlar = [sonuclar.get() for _ in surecler]
+        sure = time.perf_counter() - baslangic
+        for surec in surecler: surec.join()
+    yazma, okuma, hata = (sum(t[i] for t in toplamlar) for i in range(3))
+    return (yazma + okuma) / sure, yazma, okuma, hata
+
+if __name__ == "__main__":
+    ayristirici = argparse.ArgumentParser(description="Çok süreçli eşzamanlılık stres testi.")
+    ayristirici.add_argument("--surec", type=int, default=8, help="Aynı anda çalışan terminal (süreç) sayısı")
+    ayristirici.add_argument("--islem", type=int, default=300, help="Süreç başına işlem sayısı")
+    ayristirici.add_argument("--profil", nargs="+", default=["klasik", "yerel"], choices=sorted(veritabani.DEPOLAMA_PROFILLERI))
+    argumanlar = ayristirici.parse_args()
+
+    print(f"{argumanlar.surec} süreç x {argumanlar.islem} işlem (%{YAZMA_ORANI * 100:.0f} yazma)")
+    print(f"{'Profil':>8} | {'işlem/sn':>9} | {'yazma':>6} | {'okuma':>6} | {'hata':>5}")
+    for profil in argumanlar.profil:
+        hiz, yazma, okuma, hata = profil_olc(profil, argumanlar.surec, argumanlar.islem)
+        print(f"{profil:>8} | {hiz:>9.1f} | {yazma:>6} | {okuma:>6} | {hata:>5}")
@@ -0,0 +1,229 @@
+"""
+OTA / kanal yöneticisi dökümlerini (CSV veya JSONL) toplu olarak rezervasyonlara aktarır.
+
+Dosya satır satır okunur; her parça için müsaitlik bellekteki doluluk haritasından
+kontrol edilir, odalar musait_oda_bul ile aynı kurala göre (tipi tutan, 'Temiz' ve
+boş odalardan en az boşluk bırakanı, bkz. oda_atama) atanır ve satırlar tek bir işlemde
+executemany ile yazılır. Hatalı veya
+yer bulunamayan satırlar raporlanır, aktarım durmaz.
+
+Beklenen alanlar: musteri_adi, oda_tipi, giris_tarihi, cikis_tarihi
+İsteğe bağlı alanlar: oda_no, toplam_fiyat, odeme_durumu
+
+Kullanım:  python toplu_ice_aktar.py dump.csv [--reddedilenler hatalar.jsonl]
+"""
+import argparse
+import bisect
+import csv
+import json
+import sqlite3
+import time
+from datetime import date, datetime
+
+import fiyatlandirma
+import oda_atama
+import veritabani
+from doluluk import gun_no
+
+PARCA_BOYUTU = 5000 # Her işlemde (transaction) yazılacak satır sayısı
+ODEME_DURUMLARI = ('Ödenmedi', 'Kapora Alındı', 'Tamamı Ödendi')
+TARIH_FORMATLARI = ("%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y")
+
+class DolulukHaritasi:
+    """Her oda için giriş tarihine göre sıralı, çakışmasız konaklama aralıklarını tutar."""
+    def __init__(self):
+        self.girisler = {} # oda_no -> sıralı giriş tarihleri
+        self.cikislar = {} # oda_no -> aynı sırada çıkış tarihleri
+
+    def ekle(self, oda_no, giris, cikis):
+        """Odaya yeni bir konaklama aralığı ekler."""
+        girisler = self.girisler.setdefault(oda_no, [])
+        cikislar = self.cikislar.setdefault(oda_no, [])
+        i = bisect.bisect_right(girisler, giris)
+        girisler.insert(i, giris); cikislar.insert(i, cikis)
+
+    def bos_mu(self, oda_no, giris, cikis):
+        """Oda [giris, cikis) aralığında boş mu? Aralıklar çakışmadığı için tek komşuya bakmak yeterli."""
+        girisler = self.girisler.get(oda_no)
+        if not girisler: return True
+        i = bisect.bisect_left(girisler, cikis) # Bizden önce başlayan son konaklama i-1'de
+        return i == 0 or self.cikislar[oda_no][i - 1] <= giris
+
+    def komsular(self, oda_no, giris, cikis):
+        """Boş bir aralığın (önceki konaklamanın çıkışı, sonraki konaklamanın girişi) gün numaraları; yoksa None."""
+        girisler = self.girisler.get(oda_no, [])
+        i = bisect.bisect_left(girisler, cikis)
+        return (gun_no(self.cikislar[oda_no][i - 1]) if i else None,
+                gun_no(girisler[i]) if i < len(girisler) else None)
+
+def _tarih_normalle(deger):
+    """Yardımcı: Desteklenen formatlardaki tarihi 'YYYY-MM-DD' yapar, geçersizse None döndürür."""
+    deger = (deger or "").strip()
+    if len(deger) == 10 and deger[4] == '-': # Hızlı yol: ISO tarih (dökümlerin çoğu)
+        try: return date.fromisoformat(deger).isoformat()
+        except ValueError: return None
+    for bicim in TARIH_FORMATLARI:
+        try: return datetime.strptime(deger, bicim).strftime("%Y-%m-%d")
+        except ValueError: continue
+    return None
+
+def satirlari_oku(dosya_yolu, bicim=None):
+    """Dosyayı akış halinde okur ve (satır_no, kayıt sözlüğü) çiftleri üretir."""
+    bicim = bicim or ('jsonl' if dosya_yolu.lower().endswith(('.jsonl', '.json')) else 'csv')
+    with open(dosya_yolu, encoding='utf-8-sig', newline='') as dosya:
+        if bicim == 'csv':
+            for satir_no, kayit in enumerate(csv.DictReader(dosya), start=2): # 1. satır başlık
+                yield satir_no, kayit
+        else:
+            for satir_no, satir in enumerate(dosya, start=1):
+                if not satir.strip(): continue
+                try: yield satir_no, json.loads(satir)
+                except json.JSONDecodeError as e: yield satir_no, {'_hata': f"Geçersiz JSON: {e}"}
+
+class _Aktarici:
+    """Bir aktarım çalışmasının durumunu (oda listesi, doluluk haritası, sonuçlar) tutar."""
+    def __init__(self):
+        self.odalar = {} # oda_no -> (oda_tipi, gunluk_fiyat, oda_durumu); her parçada kilit altında yeniden okunur
+        self.temiz_odalar = {} # oda_tipi -> sıralı temiz oda numaraları
+        self.harita = None
+        self.alt_sinir = None # Haritada bu tarihten sonra biten tüm konaklamalar var
+        self.surum = None # Haritanın yansıttığı degisiklik_sayaci['rezervasyonlar'] değeri
+        self.eklenen = 0
+        self.reddedilenler = [] # (satır_no, sebep)
+
+    def _odalari_yukle(self, conn):
+        """Yardımcı: Oda listesini ve tiplere göre temiz odaları (kilit altında) yeniden okur."""
+        self.odalar, self.temiz_odalar = {}, {}
+        for oda_no, tip, fiyat, durum in conn.execute("SELECT oda_numarasi, oda_tipi, gunluk_fiyat, oda_durumu FROM odalar ORDER BY oda_numarasi"):
+            self.odalar[oda_no] = (tip, fiyat, durum)
+            if durum == 'Temiz': self.temiz_odalar.setdefault(tip, []).append(oda_no)
+
+    def _haritayi_sifirla(self):
+        """Yardımcı: Haritayı ve onunla birlikte tutulan sınırları bırakır; bir sonraki parçada baştan kurulur."""
+        self.harita, self.alt_sinir, self.surum = None, None, None
+
+    def _haritayi_guncelle(self, conn, en_erken_giris):
+        """Parça yazılmadan önce (kilit altında) haritayı güncel ve gerekli tarihleri kapsar hale getirir."""
+        # Son parçadan beri başka biri rezervasyon eklediyse, taşıdıysa, sildiyse veya check-out yaptıysa
+        # haritadaki aralıklar eskimiş olabilir: harita baştan kurulur
+        if self.harita is not None and veritabani._surumleri_oku(conn, ('rezervasyonlar',)).get('rezervasyonlar') != self.surum:
+            self._haritayi_sifirla()
+        if self.harita is None:
+            self.harita = DolulukHaritasi()
+            satirlar = conn.execute("SELECT oda_no, giris_tarihi, cikis_tarihi FROM rezervasyonlar WHERE cikis_tarihi > ?", (en_erken_giris,))
+        elif en_erken_giris < self.alt_sinir: # Yalnızca haritada olmayan daha eski tarihler
+            satirlar = conn.execute("SELECT oda_no, giris_tarihi, cikis_tarihi FROM rezervasyonlar WHERE cikis_tarihi > ? AND cikis_tarihi <= ?",
+                                    (en_erken_giris, self.alt_sinir))
+        else: satirlar = ()
+        for oda_no, giris, cikis in satirlar: self.harita.ekle(oda_no, giris, cikis)
+        self.alt_sinir = en_erken_giris if self.alt_sinir is None else min(self.alt_sinir, en_erken_giris)
+
+    def _satiri_dogrula(self, kayit):
+        """Yardımcı: Satırı odadan bağımsız olarak doğrular; (ad, oda_tipi, oda_no, giris, cikis, fiyat, odeme) veya hata metni döndürür."""
+        if '_hata' in kayit: return kayit['_hata']
+        ad = str(kayit.get('musteri_adi') or "").strip()
+        oda_tipi = str(kayit.get('oda_tipi') or "").strip()
+        oda_no = str(kayit.get('oda_no') or "").strip() or None
+        odeme = str(kayit.get('odeme_durumu') or "").strip() or ODEME_DURUMLARI[0]
+        giris, cikis = _tarih_normalle(kayit.get('giris_tarihi')), _tarih_normalle(kayit.get('cikis_tarihi'))
+        if not ad: return "Müşteri adı boş."
+        if not giris or not cikis: return "Geçersiz giriş/çıkış tarihi."
+        if giris >= cikis: return "Çıkış tarihi, giriş tarihinden sonra olmalıdır."
+        if not veritabani.konaklama_tarihleri_gecerli_mi(giris, cikis): return veritabani.TARIH_ARALIGI_HATASI
+        if odeme not in ODEME_DURUMLARI: return f"Geçersiz ödeme durumu: {odeme}"
+        fiyat = kayit.get('toplam_fiyat')
+        if fiyat not in (None, ""):
+            try: fiyat = float(str(fiyat).replace(",", "."))
+            except ValueError: return f"Geçersiz fiyat: {fiyat}"
+        else: fiyat = None
+        return ad, oda_tipi, oda_no, giris, cikis, fiyat, odeme
+
+    def _odayi_dogrula(self, oda_tipi, oda_no):
+        """Yardımcı: Satırın oda/oda tipi alanlarını güncel oda listesine göre doğrular; oda tipi veya hata metni döndürür."""
+        if oda_no is not None:
+            if oda_no not in self.odalar: return None, f"Oda bulunamadı: {oda_no}"
+            if oda_tipi and self.odalar[oda_no][0] != oda_tipi: return None, f"Oda {oda_no}, '{oda_tipi}' tipinde değil."
+            return self.odalar[oda_no][0], None
+        if oda_tipi not in self.temiz_odalar: return None, f"'{oda_tipi}' tipinde temiz oda yok."
+        return oda_tipi, None
+
+    def parcayi_isle(self, parca):
+        """Bir parçayı tek işlemde doğrular, odalara atar ve yazar."""
+        reddedilenler, dogrulanmis = [], [] # Parçanın sonuçları; işlem başarısız olursa her satır bir kez raporlanır
+        for satir_no, kayit in parca:
+            sonuc = self._satiri_dogrula(kayit)
+            if isinstance(sonuc, str): reddedilenler.append((satir_no, sonuc))
+            else: dogrulanmis.append((satir_no, sonuc))
+        if not dogrulanmis:
+            self.reddedilenler.extend(reddedilenler); return
+
+        parca_reddi = [] # Oda ve doluluk yüzünden reddedilenler (işlemle birlikte geçerli)
+        try:
+            with veritabani.yazma_islemi() as conn:
+                self._odalari_yukle(conn) # Başka terminallerin oda/temizlik değişiklikleri parçaya yansısın
+                self._haritayi_guncelle(conn, min(d[1][3] for d in dogrulanmis))
+                takvim = fiyatlandirma.fiyat_takvimi() # Parça başına bir kez; fiyatlar bellekten hesaplanır
+                bugun = gun_no(date.today().isoformat())
+                yazilacaklar = []
+                for satir_no, (ad, oda_tipi, oda_no, giris, cikis, fiyat, odeme) in dogrulanmis:
+                    oda_tipi, hata = self._odayi_dogrula(oda_tipi, oda_no)
+                    if hata:
+                        parca_reddi.append((satir_no, hata)); continue
+                    if oda_no is not None:
+                        if not self.harita.bos_mu(oda_no, giris, cikis):
+                            parca_reddi.append((satir_no, f"Oda {oda_no} bu tarihlerde dolu.")); continue
+                    else:
+                        adaylar = [(o,) + self.harita.komsular(o, giris, cikis) for o in self.temiz_odalar[oda_tipi] if self.harita.bos_mu(o, giris, cikis)]
+                        oda_no = oda_atama.en_uygun_oda(adaylar, gun_no(giris), gun_no(cikis), bugun)
+                        if oda_no is None:
+                            parca_reddi.append((satir_no, f"'{oda_tipi}' tipinde boş ve temiz oda bulunamadı.")); continue
+                    if fiyat is None: # Fiyat verilmemişse oda tipinin planlı konaklama fiyatı
+                        fiyat = takvim.konaklama_fiyati(self.odalar[oda_no][0], giris, cikis)
+                    self.harita.ekle(oda_no, giris, cikis)
+                    yazilacaklar.append((ad, oda_no, giris, cikis, fiyat, odeme))
+                conn.executemany("INSERT INTO rezervasyonlar (musteri_adi, oda_no, giris_tarihi, cikis_tarihi, toplam_fiyat, odeme_durumu) VALUES (?, ?, ?, ?, ?, ?)", yazilacaklar)
+                # Kendi eklemelerimiz dahil sürüm; sonraki parçada farklıysa araya başka bir yazıcı girmiştir
+                self.surum = veritabani._surumleri_oku(conn, ('rezervasyonlar',)).get('rezervasyonlar')
+            self.eklenen += len(yazilacaklar)
+            reddedilenler += parca_reddi
+        except sqlite3.Error as e:
+            print(f"Toplu aktarımda parça yazılamadı: {e}")
+            # İşlem geri alındı: doğrulanan her satır (kilit altında reddedilenler dahil) yalnızca veritabanı hatasıyla raporlanır
+            reddedilenler.extend((satir_no, f"Veritabanı hatası: {e}") for satir_no, _ in dogrulanmis)
+            self._haritayi_sifirla()
+        self.reddedilenler.extend(reddedilenler)
+
+def ice_aktar(dosya_yolu, bicim=None, parca_boyutu=PARCA_BOYUTU):
+    """
+    Dosyadaki rezervasyonları toplu olarak ekler.
+    {'eklenen': int, 'reddedilenler': [(satır_no, sebep), ...], 'sure': saniye} döndürür.
+    """
+    baslangic = time.perf_counter()
+    aktarici = _Aktarici() # Her parça bağlantısını kendi yazma işleminden alır
+    parca = []
+    for satir in satirlari_oku(dosya_yolu, bicim):
+        parca.append(satir)
+        if len(parca) >= parca_boyutu:
+            aktarici.parcayi_isle(parca); parca = []
+    if parca: aktarici.parcayi_isle(parca)
+    aktarici.reddedilenler.sort()
+    return {'eklenen': aktarici.eklenen, 'reddedilenler': aktarici.reddedilenler,
+            'sure': time.perf_counter() - baslangic}
+
+if __name__ == "__main__":
+    ayristirici = argparse.ArgumentParser(description="CSV/JSONL rezervasyon dökümünü toplu olarak içe aktarır.")
+    ayristirici.add_argument("dosya", help="İçe aktarılacak .csv veya .jsonl dosyası")
+    ayristirici.add_argument("--bicim", choices=("csv", "jsonl"), help="Dosya biçimi (varsayılan: uzantıdan)")
+    ayristirici.add_argument("--parca", type=int, default=PARCA_BOYUTU, help="İşlem başına satır sayısı")
+    ayristirici.add_argument("--reddedilenler", help="Reddedilen satırların yazılacağı JSONL dosyası")
+    argumanlar = ayristirici.parse_args()
+
+    sonuc = ice_aktar(argumanlar.dosya, argumanlar.bicim, argumanlar.parca)
+    print(f"{sonuc['eklenen']} rezervasyon eklendi, {len(sonuc['reddedilenler'])} satır reddedildi ({sonuc['sure']:.2f} sn).")
+    if argumanlar.reddedilenler:
+        with open(argumanlar.reddedilenler, 'w', encoding='utf-8') as dosya:
+            for satir_no, sebep in sonuc['reddedilenler']:
+                dosya.write(json.dumps({'satir': satir_no, 'sebep': sebep}, ensure_ascii=False) + "\n")
+    else:
+        for satir_no, sebep in sonuc['reddedilenler'][:20]:
+            print(f"  Satır {satir_no}: {sebep}")
@@ -1,145 +1,533 @@
 import sqlite3
+import threading
+import atexit
+import os
+import random
+import re
+import time
+import urllib.parse
+from contextlib import contextmanager
 from datetime import datetime
 
+import izleme
+import oda_atama
+from doluluk import DolulukOnbellegi, gun_no, gun_tarihi
+from kayitlar import Oda, Rezervasyon
+
 # Veritabanı dosya adı
 DB_NAME = 'otel_rezervasyon.db'
+# Kilitli veritabanında (SQLITE_BUSY) yazma işlemlerinin en fazla kaç kez deneneceği
+YENIDEN_DENEME_SAYISI = 5
+# Müsaitlik ve anlık durum sorguları bellekteki oda × gün bit haritasından cevaplansın mı?
+DOLULUK_ONBELLEGI_AKTIF = True
+# rezervasyon_ara'nın döndüreceği en fazla sonuç sayısı (en alakalı olanlar)
+ARAMA_SONUC_LIMITI = 500
+# Konaklama gecelerinin kabul edildiği aralık: rapor özeti (gunluk_ozet) geceleri takvim tablosundan seçer
+TAKVIM_ILK_GUN, TAKVIM_SON_GUN = '2000-01-01', '2099-12-31'
+TARIH_ARALIGI_HATASI = f"Konaklama geceleri {TAKVIM_ILK_GUN} ile {TAKVIM_SON_GUN} arasında olmalı."
+_TAKVIM_SON_CIKIS = gun_tarihi(gun_no(TAKVIM_SON_GUN) + 1) # Son gecenin çıkış günü
+
+# Depolama profilleri: bağlantı başına PRAGMA ayarları (journal_mode veritabanı dosyasında kalıcıdır,
+# süreç veritabanına ilk bağlandığında bir kez ayarlanır). busy_timeout milisaniye, cache_size negatifse KiB'dir.
+DEPOLAMA_PROFILLERI = {
+    # Veritabanı, terminallerin çalıştığı makinenin yerel diskinde: WAL'da okuyucular yazıcıyı,
+    # yazıcı okuyucuları beklemez. WAL'da synchronous=NORMAL bozulmaya yol açmaz (elektrik
+    # kesintisinde yalnızca son birkaç işlem kaybolabilir).
+    'yerel': {'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'busy_timeout': 10000,
+              'cache_size': -16000, 'mmap_size': 256 * 1024 * 1024},
+    # Dosya başka bir makinedeki ağ paylaşımında (SMB/NFS): WAL paylaşımlı bellek (-shm) kullandığı için
+    # farklı makinelerden güvenle açılamaz; klasik günlük, tam senkronizasyon ve mmap'siz çalışılır.
+    'ag': {'journal_mode': 'DELETE', 'synchronous': 'FULL', 'busy_timeout': 15000,
+           'cache_size': -16000, 'mmap_size': 0},
+    # SQLite varsayılanları (eski davranış)
+    'klasik': {},
+}
+DEPOLAMA_PROFILI = 'yerel'
+# True ise veritabanı salt okunur açılır (raporlama gibi yalnızca okuyan araçlar için): yazma kilidi
+# alınmaz, geçiş yapılmaz. WAL modunda klasörde yazma izni yoksa -shm dosyasının var olması gerekir.
+SALT_OKUNUR = False
+# Eski rezervasyonların taşındığı arşiv veritabanı (bkz. arsivleme.py); None ise DB_NAME'in yanında '<ad>_arsiv.db'
+ARSIV_DB_NAME = None
 
 # --- Bağlantı ve Kurulum ---
 
+# Her thread kendi uzun ömürlü bağlantısını kullanır (sqlite3 bağlantıları thread'ler arasında paylaşılmamalı).
+_yerel = threading.local()
+_acik_baglantilar = [] # Program kapanırken hepsini kapatabilmek için
+_baglanti_kilidi = threading.Lock()
+_nesil = 0 # tum_baglantilari_kapat() her çağrıldığında artar; diğer thread'lerin eski bağlantıları geçersiz olur
+_yazici_kilidi = threading.RLock() # Bu süreçteki yazma işlemleri sırayla çalışır (bkz. yazma_islemi)
+
 def baglanti_olustur():
-    """Veritabanına bağlantı kurar, foreign key desteğini açar ve bağlantı nesnesini döndürür."""
+    """Veritabanına bağlantı kurar, foreign key desteğini ve depolama profilini uygular, bağlantıyı döndürür."""
     try:
-        conn = sqlite3.connect(DB_NAME)
+        profil = DEPOLAMA_PROFILLERI[DEPOLAMA_PROFILI]
+        # check_same_thread=False: bağlantıyı yalnızca sahibi kullanır, ama kapanışta başka thread kapatabilsin
+        # timeout: kilit doluysa hata vermeden önce SQLite'ın bekleyeceği süre (busy_timeout)
+        if SALT_OKUNUR: # URI ile açılır: dosya yoksa oluşturulmaz, yazma denemeleri hata verir
+            conn = sqlite3.connect(f"file:{urllib.parse.quote(os.path.abspath(DB_NAME))}?mode=ro", uri=True,
+                                   timeout=profil.get('busy_timeout', 5000) / 1000, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(DB_NAME, timeout=profil.get('busy_timeout', 5000) / 1000, check_same_thread=False)
         conn.execute("PRAGMA foreign_keys = 1") 
+        for ayar in ('synchronous', 'cache_size', 'mmap_size'):
+            if ayar in profil: conn.execute(f"PRAGMA {ayar} = {profil[ayar]}")
         return conn
     except sqlite3.Error as e:
         print(f"Veritabanı bağlantı hatası: {e}")
         raise  # Hatayı yukarıya bildir
 
-def _veritabani_gecislerini_yonet(conn):
-    """Veritabanı şemasını kontrol eder ve eksik sütunları ekler (varsa)."""
-    cursor = conn.cursor()
-    try:
-        # Rezervasyonlar tablosunu kontrol et
-        cursor.execute("PRAGMA table_info(rezervasyonlar)")
-        rez_sutunlar = [row[1] for row in cursor.fetchall()]
-        if 'toplam_fiyat' not in rez_sutunlar:
-            cursor.execute("ALTER TABLE rezervasyonlar ADD COLUMN toplam_fiyat REAL DEFAULT 0")
-            print("Veritabanı geçirildi: 'toplam_fiyat' sütunu eklendi.")
-        if 'odeme_durumu' not in rez_sutunlar:
-            cursor.execute("ALTER TABLE rezervasyonlar ADD COLUMN odeme_durumu TEXT NOT NULL DEFAULT 'Ödenmedi'")
-            print("Veritabanı geçirildi: 'odeme_durumu' sütunu eklendi.")
-            
-        # Odalar tablosunu kontrol et
-        cursor.execute("PRAGMA table_info(odalar)")
-        oda_sutunlar = [row[1] for row in cursor.fetchall()]
-        if 'oda_durumu' not in oda_sutunlar:
-            cursor.execute("ALTER TABLE odalar ADD COLUMN oda_durumu TEXT NOT NULL DEFAULT 'Temiz'")
-            print("Veritabanı geçirildi: 'oda_durumu' sütunu eklendi.")
-            
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Veritabanı geçişi sırasında hata: {e}")
-        conn.rollback() # Hata olursa yapılan değişiklikleri geri al
+def _baglanti_getir():
+    """Yardımcı: Bu thread'e ait kalıcı bağlantıyı döndürür, yoksa (veya DB_NAME değiştiyse) yenisini açar."""
+    conn = getattr(_yerel, 'conn', None)
+    if conn is not None and _yerel.anahtar == (DB_NAME, SALT_OKUNUR, _nesil):
+        return conn
+    if conn is not None: # Veritabanı dosyası değişmiş veya bağlantılar kapatılmış, eskisini bırak
+        baglantiyi_kapat()
+    baslangic = time.perf_counter()
+    conn = baglanti_olustur() # PRAGMA'lar bağlantı başına yalnızca bir kez çalışır
+    try: _semayi_hazirla(conn) # Bu süreçte bu veritabanına ilk bağlanılıyorsa şemayı getir
+    except BaseException:
+        conn.close(); raise
+    if izleme.AKTIF: izleme.bekleme_ekle(time.perf_counter() - baslangic)
+    _yerel.conn, _yerel.anahtar, _yerel.derinlik = conn, (DB_NAME, SALT_OKUNUR, _nesil), 0
+    _yerel.izleme_surumu = None # Geri çağırımlar ilk baglanti() bloğunda kurulur
+    _yerel.commit_sonrasi = [] # İşlem başarıyla bitince çalışacak önbellek güncellemeleri
+    with _baglanti_kilidi:
+        _acik_baglantilar.append(conn)
+    return conn
 
-def veritabani_baslat():
-    """Tüm tabloları oluşturur (varsa atlar) ve varsayılan odaları ekler (sadece ilk kurulumda)."""
-    conn = None # Bağlantıyı başta None olarak ayarla
+@contextmanager
+def baglanti():
+    """
+    Thread'e ait paylaşılan bağlantıyı verir. En dıştaki blok hatasız biterse commit,
+    hata olursa rollback yapar. İç içe kullanımda işlemi yalnızca en dıştaki blok sonlandırır.
+    """
+    conn = _baglanti_getir()
+    if _yerel.izleme_surumu != izleme.surum: _yerel.izleme_surumu = izleme.geri_cagirimlari_kur(conn)
+    _yerel.derinlik += 1
     try:
-        conn = baglanti_olustur()
-        cursor = conn.cursor()
-        
-        # 1. odalar tablosu
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS odalar (
-                oda_numarasi TEXT PRIMARY KEY,
-                oda_tipi TEXT NOT NULL,
-                gunluk_fiyat REAL NOT NULL CHECK(gunluk_fiyat > 0), -- Fiyat pozitif olmalı
-                oda_durumu TEXT NOT NULL DEFAULT 'Temiz' CHECK(oda_durumu IN ('Temiz', 'Kirli', 'Tadilatta')) -- Geçerli durumlar
-            )
+        yield conn
+        if _yerel.derinlik == 1:
+            if conn.in_transaction: conn.commit()
+            bekleyenler, _yerel.commit_sonrasi = _yerel.commit_sonrasi, []
+            for islem in bekleyenler: islem()
+    except BaseException:
+        if _yerel.derinlik == 1:
+            if conn.in_transaction: conn.rollback()
+            _yerel.commit_sonrasi = [] # Geri alınan değişiklikler önbelleğe yansımaz
+        raise
+    finally:
+        _yerel.derinlik -= 1
+
+def baglantiyi_kapat():
+    """Bu thread'e ait bağlantıyı kapatır (iş parçacığı bitmeden önce çağrılabilir)."""
+    conn = getattr(_yerel, 'conn', None)
+    if conn is None: return
+    with _baglanti_kilidi:
+        if conn in _acik_baglantilar: _acik_baglantilar.remove(conn)
+    try: conn.close()
+    except sqlite3.Error: pass
+    _yerel.conn = None
+
+def tum_baglantilari_kapat():
+    """Açık kalan tüm bağlantıları kapatır (program kapanırken otomatik çağrılır)."""
+    global _nesil
+    with _baglanti_kilidi:
+        baglantilar = list(_acik_baglantilar); _acik_baglantilar.clear()
+        _nesil += 1
+    for conn in baglantilar:
+        try: conn.close()
+        except sqlite3.Error: pass
+    _yerel.conn = None
+
+atexit.register(tum_baglantilari_kapat)
+
+# --- ŞEMA GEÇİŞLERİ ---
+# Her geçiş bir kez çalışır; veritabanının hangi geçişe kadar geldiği PRAGMA user_version'da tutulur.
+# Geçişler içe aktarmada değil, ilk bağlantıda çalışır. Eski sürümlerin user_version'ı 0 olduğu için
+# adımlar var olan tablo/indeksleri bozmadan yeniden çalışabilecek şekilde yazılmıştır.
+
+def _gecis_1_temel_tablolar(cursor):
+    """Tabloları oluşturur, eski veritabanlarındaki eksik sütunları ekler ve ilk kurulumda odaları ekler."""
+    # 1. odalar tablosu
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS odalar (
+            oda_numarasi TEXT PRIMARY KEY,
+            oda_tipi TEXT NOT NULL,
+            gunluk_fiyat REAL NOT NULL CHECK(gunluk_fiyat > 0), -- Fiyat pozitif olmalı
+            oda_durumu TEXT NOT NULL DEFAULT 'Temiz' CHECK(oda_durumu IN ('Temiz', 'Kirli', 'Tadilatta')) -- Geçerli durumlar
+        )
+    """)
+
+    # 2. rezervasyonlar tablosu (müşteri adı ile)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS rezervasyonlar (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            musteri_adi TEXT NOT NULL,
+            oda_no TEXT NOT NULL,
+            giris_tarihi TEXT NOT NULL, -- YYYY-MM-DD formatında saklanacak
+            cikis_tarihi TEXT NOT NULL, -- YYYY-MM-DD formatında saklanacak
+            toplam_fiyat REAL DEFAULT 0,
+            odeme_durumu TEXT NOT NULL DEFAULT 'Ödenmedi' CHECK(odeme_durumu IN ('Ödenmedi', 'Kapora Alındı', 'Tamamı Ödendi')), -- Geçerli durumlar
+            FOREIGN KEY (oda_no) REFERENCES odalar (oda_numarasi) ON DELETE CASCADE -- Oda silinirse ilgili rezervasyonlar da silinir
+        )
+    """)
+
+    # Eski sürümlerden kalan tablolarda eksik sütunları ekle
+    cursor.execute("PRAGMA table_info(rezervasyonlar)")
+    rez_sutunlar = [row[1] for row in cursor.fetchall()]
+    if 'toplam_fiyat' not in rez_sutunlar:
+        cursor.execute("ALTER TABLE rezervasyonlar ADD COLUMN toplam_fiyat REAL DEFAULT 0")
+        print("Veritabanı geçirildi: 'toplam_fiyat' sütunu eklendi.")
+    if 'odeme_durumu' not in rez_sutunlar:
+        cursor.execute("ALTER TABLE rezervasyonlar ADD COLUMN odeme_durumu TEXT NOT NULL DEFAULT 'Ödenmedi'")
+        print("Veritabanı geçirildi: 'odeme_durumu' sütunu eklendi.")
+    cursor.execute("PRAGMA table_info(odalar)")
+    oda_sutunlar = [row[1] for row in cursor.fetchall()]
+    if 'oda_durumu' not in oda_sutunlar:
+        cursor.execute("ALTER TABLE odalar ADD COLUMN oda_durumu TEXT NOT NULL DEFAULT 'Temiz'")
+        print("Veritabanı geçirildi: 'oda_durumu' sütunu eklendi.")
+
+    # 3. Odaları Yalnızca Tablo Boşsa Ekle
+    cursor.execute("SELECT COUNT(*) FROM odalar")
+    if cursor.fetchone()[0] == 0:
+        otel_odalari = [
+            ('101', 'Tek Kişilik', 1500, 'Temiz'), ('102', 'Tek Kişilik', 1500, 'Temiz'),
+            ('103', 'Tek Kişilik', 1500, 'Kirli'),
+            ('201', 'Çift Kişilik', 2500, 'Temiz'), ('202', 'Çift Kişilik', 2500, 'Temiz'),
+            ('203', 'Çift Kişilik', 2500, 'Temiz'), ('204', 'Çift Kişilik', 2500, 'Tadilatta'),
+            ('301', 'Suit', 4000, 'Temiz'), ('302', 'Suit', 4000, 'Temiz')
+        ]
+        cursor.executemany("INSERT INTO odalar VALUES (?,?,?,?)", otel_odalari)
+        print("Veritabanı ilk kez kuruldu, varsayılan odalar eklendi.")
+
+def _gecis_2_tarih_indeksleri(cursor):
+    """Müsaitlik ve sayfalı listeleme sorguları için indeksleri oluşturur."""
+    # Tarih çakışması sorguları için indeks. Sıralama bilinçli olarak (oda_no, cikis, giris):
+    # 'cikis_tarihi > ?' aralığı geçmiş konaklamaları baştan eler, böylece sorgu süresi
+    # geçmiş büyüdükçe artmaz; giris_tarihi de indekste olduğu için tabloya hiç gidilmez.
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_rezervasyonlar_oda_tarih
+        ON rezervasyonlar (oda_no, cikis_tarihi, giris_tarihi)
+    """)
+    # Listeleme sırası (giris_tarihi, id) için indeks: sayfalı (keyset) listeleme bunu kullanır
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_rezervasyonlar_giris ON rezervasyonlar (giris_tarihi)")
+
+def _gecis_3_degisiklik_sayaci(cursor):
+    """Değişiklik sayaçlarını ve onları artıran tetikleyicileri oluşturur."""
+    # Her satır değişikliğinde tetikleyicilerle artar. Bellek içi önbellekler kendi sürümlerini
+    # bununla karşılaştırarak başka terminallerin yaptığı değişiklikleri fark eder.
+    cursor.execute("CREATE TABLE IF NOT EXISTS degisiklik_sayaci (tablo TEXT PRIMARY KEY, surum INTEGER NOT NULL DEFAULT 0)")
+    for tablo in ('odalar', 'rezervasyonlar'): _sayac_tetikleyicilerini_kur(cursor, tablo)
+
+def _sayac_tetikleyicilerini_kur(cursor, tablo):
+    """Yardımcı: Tablonun degisiklik_sayaci satırını ve her satır değişikliğinde onu artıran tetikleyicileri kurar."""
+    cursor.execute("INSERT OR IGNORE INTO degisiklik_sayaci (tablo, surum) VALUES (?, 0)", (tablo,))
+    for olay in ('INSERT', 'UPDATE', 'DELETE'):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{tablo}_{olay.lower()}_sayac AFTER {olay} ON {tablo}
+            BEGIN UPDATE degisiklik_sayaci SET surum = surum + 1 WHERE tablo = '{tablo}'; END
         """)
-        
-        # 2. rezervasyonlar tablosu (müşteri adı ile)
+
+# Türkçe harfler için SQL tarafındaki normalleştirme: unicode61 'I' ve 'İ' harflerini 'i' yapar,
+# ama 'ı' harfini ayrı bırakır. Aksan (ç, ş, ğ, ö, ü) temizliğini de tokenizer yapar.
+def _sql_normalle(ifade):
+    return f"replace(replace({ifade}, 'ı', 'i'), 'İ', 'i')"
+
+def _gecis_4_arama_indeksi(cursor):
+    """FTS5 arama tablosunu ve onu güncel tutan tetikleyicileri oluşturur (FTS5 yoksa atlar)."""
+    if cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'rezervasyon_arama'").fetchone(): return
+    try:
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS rezervasyonlar (
-                id INTEGER PRIMARY KEY AUTOINCREMENT, 
-                musteri_adi TEXT NOT NULL, 
-                oda_no TEXT NOT NULL, 
-                giris_tarihi TEXT NOT NULL, -- YYYY-MM-DD formatında saklanacak
-                cikis_tarihi TEXT NOT NULL, -- YYYY-MM-DD formatında saklanacak
-                toplam_fiyat REAL DEFAULT 0,
-                odeme_durumu TEXT NOT NULL DEFAULT 'Ödenmedi' CHECK(odeme_durumu IN ('Ödenmedi', 'Kapora Alındı', 'Tamamı Ödendi')), -- Geçerli durumlar
-                FOREIGN KEY (oda_no) REFERENCES odalar (oda_numarasi) ON DELETE CASCADE -- Oda silinirse ilgili rezervasyonlar da silinir
+            CREATE VIRTUAL TABLE rezervasyon_arama USING fts5(
+                musteri_adi, oda_no, oda_tipi, odeme_durumu,
+                tokenize = 'unicode61 remove_diacritics 2', prefix = '1 2 3'
             )
         """)
-        
-        _veritabani_gecislerini_yonet(conn) # Sütunları kontrol et/ekle
-        
-        # 3. Odaları Yalnızca Tablo Boşsa Ekle
-        cursor.execute("SELECT COUNT(*) FROM odalar")
-        if cursor.fetchone()[0] == 0:
-            otel_odalari = [
-                ('101', 'Tek Kişilik', 1500, 'Temiz'), ('102', 'Tek Kişilik', 1500, 'Temiz'), 
-                ('103', 'Tek Kişilik', 1500, 'Kirli'), 
-                ('201', 'Çift Kişilik', 2500, 'Temiz'), ('202', 'Çift Kişilik', 2500, 'Temiz'), 
-                ('203', 'Çift Kişilik', 2500, 'Temiz'), ('204', 'Çift Kişilik', 2500, 'Tadilatta'), 
-                ('301', 'Suit', 4000, 'Temiz'), ('302', 'Suit', 4000, 'Temiz')
-            ]
-            cursor.executemany("INSERT INTO odalar VALUES (?,?,?,?)", otel_odalari)
-            print("Veritabanı ilk kez kuruldu, varsayılan odalar eklendi.")
-        
-        conn.commit()
+    except sqlite3.OperationalError as e: # SQLite FTS5 olmadan derlenmiş
+        print(f"FTS5 kullanılamıyor, arama LIKE ile yapılacak: {e}")
+        return
+    yeni_kayit = f"""
+        INSERT INTO rezervasyon_arama (rowid, musteri_adi, oda_no, oda_tipi, odeme_durumu)
+        SELECT new.id, {_sql_normalle('new.musteri_adi')}, new.oda_no, {_sql_normalle('o.oda_tipi')}, {_sql_normalle('new.odeme_durumu')}
+        FROM (SELECT 1) LEFT JOIN odalar o ON o.oda_numarasi = new.oda_no;
+    """
+    cursor.execute(f"CREATE TRIGGER trg_rezervasyonlar_insert_arama AFTER INSERT ON rezervasyonlar BEGIN {yeni_kayit} END")
+    cursor.execute("""CREATE TRIGGER trg_rezervasyonlar_delete_arama AFTER DELETE ON rezervasyonlar
+                      BEGIN DELETE FROM rezervasyon_arama WHERE rowid = old.id; END""")
+    cursor.execute(f"""CREATE TRIGGER trg_rezervasyonlar_update_arama AFTER UPDATE OF musteri_adi, oda_no, odeme_durumu ON rezervasyonlar
+                       BEGIN DELETE FROM rezervasyon_arama WHERE rowid = old.id; {yeni_kayit} END""")
+    cursor.execute(f"""CREATE TRIGGER trg_odalar_update_arama AFTER UPDATE OF oda_tipi ON odalar BEGIN
+                           UPDATE rezervasyon_arama SET oda_tipi = {_sql_normalle('new.oda_tipi')}
+                           WHERE rowid IN (SELECT id FROM rezervasyonlar WHERE oda_no = new.oda_numarasi);
+                       END""")
+    # Mevcut kayıtları indekse al
+    cursor.execute(f"""
+        INSERT INTO rezervasyon_arama (rowid, musteri_adi, oda_no, oda_tipi, odeme_durumu)
+        SELECT r.id, {_sql_normalle('r.musteri_adi')}, r.oda_no, {_sql_normalle('o.oda_tipi')}, {_sql_normalle('r.odeme_durumu')}
+        FROM rezervasyonlar r LEFT JOIN odalar o ON o.oda_numarasi = r.oda_no
+    """)
+    cursor.execute("INSERT INTO rezervasyon_arama (rezervasyon_arama) VALUES ('optimize')") # Segmentleri birleştir
+    print("Veritabanı geçirildi: tam metin arama indeksi oluşturuldu.")
+
+def _gecis_5_fiyat_planlari(cursor):
+    """Sezon/hafta sonu fiyat planları ve uzun konaklama indirimleri tablolarını oluşturur (bkz. fiyatlandirma.py)."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS fiyat_planlari (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            oda_tipi TEXT NOT NULL,
+            baslangic_tarihi TEXT NOT NULL, -- Dahil, YYYY-MM-DD
+            bitis_tarihi TEXT NOT NULL, -- Hariç, YYYY-MM-DD (rezervasyonlardaki cikis_tarihi gibi)
+            gunluk_fiyat REAL NOT NULL CHECK(gunluk_fiyat > 0),
+            hafta_sonu_fiyati REAL CHECK(hafta_sonu_fiyati IS NULL OR hafta_sonu_fiyati > 0), -- Cuma/cumartesi geceleri; NULL ise gunluk_fiyat
+            oncelik INTEGER NOT NULL DEFAULT 0, -- Çakışan planlarda yüksek öncelikli olan geçerlidir
+            aciklama TEXT NOT NULL DEFAULT '',
+            CHECK(bitis_tarihi > baslangic_tarihi)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS konaklama_indirimleri (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            oda_tipi TEXT, -- NULL ise tüm oda tipleri
+            en_az_gece INTEGER NOT NULL CHECK(en_az_gece > 0),
+            indirim_orani REAL NOT NULL CHECK(indirim_orani > 0 AND indirim_orani < 1) -- 0.10 = %10
+        )
+    """)
+    for tablo in ('fiyat_planlari', 'konaklama_indirimleri'): _sayac_tetikleyicilerini_kur(cursor, tablo)
+
+# Günlük özet tablosuna bir konaklama kümesinin katkısını ekleyen (isaret='-' ise çıkaran) SQL.
+# kaynak: r takma adıyla (oda_no, giris_tarihi, cikis_tarihi, toplam_fiyat) veren FROM ifadesi,
+# tip: oda tipi ifadesi. Gelir gecelere eşit bölünür; takvim tablosunun dışındaki günler sayılmaz.
+_OZET_KATKISI = """
+    INSERT INTO gunluk_ozet (gun, oda_tipi, satilan_oda, gelir)
+    SELECT t.gun, {tip}, {isaret}COUNT(*), {isaret}TOTAL(r.toplam_fiyat / (julianday(r.cikis_tarihi) - julianday(r.giris_tarihi)))
+    FROM {kaynak} JOIN takvim t ON t.gun >= r.giris_tarihi AND t.gun < r.cikis_tarihi
+    WHERE {kosul} GROUP BY t.gun, {tip}
+    ON CONFLICT (gun, oda_tipi) DO UPDATE SET satilan_oda = satilan_oda + excluded.satilan_oda, gelir = gelir + excluded.gelir;
+"""
+
+def _ozet_katkisi(satir, isaret=''):
+    """Yardımcı: Tetikleyicideki tek rezervasyon satırının ('new' veya 'old') özet katkısı SQL'i."""
+    kaynak = (f"(SELECT {satir}.oda_no AS oda_no, {satir}.giris_tarihi AS giris_tarihi, {satir}.cikis_tarihi AS cikis_tarihi, "
+              f"{satir}.toplam_fiyat AS toplam_fiyat) r JOIN odalar o ON o.oda_numarasi = r.oda_no")
+    return _OZET_KATKISI.format(tip='o.oda_tipi', isaret=isaret, kaynak=kaynak, kosul='1')
+
+def _oda_ozet_katkisi(satir, isaret=''):
+    """Yardımcı: Tetikleyicideki odanın ('new' veya 'old') tüm rezervasyonlarının özet katkısı SQL'i."""
+    return _OZET_KATKISI.format(tip=f'{satir}.oda_tipi', isaret=isaret, kaynak='rezervasyonlar r', kosul=f'r.oda_no = {satir}.oda_numarasi')
+
+def _gunluk_ozeti_doldur(cursor):
+    """Yardımcı: gunluk_ozet tablosunu tüm rezervasyonlardan baştan hesaplar."""
+    cursor.execute("DELETE FROM gunluk_ozet")
+    cursor.execute(_OZET_KATKISI.format(tip='o.oda_tipi', isaret='', kosul='1',
+                                        kaynak='rezervasyonlar r JOIN odalar o ON o.oda_numarasi = r.oda_no'))
+
+def _gecis_6_gunluk_ozet(cursor):
+    """Raporlar için gün × oda tipi özet tablosunu, gün takvimini ve özeti güncel tutan tetikleyicileri oluşturur."""
+    # Tetikleyicilerde WITH (özyinelemeli CTE) kullanılamadığı için konaklama günleri bu tablodan seçilir
+    cursor.execute("CREATE TABLE IF NOT EXISTS takvim (gun TEXT PRIMARY KEY) WITHOUT ROWID")
+    cursor.execute("""
+        INSERT OR IGNORE INTO takvim (gun)
+        WITH RECURSIVE gunler(gun) AS (SELECT ? UNION ALL SELECT date(gun, '+1 day') FROM gunler WHERE gun < ?)
+        SELECT gun FROM gunler
+    """, (TAKVIM_ILK_GUN, TAKVIM_SON_GUN))
+    # Her gün ve oda tipi için satılan oda (gece) sayısı ve o geceye düşen gelir (bkz. raporlama.py)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS gunluk_ozet (
+            gun TEXT NOT NULL, -- YYYY-MM-DD
+            oda_tipi TEXT NOT NULL,
+            satilan_oda INTEGER NOT NULL DEFAULT 0,
+            gelir REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (gun, oda_tipi)
+        ) WITHOUT ROWID
+    """)
+    # Boşalan günlerin satırları silinir (kayan nokta artığı gelir de onlarla gider)
+    temizle = "DELETE FROM gunluk_ozet WHERE gun >= {0}.giris_tarihi AND gun < {0}.cikis_tarihi AND satilan_oda = 0;"
+    cursor.execute(f"CREATE TRIGGER IF NOT EXISTS trg_rezervasyonlar_insert_ozet AFTER INSERT ON rezervasyonlar BEGIN {_ozet_katkisi('new')} END")
+    cursor.execute(f"""CREATE TRIGGER IF NOT EXISTS trg_rezervasyonlar_delete_ozet AFTER DELETE ON rezervasyonlar
+                       BEGIN {_ozet_katkisi('old', '-')} {temizle.format('old')} END""")
+    cursor.execute(f"""CREATE TRIGGER IF NOT EXISTS trg_rezervasyonlar_update_ozet
+                       AFTER UPDATE OF oda_no, giris_tarihi, cikis_tarihi, toplam_fiyat ON rezervasyonlar
+                       BEGIN {_ozet_katkisi('old', '-')} {_ozet_katkisi('new')} {temizle.format('old')} END""")
+    cursor.execute(f"""CREATE TRIGGER IF NOT EXISTS trg_odalar_update_ozet AFTER UPDATE OF oda_tipi ON odalar
+                       WHEN old.oda_tipi IS NOT new.oda_tipi BEGIN
+                           {_oda_ozet_katkisi('old', '-')} {_oda_ozet_katkisi('new')}
+                           DELETE FROM gunluk_ozet WHERE oda_tipi = old.oda_tipi AND satilan_oda = 0;
+                       END""")
+    # Oda doğrudan silinirse: ON DELETE CASCADE rezervasyonları oda satırı gittikten sonra sildiği için
+    # (rezervasyon tetikleyicisi odanın tipini bulamaz) katkılar oda silinmeden önce çıkarılır
+    cursor.execute(f"""CREATE TRIGGER IF NOT EXISTS trg_odalar_delete_ozet BEFORE DELETE ON odalar BEGIN
+                           {_oda_ozet_katkisi('old', '-')}
+                           DELETE FROM gunluk_ozet WHERE oda_tipi = old.oda_tipi AND satilan_oda = 0;
+                       END""")
+    _gunluk_ozeti_doldur(cursor) # Mevcut rezervasyonları özete al
+    print("Veritabanı geçirildi: rapor özet tablosu oluşturuldu.")
+
+def _gun_sutunu(sutun):
+    """Yardımcı: '<sutun>_tarihi' sütununun gün numarası karşılığı olan üretilmiş sütunun tanımı."""
+    return f"{sutun}_gun INTEGER GENERATED ALWAYS AS (CAST(julianday({sutun}_tarihi) - 2440587.5 AS INTEGER)) VIRTUAL"
+
+def _gecis_7_gun_sutunlari(cursor):
+    """Tarihlerin 1970-01-01'den itibaren gün numarası karşılığını sanal (VIRTUAL) üretilmiş sütunlar olarak ekler."""
+    # Saklanan biçim TEXT 'YYYY-MM-DD' olarak kalır (indeksler, tetikleyiciler, API ve içe aktarma bunu
+    # kullanır). Sütunlar dosyada yer tutmaz; gün numarası isteyen okumalar (doluluk önbelleği, oda atama)
+    # her satırı Python'da ayrıştırmak yerine bunları seçer. Değer doluluk.gun_no ile aynıdır.
+    for sutun in ('giris', 'cikis'):
+        cursor.execute(f"ALTER TABLE rezervasyonlar ADD COLUMN {_gun_sutunu(sutun)}")
+
+def _gecis_8_tarih_siniri(cursor):
+    """Gecelerinden biri takvim aralığı dışında kalan konaklamaları (özete giremezler) reddeden tetikleyicileri ekler."""
+    # API ve toplu içe aktarma her tarihi yazabilir; kural bu yüzden arayüzde değil veritabanında
+    kosul = f"new.giris_tarihi < '{TAKVIM_ILK_GUN}' OR new.cikis_tarihi > '{_TAKVIM_SON_CIKIS}'"
+    for ad, olay in (('insert', 'INSERT'), ('update', 'UPDATE OF giris_tarihi, cikis_tarihi')):
+        cursor.execute(f"""CREATE TRIGGER IF NOT EXISTS trg_rezervasyonlar_{ad}_tarih BEFORE {olay} ON rezervasyonlar
+                           WHEN {kosul} BEGIN SELECT RAISE(ABORT, '{TARIH_ARALIGI_HATASI}'); END""")
+    disarida = cursor.execute(f"SELECT COUNT(*) FROM rezervasyonlar new WHERE {kosul}").fetchone()[0]
+    if disarida: print(f"Uyarı: {disarida} rezervasyonun tarihleri takvim aralığı dışında; raporlara girmiyorlar.")
+
+# Sıra önemlidir: listedeki n. geçiş user_version'ı n yapar. Yeni geçişler yalnızca sona eklenir.
+_GECISLER = [_gecis_1_temel_tablolar, _gecis_2_tarih_indeksleri, _gecis_3_degisiklik_sayaci, _gecis_4_arama_indeksi,
+             _gecis_5_fiyat_planlari, _gecis_6_gunluk_ozet, _gecis_7_gun_sutunlari, _gecis_8_tarih_siniri]
+SEMA_SURUMU = len(_GECISLER)
+
+_hazir_veritabanlari = set() # Bu süreçte şeması kontrol edilmiş DB_NAME'ler
+_sema_kilidi = threading.Lock()
+
+def _gunluk_modunu_ayarla(conn):
+    """Yardımcı: Depolama profilindeki journal_mode'u uygular (dosyada kalıcıdır, yalnızca farklıysa yazılır)."""
+    istenen = DEPOLAMA_PROFILLERI[DEPOLAMA_PROFILI].get('journal_mode')
+    if istenen is None: return
+    try:
+        if conn.execute("PRAGMA journal_mode").fetchone()[0].upper() == istenen.upper(): return
+        mod = conn.execute(f"PRAGMA journal_mode = {istenen}").fetchone()[0]
+        if mod.upper() != istenen.upper(): # Örn. dosya sistemi WAL'ı desteklemiyor
+            print(f"Günlük modu '{istenen}' yapılamadı, '{mod}' kullanılıyor.")
+    except sqlite3.OperationalError as e: # Başka bir bağlantı açıkken mod değiştirilemez
+        print(f"Günlük modu ayarlanamadı: {e}")
+
+def _gecisleri_calistir(conn):
+    """Yardımcı: Eksik geçişleri tek bir yazma işleminde uygular ve user_version'ı ilerletir."""
+    with _yazici_kilidi:
+        yazma_islemi_baslat(conn)
+        try:
+            # Kilit alındıktan sonra tekrar oku: başka bir süreç bu arada geçirmiş olabilir
+            surum = conn.execute("PRAGMA user_version").fetchone()[0]
+            for numara, gecis in enumerate(_GECISLER[surum:], surum + 1):
+                gecis(conn.cursor())
+                conn.execute(f"PRAGMA user_version = {numara}")
+            conn.commit()
+        except BaseException:
+            conn.rollback() # Yarım kalan geçiş olmaz, bir sonraki bağlantıda baştan denenir
+            raise
+
+def _semayi_hazirla(conn):
+    """Yardımcı: Bu süreçte DB_NAME'e ilk bağlanıldığında günlük modunu ve eksik geçişleri uygular."""
+    with _sema_kilidi:
+        if DB_NAME in _hazir_veritabanlari: return
+        surum = conn.execute("PRAGMA user_version").fetchone()[0] # Güncel veritabanında tek okuma yeterli
+        if surum > SEMA_SURUMU:
+            print(f"Uyarı: Veritabanı şeması ({surum}) bu programdan ({SEMA_SURUMU}) daha yeni.")
+        if not SALT_OKUNUR:
+            _gunluk_modunu_ayarla(conn) # İşlem başlamadan önce olmalı
+            if surum < SEMA_SURUMU: _gecisleri_calistir(conn)
+        elif surum < SEMA_SURUMU:
+            raise sqlite3.OperationalError(f"Veritabanı şeması eski ({surum} < {SEMA_SURUMU}); salt okunur modda geçiş yapılamaz.")
+        _hazir_veritabanlari.add(DB_NAME)
+
+@izleme.olculur
+def veritabani_baslat():
+    """Şemayı hemen hazırlar (normalde ilk veritabanı çağrısında kendiliğinden yapılır). Hata olursa fırlatır."""
+    try:
+        with baglanti(): pass # Bağlantı açılırken _semayi_hazirla çalışır
     except sqlite3.Error as e:
         print(f"Veritabanı başlatılırken hata oluştu: {e}")
-        if conn: conn.rollback() # Hata olursa geri al
-    finally:
-        if conn: conn.close() # Bağlantıyı her durumda kapat
+        raise
+
+# --- DOLULUK ÖNBELLEĞİ ---
+
+_doluluk = None # (DB_NAME, DolulukOnbellegi)
+_doluluk_kilidi = threading.Lock()
+
+def _surumleri_oku(conn, tablolar=('odalar', 'rezervasyonlar')):
+    """Yardımcı: Verilen tabloların degisiklik_sayaci'ndaki güncel sürümlerini sözlük olarak döndürür."""
+    return dict(conn.execute(f"SELECT tablo, surum FROM degisiklik_sayaci WHERE tablo IN ({','.join('?' * len(tablolar))})",
+                             tablolar).fetchall())
+
+def _doluluk_onbellegi(conn):
+    """Yardımcı: Veritabanıyla aynı sürümdeki doluluk önbelleğini döndürür; gerekirse yeniden kurar."""
+    global _doluluk
+    if not DOLULUK_ONBELLEGI_AKTIF: return None
+    surumler = _surumleri_oku(conn)
+    with _doluluk_kilidi:
+        if _doluluk is None or _doluluk[0] != DB_NAME or _doluluk[1].surumler != surumler:
+            _doluluk = (DB_NAME, DolulukOnbellegi.olustur(conn, surumler))
+        return _doluluk[1]
+
+def _onbellege_yansit(conn, artislar, degisiklik):
+    """
+    Yardımcı: Bu işlemde yapılan değişikliği (artislar: tablo -> değişen satır sayısı) commit
+    sonrasında önbelleğe uygular. Arada başka bir yazıcı araya girmişse önbellek bırakılır.
+    """
+    if _doluluk is None: return
+    yeni_surumler = _surumleri_oku(conn)
+    def uygula():
+        global _doluluk
+        with _doluluk_kilidi:
+            if _doluluk is None or _doluluk[0] != DB_NAME: return
+            onbellek = _doluluk[1]
+            beklenen = {tablo: surum - artislar.get(tablo, 0) for tablo, surum in yeni_surumler.items()}
+            if onbellek.surumler != beklenen:
+                _doluluk = None; return # Sonraki sorguda baştan kurulur
+            degisiklik(onbellek)
+            onbellek.surumler = yeni_surumler
+    _yerel.commit_sonrasi.append(uygula)
+
+def doluluk_onbellegini_sifirla():
+    """Doluluk önbelleğini bırakır; bir sonraki sorgu onu veritabanından yeniden kurar."""
+    global _doluluk
+    with _doluluk_kilidi: _doluluk = None
 
 # --- ODA YÖNETİMİ FONKSİYONLARI ---
 
+def _kayit_imleci(conn, sinif):
+    """Yardımcı: Satırları sinif kayıtlarına (kayitlar.Rezervasyon / kayitlar.Oda) çeviren bir cursor."""
+    cursor = conn.cursor()
+    cursor.row_factory = sinif.satirdan
+    return cursor
+
+@izleme.olculur
 def odalari_cek():
-    """Yönetim panelinde listelemek için TÜM odaları çeker."""
-    conn = None
+    """Yönetim panelinde listelemek için TÜM odaları çeker (kayitlar.Oda listesi)."""
     try:
-        conn = baglanti_olustur()
-        cursor = conn.cursor()
-        cursor.execute("SELECT oda_numarasi, oda_tipi, gunluk_fiyat, oda_durumu FROM odalar ORDER BY oda_numarasi") 
-        return cursor.fetchall()
+        with baglanti() as conn:
+            cursor = _kayit_imleci(conn, Oda).execute("SELECT oda_numarasi, oda_tipi, gunluk_fiyat, oda_durumu FROM odalar ORDER BY oda_numarasi") 
+            return cursor.fetchall()
     except sqlite3.Error as e:
         print(f"Odalar çekilirken hata: {e}")
         return [] # Hata durumunda boş liste döndür
-    finally:
-        if conn: conn.close()
 
+@izleme.olculur
 def oda_ekle(oda_no, oda_tipi, fiyat, durum):
     """Yeni bir odayı 'odalar' tablosuna ekler."""
-    conn = None
     try:
-        conn = baglanti_olustur()
-        cursor = conn.cursor()
-        cursor.execute("INSERT INTO odalar (oda_numarasi, oda_tipi, gunluk_fiyat, oda_durumu) VALUES (?, ?, ?, ?)", (oda_no, oda_tipi, fiyat, durum))
-        conn.commit()
+        with yazma_islemi() as conn:
+            conn.execute("INSERT INTO odalar (oda_numarasi, oda_tipi, gunluk_fiyat, oda_durumu) VALUES (?, ?, ?, ?)", (oda_no, oda_tipi, fiyat, durum))
+            _onbellege_yansit(conn, {'odalar': 1}, lambda o: o.oda_ekle(str(oda_no), oda_tipi, durum))
     except sqlite3.Error as e:
         print(f"Oda eklenirken hata: {e}")
-        if conn: conn.rollback()
         raise # Hatayı tekrar fırlat ki arayüz yakalasın (örn. IntegrityError)
-    finally:
-        if conn: conn.close()
 
+@izleme.olculur
 def oda_guncelle(oda_no, oda_tipi, fiyat, durum):
     """Mevcut bir odanın bilgilerini günceller."""
-    conn = None
     try:
-        conn = baglanti_olustur()
-        cursor = conn.cursor()
-        cursor.execute("UPDATE odalar SET oda_tipi = ?, gunluk_fiyat = ?, oda_durumu = ? WHERE oda_numarasi = ?", (oda_tipi, fiyat, durum, oda_no))
-        conn.commit()
+        with yazma_islemi() as conn:
+            cursor = conn.execute("UPDATE odalar SET oda_tipi = ?, gunluk_fiyat = ?, oda_durumu = ? WHERE oda_numarasi = ?", (oda_tipi, fiyat, durum, oda_no))
+            _onbellege_yansit(conn, {'odalar': cursor.rowcount}, lambda o: o.oda_ekle(str(oda_no), oda_tipi, durum) if cursor.rowcount else None)
     except sqlite3.Error as e:
         print(f"Oda güncellenirken hata: {e}")
-        if conn: conn.rollback()
         raise
-    finally:
-        if conn: conn.close()
 
 def _get_gelecek_rezervasyon_sayisi(cursor, oda_no):
     """Yardımcı: Bir odanın aktif/gelecek rezervasyon sayısını döndürür."""
@@ -151,232 +539,619 @@ def _get_gelecek_rezervasyon_sayisi(cursor, oda_no):
         print(f"Rezervasyon sayısı alınırken hata: {e}")
         return 0 # Hata durumunda 0 döndür
 
+@izleme.olculur
 def oda_sil(oda_no):
     """Bir odayı siler. Aktif/gelecek rezervasyonu varsa, ValueError fırlatır."""
-    conn = None
     try:
-        conn = baglanti_olustur()
-        cursor = conn.cursor()
-        rez_sayisi = _get_gelecek_rezervasyon_sayisi(cursor, oda_no)
-        if rez_sayisi > 0:
-            raise ValueError(f"Oda {oda_no} için {rez_sayisi} adet aktif/gelecek rezervasyon var. Silinemez.")
-        # Rezervasyon yoksa, önce (varsa) GEÇMİŞ rezervasyonlarını sil 
-        # (ON DELETE CASCADE bunu otomatik yapmalı ama garantiye alalım)
-        cursor.execute("DELETE FROM rezervasyonlar WHERE oda_no = ?", (oda_no,)) 
-        # Sonra odayı sil
-        cursor.execute("DELETE FROM odalar WHERE oda_numarasi = ?", (oda_no,))
-        conn.commit()
+        with yazma_islemi() as conn:
+            cursor = conn.cursor()
+            rez_sayisi = _get_gelecek_rezervasyon_sayisi(cursor, oda_no)
+            if rez_sayisi > 0:
+                raise ValueError(f"Oda {oda_no} için {rez_sayisi} adet aktif/gelecek rezervasyon var. Silinemez.")
+            # Rezervasyon yoksa, önce (varsa) GEÇMİŞ rezervasyonlarını sil 
+            # (ON DELETE CASCADE bunu otomatik yapmalı ama garantiye alalım)
+            cursor.execute("DELETE FROM rezervasyonlar WHERE oda_no = ?", (oda_no,)) 
+            # Sonra odayı sil (doluluk önbelleği sürüm farkından dolayı bir sonraki sorguda yeniden kurulur)
+            cursor.execute("DELETE FROM odalar WHERE oda_numarasi = ?", (oda_no,))
     except sqlite3.Error as e:
          print(f"Oda silinirken hata: {e}")
-         if conn: conn.rollback()
          raise # ValueError dışındaki hataları da fırlat
-    finally:
-        if conn: conn.close()
 
 # --- REZERVASYON YARDIMCI FONKSİYONLARI ---
 
+def konaklama_tarihleri_gecerli_mi(giris, cikis):
+    """'YYYY-MM-DD' konaklamasının tüm geceleri TAKVIM_ILK_GUN..TAKVIM_SON_GUN aralığında mı? (Veritabanı dışındakileri reddeder.)"""
+    return giris >= TAKVIM_ILK_GUN and cikis <= _TAKVIM_SON_CIKIS
+
+@izleme.olculur
 def oda_tiplerini_cek():
     """ComboBox'ı doldurmak için veritabanındaki TİPLERİ çeker."""
-    conn = None
     try:
-        conn = baglanti_olustur()
-        cursor = conn.cursor()
-        cursor.execute("SELECT DISTINCT oda_tipi FROM odalar ORDER BY gunluk_fiyat")
-        return [row[0] for row in cursor.fetchall()]
+        with baglanti() as conn:
+            cursor = conn.execute("SELECT DISTINCT oda_tipi FROM odalar ORDER BY gunluk_fiyat")
+            return [row[0] for row in cursor.fetchall()]
     except sqlite3.Error as e:
         print(f"Oda tipleri çekilirken hata: {e}")
         return []
-    finally:
-        if conn: conn.close()
 
+@izleme.olculur
 def fiyat_getir(oda_tipi):
-    """Hesaplama için bir oda tipinin günlük fiyatını getirir."""
-    conn = None
+    """Bir oda tipinin taban günlük fiyatını (o tipteki en düşük oda fiyatı) getirir. Plan ve indirimler için bkz. fiyatlandirma.py."""
     try:
-        conn = baglanti_olustur()
-        cursor = conn.cursor()
-        cursor.execute("SELECT gunluk_fiyat FROM odalar WHERE oda_tipi = ? LIMIT 1", (oda_tipi,))
-        sonuc = cursor.fetchone()
-        return sonuc[0] if sonuc else 0
+        with baglanti() as conn:
+            sonuc = conn.execute("SELECT MIN(gunluk_fiyat) FROM odalar WHERE oda_tipi = ?", (oda_tipi,)).fetchone()
+            return sonuc[0] if sonuc[0] is not None else 0
     except sqlite3.Error as e:
         print(f"Fiyat getirilirken hata: {e}")
         return 0
-    finally:
-        if conn: conn.close()
 
+def _bos_odalar_ve_komsulari(conn, oda_tipi, giris, cikis):
+    """
+    Yardımcı: O tipte 'Temiz' ve tarihleri boş odalar için (oda_no, önceki konaklamanın çıkış günü,
+    sonraki konaklamanın giriş günü) listesi; komşu yoksa None. Oda atama bu boşluklara göre seçer.
+    """
+    onbellek = _doluluk_onbellegi(conn)
+    if onbellek is not None:
+        return onbellek.bos_odalar_ve_komsulari(oda_tipi, gun_no(giris), gun_no(cikis))
+    # Oda boş olduğu için çıkışı bizim çıkışımızdan sonra olan ilk konaklama bizden sonra başlar;
+    # iki alt sorgu da (oda_no, cikis_tarihi) indeksinde tek aralık taraması yapar
+    cursor = conn.execute("""
+        SELECT o.oda_numarasi,
+               (SELECT MAX(r.cikis_tarihi) FROM rezervasyonlar r WHERE r.oda_no = o.oda_numarasi AND r.cikis_tarihi <= ?),
+               (SELECT MIN(r.giris_tarihi) FROM rezervasyonlar r WHERE r.oda_no = o.oda_numarasi AND r.cikis_tarihi > ?)
+        FROM odalar o
+        WHERE o.oda_tipi = ? AND o.oda_durumu = 'Temiz' AND NOT EXISTS (
+            SELECT 1 FROM rezervasyonlar r
+            WHERE r.oda_no = o.oda_numarasi AND r.cikis_tarihi > ? AND r.giris_tarihi < ?)
+    """, (giris, cikis, oda_tipi, giris, cikis))
+    return [(oda_no, gun_no(onceki) if onceki else None, gun_no(sonraki) if sonraki else None) for oda_no, onceki, sonraki in cursor]
+
+def _musait_oda_sec(cursor, oda_tipi, giris, cikis):
+    """Yardımcı: Verilen cursor üzerinde, o tipte 'Temiz' ve tarihleri boş odalardan en az boşluk bırakanı seçer (yoksa None)."""
+    adaylar = _bos_odalar_ve_komsulari(cursor.connection, oda_tipi, giris, cikis)
+    return oda_atama.en_uygun_oda(adaylar, gun_no(giris), gun_no(cikis), gun_no(datetime.now().strftime("%Y-%m-%d")))
+
+@izleme.olculur
 def musait_oda_bul(oda_tipi, giris, cikis):
-    """Belirli bir tipteki odalardan, 'Temiz' durumda olan ve müsait İLK odanın numarasını bulur."""
-    conn = None
+    """Belirli bir tipteki 'Temiz' ve müsait odalardan, boş günleri en az parçalayanın numarasını bulur (bkz. oda_atama)."""
     try:
-        conn = baglanti_olustur()
-        cursor = conn.cursor()
-        cursor.execute("SELECT oda_numarasi FROM odalar WHERE oda_tipi = ? AND oda_durumu = 'Temiz'", (oda_tipi,))
-        tum_temiz_odalar = {row[0] for row in cursor.fetchall()}
-        
-        # O tarihlerde çakışan rezervasyonlardaki oda numaralarını bul
-        cursor.execute("""
-            SELECT oda_no FROM rezervasyonlar
-            WHERE oda_no IN (SELECT oda_numarasi FROM odalar WHERE oda_tipi = ?) 
-            AND giris_tarihi < ? AND cikis_tarihi > ?
-        """, (oda_tipi, cikis, giris))
-        dolu_odalar = {row[0] for row in cursor.fetchall()}
-        
-        bos_ve_temiz_odalar = tum_temiz_odalar - dolu_odalar
-        return bos_ve_temiz_odalar.pop() if bos_ve_temiz_odalar else None
+        with baglanti() as conn:
+            return _musait_oda_sec(conn.cursor(), oda_tipi, giris, cikis)
     except sqlite3.Error as e:
         print(f"Müsait oda bulunurken hata: {e}")
         return None
-    finally:
-        if conn: conn.close()
 
+@izleme.olculur
+def musaitlik_ozeti(giris, cikis):
+    """
+    Tüm oda tipleri için tarihlerdeki müsaitlik: en ucuz tipten başlayarak
+    (oda_tipi, toplam oda sayısı, boş ve 'Temiz' odaların listesi, boş odaların en düşük günlük fiyatı veya None).
+    Doluluk önbelleğinden ya da tek bir SQL sorgusuyla hesaplanır.
+    """
+    try:
+        with baglanti() as conn:
+            fiyatlar = dict(conn.execute("SELECT oda_numarasi, gunluk_fiyat FROM odalar"))
+            onbellek = _doluluk_onbellegi(conn)
+            if onbellek is not None:
+                tipler = onbellek.tip_bazinda_bos_odalar(gun_no(giris), gun_no(cikis))
+            else:
+                tipler = {}
+                for oda_tipi, oda_no, bos in conn.execute("""
+                        SELECT o.oda_tipi, o.oda_numarasi,
+                               o.oda_durumu = 'Temiz' AND NOT EXISTS (
+                                   SELECT 1 FROM rezervasyonlar r
+                                   WHERE r.oda_no = o.oda_numarasi AND r.cikis_tarihi > ? AND r.giris_tarihi < ?)
+                        FROM odalar o ORDER BY o.oda_tipi, o.oda_numarasi
+                    """, (giris, cikis)):
+                    kayit = tipler.setdefault(oda_tipi, [0, []]); kayit[0] += 1
+                    if bos: kayit[1].append(oda_no)
+        ozet = [(tip, toplam, bos_odalar, min((fiyatlar[o] for o in bos_odalar if o in fiyatlar), default=None))
+                for tip, (toplam, bos_odalar) in tipler.items()]
+        return sorted(ozet, key=lambda t: (t[3] is None, t[3] or 0, t[0])) # Dolu tipler sonda
+    except sqlite3.Error as e:
+        print(f"Müsaitlik özeti çıkarılırken hata: {e}")
+        return []
+
+@izleme.olculur
+def blok_musaitligi(oda_tipi, adet, giris, cikis):
+    """Grup/blok talebi: o tipte 'adet' kadar boş ve 'Temiz' oda varsa en az boşluk bırakan 'adet' tanesinin listesi, yoksa None."""
+    try:
+        with baglanti() as conn:
+            adaylar = _bos_odalar_ve_komsulari(conn, oda_tipi, giris, cikis)
+            if len(adaylar) < adet: return None
+            return oda_atama.odalari_sirala(adaylar, gun_no(giris), gun_no(cikis), gun_no(datetime.now().strftime("%Y-%m-%d")))[:adet]
+    except sqlite3.Error as e:
+        print(f"Blok müsaitliği kontrol edilirken hata: {e}")
+        return None
+
+@izleme.olculur
 def oda_musait_mi(oda_no, giris, cikis, hariç_tutulacak_id=None):
     """Belirli bir ODA NUMARASININ o tarihlerde müsait olup olmadığını kontrol eder (Güncelleme için)."""
-    conn = None
     try:
-        conn = baglanti_olustur()
-        cursor = conn.cursor()
-        sql_query = "SELECT COUNT(*) FROM rezervasyonlar WHERE oda_no = ? AND giris_tarihi < ? AND cikis_tarihi > ?"
-        params = [oda_no, cikis, giris] 
-        if hariç_tutulacak_id is not None:
-            sql_query += " AND id != ?" 
-            params.append(hariç_tutulacak_id)
-        cursor.execute(sql_query, tuple(params))
-        cakisma_sayisi = cursor.fetchone()[0]
-        return cakisma_sayisi == 0
+        with baglanti() as conn:
+            onbellek = _doluluk_onbellegi(conn)
+            if onbellek is not None:
+                return onbellek.bos_mu(str(oda_no), gun_no(giris), gun_no(cikis), hariç_tutulacak_id)
+            sql_query = "SELECT COUNT(*) FROM rezervasyonlar WHERE oda_no = ? AND giris_tarihi < ? AND cikis_tarihi > ?"
+            params = [oda_no, cikis, giris] 
+            if hariç_tutulacak_id is not None:
+                sql_query += " AND id != ?" 
+                params.append(hariç_tutulacak_id)
+            cakisma_sayisi = conn.execute(sql_query, tuple(params)).fetchone()[0]
+            return cakisma_sayisi == 0
     except sqlite3.Error as e:
         print(f"Oda müsaitliği kontrol edilirken hata: {e}")
         return False # Hata durumunda müsait değil varsay
-    finally:
-        if conn: conn.close()
 
+@izleme.olculur
 def get_anlik_oda_durumu(bugun_sql):
     """Bugünün tarihine göre tüm odaların durumunu (BOŞ/DOLU/Fiziksel) çeker."""
-    conn = None
     try:
-        conn = baglanti_olustur()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT o.oda_numarasi, o.oda_tipi, o.oda_durumu, r.musteri_adi, r.cikis_tarihi 
-            FROM odalar o 
-            LEFT JOIN rezervasyonlar r ON o.oda_numarasi = r.oda_no AND ? >= r.giris_tarihi AND ? < r.cikis_tarihi 
-            ORDER BY o.oda_numarasi
-        """, (bugun_sql, bugun_sql))
-        return cursor.fetchall()
+        with baglanti() as conn:
+            onbellek = _doluluk_onbellegi(conn)
+            if onbellek is not None:
+                durumlar = onbellek.gun_durumu(gun_no(bugun_sql))
+                # Adlar yalnızca güncel konaklamalar için bellekte; geçmiş bir gün sorulduysa eksikleri tek sorguda al
+                eksik_idler = [d[3] for d in durumlar if d[3] is not None and d[3] not in onbellek.adlar]
+                eksik_adlar = dict(conn.execute(f"SELECT id, musteri_adi FROM rezervasyonlar WHERE id IN ({','.join('?' * len(eksik_idler))})",
+                                                eksik_idler).fetchall()) if eksik_idler else {}
+                return [(oda_no, tip, durum, onbellek.adlar.get(rez_id) or eksik_adlar.get(rez_id) if rez_id is not None else None,
+                         gun_tarihi(cikis) if cikis is not None else None)
+                        for oda_no, tip, durum, rez_id, cikis in durumlar]
+            cursor = conn.execute("""
+                SELECT o.oda_numarasi, o.oda_tipi, o.oda_durumu, r.musteri_adi, r.cikis_tarihi 
+                FROM odalar o 
+                LEFT JOIN rezervasyonlar r ON o.oda_numarasi = r.oda_no AND ? >= r.giris_tarihi AND ? < r.cikis_tarihi 
+                ORDER BY o.oda_numarasi
+            """, (bugun_sql, bugun_sql))
+            return cursor.fetchall()
     except sqlite3.Error as e:
         print(f"Anlık oda durumu alınırken hata: {e}")
         return []
-    finally:
-        if conn: conn.close()
+
+@izleme.olculur
+def takvim_rezervasyonlari(baslangic, bitis):
+    """
+    [baslangic, bitis) günleriyle çakışan tüm rezervasyonları tek sorguda çeker (takvim görünümü):
+    (oda_no, id, giris_tarihi, cikis_tarihi, musteri_adi, odeme_durumu) listesi, oda ve tarihe göre sıralı.
+    """
+    try:
+        with baglanti() as conn:
+            # CROSS JOIN odaları dış döngüde tutar: her oda için (oda_no, cikis_tarihi) indeksinde
+            # 'cikis_tarihi > baslangic' aralığı taranır, geçmiş konaklamalar hiç okunmaz
+            return conn.execute("""
+                SELECT r.oda_no, r.id, r.giris_tarihi, r.cikis_tarihi, r.musteri_adi, r.odeme_durumu
+                FROM odalar o CROSS JOIN rezervasyonlar r ON r.oda_no = o.oda_numarasi
+                WHERE r.cikis_tarihi > ? AND r.giris_tarihi < ?
+                ORDER BY o.oda_numarasi, r.cikis_tarihi
+            """, (baslangic, bitis)).fetchall()
+    except sqlite3.Error as e:
+        print(f"Takvim rezervasyonları çekilirken hata: {e}")
+        raise
 
 # --- REZERVASYON CRUD ---
 
+@izleme.olculur
 def rezervasyon_ekle(ad, atanan_oda_no, giris, cikis, fiyat, odeme_durumu):
-    """Veritabanına yeni bir rezervasyon kaydı ekler."""
-    conn = None
+    """Veritabanına yeni bir rezervasyon kaydı ekler ve ID'sini döndürür."""
     try:
-        conn = baglanti_olustur()
-        cursor = conn.cursor()
-        cursor.execute("INSERT INTO rezervasyonlar (musteri_adi, oda_no, giris_tarihi, cikis_tarihi, toplam_fiyat, odeme_durumu) VALUES (?, ?, ?, ?, ?, ?)", (ad, atanan_oda_no, giris, cikis, fiyat, odeme_durumu))
-        conn.commit()
+        with yazma_islemi() as conn:
+            cursor = conn.execute("INSERT INTO rezervasyonlar (musteri_adi, oda_no, giris_tarihi, cikis_tarihi, toplam_fiyat, odeme_durumu) VALUES (?, ?, ?, ?, ?, ?)", (ad, atanan_oda_no, giris, cikis, fiyat, odeme_durumu))
+            rez_id = cursor.lastrowid
+            _onbellege_yansit(conn, {'rezervasyonlar': 1}, lambda o: o.rezervasyon_ekle(rez_id, str(atanan_oda_no), gun_no(giris), gun_no(cikis), ad))
+            return rez_id
     except sqlite3.Error as e:
         print(f"Rezervasyon eklenirken hata: {e}")
-        if conn: conn.rollback()
         raise
-    finally:
-        if conn: conn.close()
 
+def _mesgul_hatasi_mi(e):
+    """Yardımcı: Hata, veritabanının başka bir yazıcı tarafından kilitlenmesinden mi kaynaklanıyor?"""
+    kod = getattr(e, 'sqlite_errorcode', None) # Python 3.11+
+    if kod is not None: return kod in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    return 'locked' in str(e) or 'busy' in str(e)
+
+def yazma_islemi_baslat(conn):
+    """Bağlantıda BEGIN IMMEDIATE ile yazma işlemi başlatır; kilit doluysa artan aralıklarla tekrar dener."""
+    bekleme = 0.05
+    for deneme in range(1, YENIDEN_DENEME_SAYISI + 1):
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            return
+        except sqlite3.OperationalError as e:
+            if not _mesgul_hatasi_mi(e) or deneme == YENIDEN_DENEME_SAYISI: raise
+            time.sleep(bekleme * random.uniform(0.5, 1.5))
+            bekleme *= 2
+
+@contextmanager
+def yazma_islemi():
+    """
+    baglanti() gibidir, ama işlemi en başta BEGIN IMMEDIATE ile açar (tek yazıcı). Aynı süreçteki
+    yazıcılar sırayla kilidi bekler; başka süreçlerin yazıcıları için SQLite'ın busy_timeout
+    beklemesi ve yazma_islemi_baslat'ın yeniden denemeleri devreye girer. Önce okuyup sonra
+    yazan işlemler böylece yazma kilidine geç yükselirken "database is locked" almaz.
+    """
+    _baglanti_getir() # Gerekirse şema hazırlığı yazıcı kilidinden önce yapılsın (kilit sırası: şema -> yazıcı)
+    baslangic = time.perf_counter()
+    with _yazici_kilidi:
+        with baglanti() as conn:
+            if not conn.in_transaction: yazma_islemi_baslat(conn)
+            if izleme.AKTIF: izleme.bekleme_ekle(time.perf_counter() - baslangic)
+            yield conn
+
+@izleme.olculur
+def rezervasyon_yap_atomik(oda_tipi, giris, cikis, ad, fiyat, odeme_durumu='Ödenmedi'):
+    """
+    Boş ve temiz bir oda bulup rezervasyonu TEK bir BEGIN IMMEDIATE işleminde ekler.
+    (rezervasyon ID'si, atanan oda numarası), uygun oda yoksa None döndürür. Yazma kilidi alınamazsa
+    (SQLITE_BUSY) artan bekleme süreleriyle YENIDEN_DENEME_SAYISI kez tekrar dener.
+    """
+    bekleme = 0.05 # saniye
+    for deneme in range(1, YENIDEN_DENEME_SAYISI + 1):
+        try:
+            # Yazma kilidini en başta al: seçim ile ekleme arasında başka bir yazıcı araya giremez
+            with yazma_islemi() as conn:
+                cursor = conn.cursor()
+                atanan_oda = _musait_oda_sec(cursor, oda_tipi, giris, cikis)
+                if atanan_oda is None: return None
+                cursor.execute("INSERT INTO rezervasyonlar (musteri_adi, oda_no, giris_tarihi, cikis_tarihi, toplam_fiyat, odeme_durumu) VALUES (?, ?, ?, ?, ?, ?)", (ad, atanan_oda, giris, cikis, fiyat, odeme_durumu))
+                rez_id = cursor.lastrowid
+                _onbellege_yansit(conn, {'rezervasyonlar': 1}, lambda o: o.rezervasyon_ekle(rez_id, atanan_oda, gun_no(giris), gun_no(cikis), ad))
+                return rez_id, atanan_oda
+        except sqlite3.OperationalError as e:
+            if not _mesgul_hatasi_mi(e) or deneme == YENIDEN_DENEME_SAYISI:
+                print(f"Rezervasyon yapılırken hata: {e}")
+                raise
+            time.sleep(bekleme * random.uniform(0.5, 1.5)) # Yazıcılar aynı anda tekrar denemesin
+            bekleme *= 2
+        except sqlite3.Error as e:
+            print(f"Rezervasyon yapılırken hata: {e}")
+            raise
+
+@izleme.olculur
 def rezervasyon_guncelle(rezervasyon_id, ad, atanan_oda_no, giris, cikis, fiyat, odeme_durumu):
     """Belirtilen ID'ye sahip rezervasyon kaydını günceller."""
-    conn = None
     try:
-        conn = baglanti_olustur()
-        cursor = conn.cursor()
-        cursor.execute("UPDATE rezervasyonlar SET musteri_adi = ?, oda_no = ?, giris_tarihi = ?, cikis_tarihi = ?, toplam_fiyat = ?, odeme_durumu = ? WHERE id = ?", (ad, atanan_oda_no, giris, cikis, fiyat, odeme_durumu, rezervasyon_id))
-        conn.commit()
+        with yazma_islemi() as conn:
+            cursor = conn.execute("UPDATE rezervasyonlar SET musteri_adi = ?, oda_no = ?, giris_tarihi = ?, cikis_tarihi = ?, toplam_fiyat = ?, odeme_durumu = ? WHERE id = ?", (ad, atanan_oda_no, giris, cikis, fiyat, odeme_durumu, rezervasyon_id))
+            def degisiklik(onbellek):
+                onbellek.rezervasyon_sil(rezervasyon_id)
+                onbellek.rezervasyon_ekle(rezervasyon_id, str(atanan_oda_no), gun_no(giris), gun_no(cikis), ad)
+            if cursor.rowcount: _onbellege_yansit(conn, {'rezervasyonlar': cursor.rowcount}, degisiklik)
     except sqlite3.Error as e:
         print(f"Rezervasyon güncellenirken hata: {e}")
-        if conn: conn.rollback()
         raise
-    finally:
-        if conn: conn.close()
 
+@izleme.olculur
 def rezervasyonlari_cek():
-    """Tüm rezervasyonları listelemek için çeker."""
-    conn = None
+    """Tüm rezervasyonları listelemek için çeker (kayitlar.Rezervasyon listesi)."""
     try:
-        conn = baglanti_olustur()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT r.id, r.musteri_adi, o.oda_tipi, r.oda_no, r.giris_tarihi, r.cikis_tarihi, 
-                   r.toplam_fiyat, r.odeme_durumu 
-            FROM rezervasyonlar r 
-            JOIN odalar o ON r.oda_no = o.oda_numarasi 
-            ORDER BY r.giris_tarihi
-        """)
-        return cursor.fetchall()
+        with baglanti() as conn:
+            cursor = _kayit_imleci(conn, Rezervasyon).execute("""
+                SELECT r.id, r.musteri_adi, o.oda_tipi, r.oda_no, r.giris_tarihi, r.cikis_tarihi, 
+                       r.toplam_fiyat, r.odeme_durumu 
+                FROM rezervasyonlar r 
+                JOIN odalar o ON r.oda_no = o.oda_numarasi 
+                ORDER BY r.giris_tarihi
+            """)
+            return cursor.fetchall()
     except sqlite3.Error as e:
         print(f"Rezervasyonlar çekilirken hata: {e}")
         return []
-    finally:
-        if conn: conn.close()
 
+@izleme.olculur
+def rezervasyon_getir(rezervasyon_id):
+    """Tek bir rezervasyonu listedeki sütunlarla getirir (bulunamazsa None)."""
+    try:
+        with baglanti() as conn:
+            return _kayit_imleci(conn, Rezervasyon).execute("""
+                SELECT r.id, r.musteri_adi, o.oda_tipi, r.oda_no, r.giris_tarihi, r.cikis_tarihi,
+                       r.toplam_fiyat, r.odeme_durumu
+                FROM rezervasyonlar r
+                LEFT JOIN odalar o ON r.oda_no = o.oda_numarasi
+                WHERE r.id = ?
+            """, (rezervasyon_id,)).fetchone()
+    except sqlite3.Error as e:
+        print(f"Rezervasyon getirilirken hata: {e}")
+        return None
+
+@izleme.olculur
+def rezervasyon_sayfasi_cek(anahtar=None, limit=200, geriye=False, dahil=False):
+    """
+    Rezervasyonları (giris_tarihi, id) sırasında sayfa sayfa çeker (keyset sayfalama).
+    anahtar=(giris_tarihi, id) verilirse o kaydın sonrasındaki, geriye=True ise öncesindeki
+    en fazla 'limit' kaydı döndürür (dahil=True ise anahtarın kendisi de dahildir).
+    Sonuç her zaman artan sıradadır.
+    """
+    try:
+        with baglanti() as conn:
+            kosul, parametreler = "", []
+            if anahtar is not None:
+                kosul = f"WHERE (r.giris_tarihi, r.id) {'<' if geriye else '>'}{'=' if dahil else ''} (?, ?)"
+                parametreler = list(anahtar)
+            yon = "DESC" if geriye else "ASC"
+            cursor = _kayit_imleci(conn, Rezervasyon).execute(f"""
+                SELECT r.id, r.musteri_adi, o.oda_tipi, r.oda_no, r.giris_tarihi, r.cikis_tarihi, 
+                       r.toplam_fiyat, r.odeme_durumu 
+                FROM rezervasyonlar r 
+                JOIN odalar o ON r.oda_no = o.oda_numarasi 
+                {kosul}
+                ORDER BY r.giris_tarihi {yon}, r.id {yon}
+                LIMIT ?
+            """, parametreler + [limit])
+            sayfa = cursor.fetchall()
+            return sayfa[::-1] if geriye else sayfa
+    except sqlite3.Error as e:
+        print(f"Rezervasyon sayfası çekilirken hata: {e}")
+        return []
+
+@izleme.olculur
 def rezervasyon_sil(rezervasyon_id):
     """Veritabanından belirli bir ID'ye sahip kaydı siler."""
-    conn = None
     try:
-        conn = baglanti_olustur()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM rezervasyonlar WHERE id=?", (rezervasyon_id,))
-        conn.commit()
+        with yazma_islemi() as conn:
+            cursor = conn.execute("DELETE FROM rezervasyonlar WHERE id=?", (rezervasyon_id,))
+            _onbellege_yansit(conn, {'rezervasyonlar': cursor.rowcount}, lambda o: o.rezervasyon_sil(rezervasyon_id))
     except sqlite3.Error as e:
         print(f"Rezervasyon silinirken hata: {e}")
-        if conn: conn.rollback()
         raise
-    finally:
-        if conn: conn.close()
 
-def rezervasyon_ara(arama_metni):
-    """Müşteri adı, oda tipi, oda no veya ödeme durumuna göre arar."""
-    conn = None
+def _arama_ifadesi(arama_metni):
+    """Yardımcı: Kullanıcı metnini FTS5 sorgusuna çevirir: her kelime önek olarak aranır, hepsi eşleşmeli."""
+    kelimeler = re.findall(r"\w+", arama_metni.replace('ı', 'i').replace('İ', 'i'))
+    return " AND ".join(f'"{kelime}"*' for kelime in kelimeler)
+
+@izleme.olculur
+def rezervasyon_ara(arama_metni, arsiv_dahil=False, yol_bildir=False):
+    """
+    Müşteri adı, oda tipi, oda no veya ödeme durumuna göre arar (kelime öneki, Türkçe harf duyarsız, alakaya göre sıralı).
+    arsiv_dahil=True ise arşivdeki eşleşmeler (en yeniler önce) sonuçların sonuna eklenir. yol_bildir=True ise
+    (sonuçlar, kelime_aramasi_mi) döndürür: False, aramanın FTS5 yerine LIKE '%metin%' ile yapıldığını gösterir.
+    """
     try:
-        conn = baglanti_olustur()
-        cursor = conn.cursor()
-        arama_kosulu = f'%{arama_metni}%'
-        cursor.execute("""
-            SELECT r.id, r.musteri_adi, o.oda_tipi, r.oda_no, r.giris_tarihi, r.cikis_tarihi, 
-                   r.toplam_fiyat, r.odeme_durumu 
-            FROM rezervasyonlar r 
-            JOIN odalar o ON r.oda_no = o.oda_numarasi 
-            WHERE r.musteri_adi LIKE ? OR o.oda_tipi LIKE ? OR r.oda_no LIKE ? OR r.odeme_durumu LIKE ?
-            ORDER BY r.giris_tarihi
-        """, (arama_kosulu, arama_kosulu, arama_kosulu, arama_kosulu))
-        return cursor.fetchall()
+        with baglanti() as conn:
+            fts_var = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'rezervasyon_arama'").fetchone()
+            ifade = _arama_ifadesi(arama_metni)
+            if fts_var and ifade:
+                # Önce en yeni ARAMA_SONUC_LIMITI eşleşmenin sınırını bul: FTS5 rowid sırasında erken durabilir,
+                # böylece "a" gibi çok geniş aramalarda bile tüm eşleşmeler için alaka puanı hesaplanmaz.
+                sinir = conn.execute("""
+                    SELECT MIN(rowid) FROM (SELECT rowid FROM rezervasyon_arama
+                                           WHERE rezervasyon_arama MATCH ? ORDER BY rowid DESC LIMIT ?)
+                """, (ifade, ARAMA_SONUC_LIMITI)).fetchone()[0]
+                sonuclar = [] if sinir is None else _kayit_imleci(conn, Rezervasyon).execute("""
+                    SELECT r.id, r.musteri_adi, o.oda_tipi, r.oda_no, r.giris_tarihi, r.cikis_tarihi, 
+                           r.toplam_fiyat, r.odeme_durumu 
+                    FROM rezervasyon_arama a
+                    JOIN rezervasyonlar r ON r.id = a.rowid
+                    JOIN odalar o ON r.oda_no = o.oda_numarasi 
+                    WHERE rezervasyon_arama MATCH ? AND a.rowid >= ?
+                    ORDER BY a.rank, r.giris_tarihi
+                """, (ifade, sinir)).fetchall()
+            else: # FTS5 yoksa (veya metinde kelime yoksa) eski LIKE araması
+                arama_kosulu = f'%{arama_metni}%'
+                sonuclar = _kayit_imleci(conn, Rezervasyon).execute("""
+                    SELECT r.id, r.musteri_adi, o.oda_tipi, r.oda_no, r.giris_tarihi, r.cikis_tarihi, 
+                           r.toplam_fiyat, r.odeme_durumu 
+                    FROM rezervasyonlar r 
+                    JOIN odalar o ON r.oda_no = o.oda_numarasi 
+                    WHERE r.musteri_adi LIKE ? OR o.oda_tipi LIKE ? OR r.oda_no LIKE ? OR r.odeme_durumu LIKE ?
+                    ORDER BY r.giris_tarihi
+                    LIMIT ?
+                """, (arama_kosulu, arama_kosulu, arama_kosulu, arama_kosulu, ARAMA_SONUC_LIMITI)).fetchall()
+            if arsiv_dahil and _arsivi_bagla(conn): sonuclar += _arsivde_ara(conn, ifade if fts_var else '', arama_metni)
+            return (sonuclar, bool(fts_var and ifade)) if yol_bildir else sonuclar
     except sqlite3.Error as e:
         print(f"Rezervasyon aranırken hata: {e}")
-        return []
-    finally:
-        if conn: conn.close()
+        return ([], False) if yol_bildir else []
 
 # --- CHECK-OUT ---
 
+@izleme.olculur
 def check_out_yap(rezervasyon_id, oda_no):
     """Check-out işlemini otomatize eder (Transaction)."""
-    conn = None
     try:
-        conn = baglanti_olustur()
-        cursor = conn.cursor()
-        # Önce odanın var olup olmadığını kontrol etmek iyi olabilir ama şimdilik geçelim
-        cursor.execute("UPDATE rezervasyonlar SET odeme_durumu = 'Tamamı Ödendi' WHERE id = ?", (rezervasyon_id,))
-        cursor.execute("UPDATE odalar SET oda_durumu = 'Kirli' WHERE oda_numarasi = ?", (oda_no,))
-        conn.commit()
+        with yazma_islemi() as conn:
+            # Önce odanın var olup olmadığını kontrol etmek iyi olabilir ama şimdilik geçelim
+            rez_sayisi = conn.execute("UPDATE rezervasyonlar SET odeme_durumu = 'Tamamı Ödendi' WHERE id = ?", (rezervasyon_id,)).rowcount
+            oda_sayisi = conn.execute("UPDATE odalar SET oda_durumu = 'Kirli' WHERE oda_numarasi = ?", (oda_no,)).rowcount
+            _onbellege_yansit(conn, {'rezervasyonlar': rez_sayisi, 'odalar': oda_sayisi}, lambda o: o.oda_durumu_ayarla(str(oda_no), 'Kirli'))
     except sqlite3.Error as e:
         print(f"Check-out sırasında hata: {e}")
-        if conn: conn.rollback()
         raise
-    finally:
-        if conn: conn.close()
 
-# --- BAŞLANGIÇ ---
-# Bu script import edildiğinde veritabanının hazır olmasını sağla
-veritabani_baslat()
-print("Veritabanı modülü yüklendi ve veritabanı hazır.")
+def _check_out_uygula(conn, ciftler):
+    """
+    Yardımcı: (rezervasyon_id, oda_no) çiftlerini açık yazma işleminde check-out yapar; her tablo için
+    tek executemany ve önbelleğe tek yansıtma. 'Kirli' yapılan oda numaralarını döndürür.
+    """
+    if not ciftler: return []
+    odalar = sorted({str(oda_no) for _, oda_no in ciftler})
+    rez_sayisi = conn.executemany("UPDATE rezervasyonlar SET odeme_durumu = 'Tamamı Ödendi' WHERE id = ?", [(rez_id,) for rez_id, _ in ciftler]).rowcount
+    oda_sayisi = conn.executemany("UPDATE odalar SET oda_durumu = 'Kirli' WHERE oda_numarasi = ?", [(oda_no,) for oda_no in odalar]).rowcount
+    def degisiklik(onbellek):
+        for oda_no in odalar: onbellek.oda_durumu_ayarla(oda_no, 'Kirli')
+    _onbellege_yansit(conn, {'rezervasyonlar': rez_sayisi, 'odalar': oda_sayisi}, degisiklik)
+    return odalar
+
+@izleme.olculur
+def toplu_check_out(rezervasyon_idleri):
+    """Verilen rezervasyonların hepsini tek işlemde check-out yapar; bulunamayan ID'ler atlanır. 'Kirli' yapılan odaları döndürür."""
+    rezervasyon_idleri = list(rezervasyon_idleri)
+    try:
+        with yazma_islemi() as conn:
+            ciftler = []
+            for i in range(0, len(rezervasyon_idleri), 500): # SQLite parametre sınırının altında kal
+                parca = rezervasyon_idleri[i:i + 500]
+                ciftler += conn.execute(f"SELECT id, oda_no FROM rezervasyonlar WHERE id IN ({','.join('?' * len(parca))})", parca).fetchall()
+            return _check_out_uygula(conn, ciftler)
+    except sqlite3.Error as e:
+        print(f"Toplu check-out sırasında hata: {e}")
+        raise
+
+@izleme.olculur
+def gunun_cikislari(tarih_sql):
+    """
+    Çıkış tarihi verilen gün olan rezervasyonlar (kat hizmetleri listesi):
+    (id, musteri_adi, oda_no, oda_tipi, odeme_durumu, oda_durumu) listesi, oda numarasına göre sıralı.
+    """
+    try:
+        with baglanti() as conn:
+            # Her oda için (oda_no, cikis_tarihi) indeksinde tek eşitlik araması
+            cursor = conn.execute("""
+                SELECT r.id, r.musteri_adi, r.oda_no, o.oda_tipi, r.odeme_durumu, o.oda_durumu
+                FROM odalar o JOIN rezervasyonlar r ON r.oda_no = o.oda_numarasi AND r.cikis_tarihi = ?
+                ORDER BY o.oda_numarasi
+            """, (tarih_sql,))
+            return cursor.fetchall()
+    except sqlite3.Error as e:
+        print(f"Günün çıkışları çekilirken hata: {e}")
+        return []
+
+@izleme.olculur
+def gunun_cikislarini_yap(tarih_sql):
+    """Çıkış tarihi verilen gün olan tüm rezervasyonları tek işlemde check-out yapar. 'Kirli' yapılan odaları döndürür."""
+    try:
+        with yazma_islemi() as conn:
+            ciftler = conn.execute("SELECT id, oda_no FROM rezervasyonlar WHERE cikis_tarihi = ?", (tarih_sql,)).fetchall()
+            return _check_out_uygula(conn, ciftler)
+    except sqlite3.Error as e:
+        print(f"Günün çıkışları yapılırken hata: {e}")
+        raise
+
+# --- KAT HİZMETLERİ ---
+
+@izleme.olculur
+def oda_durumlarini_guncelle(oda_nolar, durum):
+    """Verilen odaların fiziksel durumunu (Temiz/Kirli/Tadilatta) tek işlemde değiştirir. Güncellenen oda sayısını döndürür."""
+    oda_nolar = sorted({str(oda_no) for oda_no in oda_nolar})
+    if not oda_nolar: return 0
+    try:
+        with yazma_islemi() as conn:
+            sayi = conn.executemany("UPDATE odalar SET oda_durumu = ? WHERE oda_numarasi = ?", [(durum, oda_no) for oda_no in oda_nolar]).rowcount
+            def degisiklik(onbellek):
+                for oda_no in oda_nolar: onbellek.oda_durumu_ayarla(oda_no, durum)
+            _onbellege_yansit(conn, {'odalar': sayi}, degisiklik)
+            return sayi
+    except sqlite3.Error as e:
+        print(f"Oda durumları güncellenirken hata: {e}")
+        raise
+
+@izleme.olculur
+def gelecek_atamalari_iyilestir(bugun_sql=None, uygula=True):
+    """
+    Girişi bugünden sonra olan rezervasyonları aynı tipteki odalar arasında yeniden dağıtarak yetim
+    geceleri azaltır (bkz. oda_atama.gelecegi_planla). uygula=False ise yalnızca plan hesaplanır.
+    (taşınan rezervasyon sayısı, önceki yetim gece sayısı, sonraki yetim gece sayısı) döndürür.
+    """
+    bugun_sql = bugun_sql or datetime.now().strftime("%Y-%m-%d")
+    try:
+        with yazma_islemi() as conn: # Plan ile taşıma arasında başka rezervasyon araya girmesin
+            odalar = conn.execute("SELECT oda_numarasi, oda_tipi, oda_durumu FROM odalar").fetchall()
+            rezervasyonlar = {rez_id: (oda_no, giris, cikis, ad) for rez_id, oda_no, giris, cikis, ad in conn.execute(
+                "SELECT id, oda_no, giris_gun, cikis_gun, musteri_adi FROM rezervasyonlar WHERE cikis_tarihi > ?", (bugun_sql,))}
+            tasimalar, once, sonra = oda_atama.gelecegi_planla(
+                odalar, [(rez_id, oda_no, giris, cikis) for rez_id, (oda_no, giris, cikis, _) in rezervasyonlar.items()], gun_no(bugun_sql))
+            if not uygula or not tasimalar: return len(tasimalar), once, sonra
+            conn.executemany("UPDATE rezervasyonlar SET oda_no = ? WHERE id = ?", [(oda_no, rez_id) for rez_id, oda_no in tasimalar.items()])
+            def degisiklik(onbellek):
+                for rez_id, oda_no in tasimalar.items():
+                    _, giris, cikis, ad = rezervasyonlar[rez_id]
+                    onbellek.rezervasyon_sil(rez_id)
+                    onbellek.rezervasyon_ekle(rez_id, oda_no, giris, cikis, ad)
+            _onbellege_yansit(conn, {'rezervasyonlar': len(tasimalar)}, degisiklik)
+            return len(tasimalar), once, sonra
+    except sqlite3.Error as e:
+        print(f"Oda atamaları iyileştirilirken hata: {e}")
+        raise
+
+# --- ARŞİV ---
+# Çıkışı eski rezervasyonlar ayrı bir dosyaya taşınır (bkz. arsivleme.py). Arşiv, ihtiyaç olduğunda
+# bağlantıya 'arsiv' adıyla bağlanır (ATTACH); günlük sorgular yalnızca sıcak tabloyu okur.
+
+def arsiv_yolu():
+    """Arşiv veritabanı dosyasının yolu (ARSIV_DB_NAME veya DB_NAME'in yanında '<ad>_arsiv.db')."""
+    return ARSIV_DB_NAME or f"{os.path.splitext(DB_NAME)[0]}_arsiv.db"
+
+def _arsiv_semasini_kur(conn):
+    """Yardımcı: Bağlı arşivde tabloları ve indeksleri oluşturur (varsa dokunmaz)."""
+    # ID'ler sıcak tablodakiyle aynı kalır. oda_tipi arşivlenirken kopyalanır: oda sonradan silinse veya
+    # tipi değişse de arşivdeki kayıt ve rapor katkısı o günkü haliyle kalır. Gün sütunları kopyalanmaz,
+    # sıcak tablodaki gibi üretilir.
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS arsiv.rezervasyonlar (
+            id INTEGER PRIMARY KEY,
+            musteri_adi TEXT NOT NULL,
+            oda_tipi TEXT NOT NULL,
+            oda_no TEXT NOT NULL,
+            giris_tarihi TEXT NOT NULL,
+            cikis_tarihi TEXT NOT NULL,
+            toplam_fiyat REAL DEFAULT 0,
+            odeme_durumu TEXT NOT NULL,
+            arsivlenme_tarihi TEXT NOT NULL,
+            {_gun_sutunu('giris')},
+            {_gun_sutunu('cikis')}
+        )
+    """)
+    # Birleşik raporlar dönemle çakışan konaklamaları 'cikis_tarihi > ?' ile seçer
+    conn.execute("CREATE INDEX IF NOT EXISTS arsiv.idx_arsiv_cikis ON rezervasyonlar (cikis_tarihi, giris_tarihi)")
+    if conn.execute("SELECT 1 FROM main.sqlite_master WHERE name = 'rezervasyon_arama'").fetchone():
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS arsiv.rezervasyon_arama USING fts5(
+                musteri_adi, oda_no, oda_tipi, odeme_durumu,
+                tokenize = 'unicode61 remove_diacritics 2', prefix = '1 2 3'
+            )
+        """)
+
+def _arsivi_bagla(conn, olustur=False):
+    """
+    Yardımcı: Arşivi bağlantıya 'arsiv' adıyla bağlar, bağlıysa True döndürür. Arşiv dosyası yoksa
+    olustur=True ile oluşturulur, aksi halde False döner. ATTACH işlem içinde yapılamadığı için açık
+    bir işlemin ortasında çağrılırsa arşiv bu seferlik atlanır.
+    """
+    if conn.execute("SELECT 1 FROM pragma_database_list WHERE name = 'arsiv'").fetchone(): return True
+    yol = arsiv_yolu()
+    if conn.in_transaction or (not os.path.exists(yol) and (not olustur or SALT_OKUNUR)): return False
+    conn.execute("ATTACH DATABASE ? AS arsiv", (f"file:{urllib.parse.quote(os.path.abspath(yol))}?mode=ro" if SALT_OKUNUR else yol,))
+    if olustur:
+        istenen = DEPOLAMA_PROFILLERI[DEPOLAMA_PROFILI].get('journal_mode')
+        if istenen: conn.execute(f"PRAGMA arsiv.journal_mode = {istenen}")
+        _arsiv_semasini_kur(conn)
+    return True
+
+def _arsivde_ara(conn, ifade, arama_metni):
+    """Yardımcı: rezervasyon_ara'nın arşiv kısmı; sıcak tabloda da bulunan (taşınması yarım kalmış) ID'ler atlanır."""
+    if ifade and conn.execute("SELECT 1 FROM arsiv.sqlite_master WHERE name = 'rezervasyon_arama'").fetchone():
+        return _kayit_imleci(conn, Rezervasyon).execute("""
+            SELECT r.id, r.musteri_adi, r.oda_tipi, r.oda_no, r.giris_tarihi, r.cikis_tarihi, r.toplam_fiyat, r.odeme_durumu
+            FROM arsiv.rezervasyon_arama a
+            JOIN arsiv.rezervasyonlar r ON r.id = a.rowid
+            WHERE rezervasyon_arama MATCH ? AND NOT EXISTS (SELECT 1 FROM main.rezervasyonlar h WHERE h.id = r.id)
+            ORDER BY a.rowid DESC
+            LIMIT ?
+        """, (ifade, ARAMA_SONUC_LIMITI)).fetchall()
+    arama_kosulu = f'%{arama_metni}%'
+    return _kayit_imleci(conn, Rezervasyon).execute("""
+        SELECT r.id, r.musteri_adi, r.oda_tipi, r.oda_no, r.giris_tarihi, r.cikis_tarihi, r.toplam_fiyat, r.odeme_durumu
+        FROM arsiv.rezervasyonlar r
+        WHERE (r.musteri_adi LIKE ? OR r.oda_tipi LIKE ? OR r.oda_no LIKE ? OR r.odeme_durumu LIKE ?)
+              AND NOT EXISTS (SELECT 1 FROM main.rezervasyonlar h WHERE h.id = r.id)
+        ORDER BY r.id DESC
+        LIMIT ?
+    """, (arama_kosulu, arama_kosulu, arama_kosulu, arama_kosulu, ARAMA_SONUC_LIMITI)).fetchall()
+
+def _ozet_kaynagi(conn, baslangic, bitis, arsiv_dahil=False):
+    """
+    Yardımcı: Raporların (gun, oda_tipi, satilan_oda, gelir) satırlarını okuyacağı FROM ifadesi ve parametreleri.
+    Arşivin özet tablosu yoktur: arsiv_dahil ise [baslangic, bitis) ile çakışan arşiv satırlarının katkısı
+    _OZET_KATKISI ile aynı kuralla hesaplanıp gunluk_ozet'e eklenir.
+    """
+    if not arsiv_dahil or not _arsivi_bagla(conn): return "gunluk_ozet", []
+    return """(
+        SELECT gun, oda_tipi, satilan_oda, gelir FROM gunluk_ozet
+        UNION ALL
+        SELECT t.gun, r.oda_tipi, COUNT(*), TOTAL(r.toplam_fiyat / (r.cikis_gun - r.giris_gun))
+        FROM arsiv.rezervasyonlar r JOIN takvim t ON t.gun >= r.giris_tarihi AND t.gun < r.cikis_tarihi
+        WHERE r.cikis_tarihi > ? AND r.giris_tarihi < ? AND t.gun >= ? AND t.gun < ?
+              AND NOT EXISTS (SELECT 1 FROM main.rezervasyonlar h WHERE h.id = r.id)
+        GROUP BY t.gun, r.oda_tipi
+    )""", [baslangic, bitis, baslangic, bitis]
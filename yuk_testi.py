@@ -0,0 +1,124 @@
+"""
+api_sunucu.py'ye karşı yük testi.
+
+ESZAMANLI kadar istemci (thread, her biri kalıcı bir HTTP bağlantısıyla) toplam ISTEK kadar
+karışık istek gönderir: müsaitlik, fiyat, liste sayfası, oda durumu, arama ve YAZMA_ORANI
+kadar rezervasyon. İstek türü başına adet, hata, p50/p95/p99 süreleri ve toplam istek/saniye
+yazdırılır. --yerel ile sunucu geçici bir veritabanı üzerinde ayrı bir süreçte başlatılır,
+böylece gerçek veritabanına dokunulmaz.
+
+Kullanım:  python yuk_testi.py --yerel [--esz 16] [--istek 4000] [--yazma 0.1] [--isci 4]
+           python yuk_testi.py --adres http://127.0.0.1:8080
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from urllib.parse import quote, urlsplit
+
+ODA_TIPLERI = ['Tek Kişilik', 'Çift Kişilik', 'Suit']
+ARAMALAR = ['ali', 'ayş', 'suit', 'öde', 'mehmet', '101']
+
+def _yuzdelik(sirali, oran):
+    return sirali[math.ceil(oran * len(sirali)) - 1] if sirali else 0.0
+
+def _istek_sec(rastgele, yazma_orani):
+    """Yardımcı: Rastgele bir (tür, yöntem, yol, gövde) seçer."""
+    giris = date.today() + timedelta(days=rastgele.randint(0, 3650))
+    cikis = giris + timedelta(days=rastgele.randint(1, 5))
+    if rastgele.random() < yazma_orani:
+        govde = {"musteri_adi": f"Yük Testi {rastgele.randint(1, 10**6)}", "oda_tipi": rastgele.choice(ODA_TIPLERI),
+                 "giris_tarihi": giris.isoformat(), "cikis_tarihi": cikis.isoformat()}
+        return 'rezervasyon', 'POST', '/rezervasyonlar', govde
+    tur = rastgele.choices(['musaitlik', 'fiyat', 'liste', 'oda-durumu', 'arama'], weights=[35, 20, 20, 15, 10])[0]
+    if tur == 'musaitlik': return tur, 'GET', f'/musaitlik?giris={giris}&cikis={cikis}', None
+    if tur == 'fiyat': return tur, 'GET', f'/fiyat?oda_tipi={quote(rastgele.choice(ODA_TIPLERI))}&giris={giris}&cikis={cikis}', None
+    if tur == 'liste': return tur, 'GET', '/rezervasyonlar?limit=100', None
+    if tur == 'oda-durumu': return tur, 'GET', f'/oda-durumu?tarih={giris}', None
+    return tur, 'GET', f'/rezervasyonlar/ara?q={quote(rastgele.choice(ARAMALAR))}', None
+
+def _istemci(adres, istek_sayisi, yazma_orani, tohum, sonuclar):
+    """Bir istemci: tek bağlantı üzerinden sırayla istek gönderir, (tür, durum, ms) kaydeder."""
+    rastgele = random.Random(tohum)
+    baglanti = http.client.HTTPConnection(adres.hostname, adres.port or 80, timeout=30)
+    kayitlar = []
+    for _ in range(istek_sayisi):
+        tur, yontem, yol, govde = _istek_sec(rastgele, yazma_orani)
+        veri = json.dumps(govde).encode('utf-8') if govde is not None else None
+        baslangic = time.perf_counter()
+        try:
+            baglanti.request(yontem, yol, body=veri, headers={"Content-Type": "application/json"} if veri else {})
+            yanit = baglanti.getresponse(); yanit.read()
+            durum = yanit.status
+        except (OSError, http.client.HTTPException):
+            durum = 0 # Bağlantı hatası
+            baglanti.close()
+            baglanti = http.client.HTTPConnection(adres.hostname, adres.port or 80, timeout=30)
+        kayitlar.append((tur, durum, (time.perf_counter() - baslangic) * 1000))
+    baglanti.close()
+    sonuclar.extend(kayitlar)
+
+def yuk_testi(adres, eszamanli, istek_sayisi, yazma_orani):
+    """Testi çalıştırır ve sonuç tablosunu yazdırır."""
+    adres = urlsplit(adres)
+    sonuclar, istemciler = [], []
+    for i in range(eszamanli):
+        pay = istek_sayisi // eszamanli + (1 if i < istek_sayisi % eszamanli else 0)
+        istemciler.append(threading.Thread(target=_istemci, args=(adres, pay, yazma_orani, i, sonuclar)))
+    baslangic = time.perf_counter()
+    for istemci in istemciler: istemci.start()
+    for istemci in istemciler: istemci.join()
+    sure = time.perf_counter() - baslangic
+
+    print(f"{eszamanli} istemci, {len(sonuclar)} istek, {sure:.2f} sn -> {len(sonuclar) / sure:.1f} istek/sn")
+    print(f"{'Tür':>12} | {'adet':>6} | {'2xx':>6} | {'409':>5} | {'diğer':>5} | {'p50 ms':>7} | {'p95 ms':>7} | {'p99 ms':>7}")
+    for tur in sorted({s[0] for s in sonuclar}) + ['TOPLAM']:
+        secilen = [s for s in sonuclar if tur == 'TOPLAM' or s[0] == tur]
+        sureler = sorted(s[2] for s in secilen)
+        basarili = sum(1 for s in secilen if 200 <= s[1] < 300)
+        dolu = sum(1 for s in secilen if s[1] == 409) # Boş oda kalmadı: hata değil, beklenen sonuç
+        print(f"{tur:>12} | {len(secilen):>6} | {basarili:>6} | {dolu:>5} | {len(secilen) - basarili - dolu:>5} | "
+              f"{_yuzdelik(sureler, 0.5):>7.2f} | {_yuzdelik(sureler, 0.95):>7.2f} | {_yuzdelik(sureler, 0.99):>7.2f}")
+
+def _yerel_sunucu(klasor, port, isci_sayisi):
+    """Yardımcı: Geçici veritabanıyla api_sunucu.py'yi ayrı bir süreçte başlatır ve hazır olmasını bekler."""
+    betik = os.path.join(os.path.dirname(os.path.abspath(__file__)), "api_sunucu.py")
+    surec = subprocess.Popen([sys.executable, betik, "--port", str(port), "--isci", str(isci_sayisi),
+                              "--veritabani", os.path.join(klasor, "yuk_testi.db")], stdout=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            baglanti = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            baglanti.request("GET", "/saglik"); baglanti.getresponse().read(); baglanti.close()
+            return surec
+        except OSError:
+            time.sleep(0.1)
+    surec.kill()
+    raise RuntimeError("Yerel API sunucusu başlatılamadı.")
+
+if __name__ == "__main__":
+    ayristirici = argparse.ArgumentParser(description="API sunucusu için yük testi.")
+    ayristirici.add_argument("--adres", default="http://127.0.0.1:8080")
+    ayristirici.add_argument("--esz", type=int, default=16, help="Aynı anda istek gönderen istemci sayısı")
+    ayristirici.add_argument("--istek", type=int, default=4000, help="Toplam istek sayısı")
+    ayristirici.add_argument("--yazma", type=float, default=0.1, help="Rezervasyon (yazma) isteklerinin oranı")
+    ayristirici.add_argument("--yerel", action="store_true", help="Sunucuyu geçici bir veritabanıyla kendisi başlatır")
+    ayristirici.add_argument("--isci", type=int, default=4, help="--yerel: sunucunun veritabanı işçi sayısı")
+    argumanlar = ayristirici.parse_args()
+
+    if not argumanlar.yerel:
+        yuk_testi(argumanlar.adres, argumanlar.esz, argumanlar.istek, argumanlar.yazma)
+    else:
+        with tempfile.TemporaryDirectory() as klasor:
+            port = urlsplit(argumanlar.adres).port or 8080
+            sunucu = _yerel_sunucu(klasor, port, argumanlar.isci)
+            try: yuk_testi(f"http://127.0.0.1:{port}", argumanlar.esz, argumanlar.istek, argumanlar.yazma)
+            finally:
+                sunucu.terminate(); sunucu.wait()